@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" The scenarios of `bench/pubsub.py` for pytest-benchmark. The file isnt collected
+    by the regular test run. Execute it explicitly:
+
+        python -m pytest bench/bench_pubsub.py --benchmark-json=result.json
+"""
+
+import itertools
+
+import pytest
+
+from bench.pubsub import NopeEventEmitter, generatePayload, push, setupNotify, subscriptionTopics
+
+pytest.importorskip("pytest_benchmark")
+
+EMITTERS = 200
+
+
+@pytest.mark.parametrize("system", ["pubsub", "data"])
+@pytest.mark.parametrize("mix", ["100:0:0", "80:10:10", "0:50:50"])
+def test_notify(benchmark, system, mix):
+    pubSub, topics, _ = setupNotify(system, EMITTERS, mix)
+    counter = itertools.count()
+
+    def run():
+        idx = next(counter)
+        push(pubSub, topics[idx % len(topics)], idx)
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("kind", ["flat", "deep"])
+def test_payload(benchmark, kind):
+    pubSub, topics, _ = setupNotify("data", EMITTERS, "80:10:10")
+    payload = generatePayload(kind, 1000)
+    counter = itertools.count()
+
+    def run():
+        idx = next(counter)
+        pubSub.pushData(topics[idx % len(topics)], payload)
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("system", ["pubsub", "data"])
+def test_churn(benchmark, system):
+    pubSub, _, _ = setupNotify(system, EMITTERS, "80:10:10")
+    topics = subscriptionTopics(EMITTERS, "80:10:10")
+    counter = itertools.count()
+
+    def run():
+        emitter = NopeEventEmitter()
+        pubSub.register(emitter, {
+            "mode": "subscribe",
+            "schema": {},
+            "topic": topics[next(counter) % len(topics)]
+        })
+        pubSub.unregister(emitter)
+
+    benchmark(run)
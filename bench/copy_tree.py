@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Benchmark of `copyTree` against `deepcopy`.
+
+    JSON-like payloads of different sizes (`--sizes`, in bytes) are copied using `deepcopy`,
+    `copyTree` and `copyTree` on the frozen payload (which isnt copied at all). The shape of
+    the payload is either flat (one level) or nested (records with nested dicts and lists).
+
+    Usage:
+        python -m bench.copy_tree --sizes 1000 100000 1000000
+"""
+
+import argparse
+import json
+import time
+from copy import deepcopy
+
+from nope.helpers import copyTree, freeze
+
+from bench.dotted_dict import generatePayload
+from bench.pubsub import percentile
+
+COPIERS = {
+    "deepcopy": deepcopy,
+    "copyTree": copyTree
+}
+
+
+def generateFlat(size: int) -> dict:
+    ret = {}
+    idx = 0
+    length = 2
+    while length < size:
+        ret[f"key{idx}"] = idx * 0.5
+        length += len(f'"key{idx}": {idx * 0.5}, ')
+        idx += 1
+    return ret
+
+
+def measure(copier, data, repeat: int):
+    latencies = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        copier(data)
+        latencies.append(time.perf_counter() - begin)
+    return {
+        "p50Us": percentile(latencies, 50) * 1e6,
+        "p99Us": percentile(latencies, 99) * 1e6
+    }
+
+
+def run(sizes=(100, 10000, 100000, 1000000), repeat=20):
+    results = {}
+    for size in sizes:
+        payloads = {
+            "flat": generateFlat(size),
+            "nested": json.loads(generatePayload(size))
+        }
+        for shape, data in payloads.items():
+            result = {name: measure(copier, data, repeat)
+                      for name, copier in COPIERS.items()}
+            result["copyTree (frozen)"] = measure(copyTree, freeze(data), repeat)
+            result["speedup"] = result["deepcopy"]["p50Us"] / \
+                result["copyTree"]["p50Us"]
+            results[f"{shape}/{size}"] = result
+    return {
+        "parameters": {"sizes": list(sizes), "repeat": repeat},
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of copyTree against deepcopy.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000, 1000000],
+                        help="Sizes of the JSON payloads in bytes.")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Amount of copies per measurement.")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.sizes, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Microbenchmark of the dotted access of `DottedDict` and `NoneDottedDict` against the
+    indexing of a plain dict.
+
+    Measures (in ns per operation):
+        - get: Reading an existing key (`d.key` against `d["key"]`).
+        - missing: Reading a missing key (`d.missing` against `d.get("missing")`).
+        - set: Writing a key (`d.key = 1` against `d["key"] = 1`).
+        - method: Calling a method (`d.get("key")`), which is slower than using a plain dict.
+
+    Usage:
+        python -m bench.dotted_access --number 1000000
+"""
+
+import argparse
+import json
+import timeit
+
+from nope.helpers.dottedDict import DottedDict, NoneDottedDict
+
+STATEMENTS = {
+    "get": ("d.key", "d['key']"),
+    "missing": ("d.missing", "d.get('missing')"),
+    "set": ("d.key = 1", "d['key'] = 1"),
+    "method": ("d.get('key')", "d.get('key')"),
+}
+
+TYPES = {
+    "DottedDict": DottedDict,
+    "NoneDottedDict": NoneDottedDict
+}
+
+
+def measure(statement: str, cls, number: int, repeat: int) -> float:
+    timer = timeit.Timer(statement, globals={"d": cls(key=0, other=1)})
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def run(number=1000000, repeat=5):
+    results = {}
+    for operation, (dotted, indexed) in STATEMENTS.items():
+        result = {"dict": measure(indexed, dict, number, repeat)}
+        for name, cls in TYPES.items():
+            result[name] = measure(dotted, cls, number, repeat)
+        results[operation] = result
+    return {
+        "parameters": {"number": number, "repeat": repeat},
+        "unit": "ns",
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark of the dotted access.")
+    parser.add_argument("--number", type=int, default=1000000,
+                        help="Amount of operations per measurement.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Amount of measurements (the best one is used).")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.number, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Benchmark of the `DottedDict` conversion of received payloads.
+
+    A JSON payload of `--size` bytes (default 1 MB) is decoded and converted using the
+    eager conversion (`ensureDottedAccess(data)`) and the lazy conversion
+    (`ensureDottedAccess(data, lazy=True)`). Every conversion is measured for the
+    following access patterns:
+
+        - envelope: Only a field of the envelope (`taskId`) is read.
+        - nested: A single nested value is read.
+        - traverse: The entire payload is read.
+
+    The results (p50/p99 in µs and the allocated memory) are printed as JSON.
+
+    Usage:
+        python -m bench.dotted_dict --size 1000000 --repeat 50
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from nope.helpers import ensureDottedAccess
+
+from bench.pubsub import percentile
+
+ACCESS = ("envelope", "nested", "traverse")
+
+
+def generatePayload(size: int) -> str:
+    """ Generates a JSON encoded rpc-request with (roughly) `size` bytes.
+    """
+    records = []
+    payload = {
+        "functionId": "nope/service/store",
+        "taskId": "task",
+        "params": [{"idx": 0, "data": {"records": records}}]
+    }
+    idx = 0
+    length = len(json.dumps(payload))
+    while length < size:
+        record = {
+            "id": idx,
+            "name": f"record{idx}",
+            "position": {"x": idx * 0.5, "y": idx * 0.25},
+            "tags": ["a", "b"]
+        }
+        records.append(record)
+        length += len(json.dumps(record)) + 2
+        idx += 1
+    return json.dumps(payload)
+
+
+def access(data, pattern: str):
+    if pattern == "envelope":
+        return data.taskId
+    if pattern == "nested":
+        return data.params[0].data.records[-1].position.x
+
+    def traverse(item):
+        if isinstance(item, dict):
+            for value in item.values():
+                traverse(value)
+        elif isinstance(item, list):
+            for value in item:
+                traverse(value)
+
+    return traverse(data)
+
+
+def measure(encoded: str, lazy: bool, pattern: str, repeat: int):
+    latencies = []
+    for _ in range(repeat):
+        decoded = json.loads(encoded)
+        begin = time.perf_counter()
+        access(ensureDottedAccess(decoded, lazy=lazy), pattern)
+        latencies.append(time.perf_counter() - begin)
+
+    tracemalloc.start()
+    decoded = json.loads(encoded)
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    converted = ensureDottedAccess(decoded, lazy=lazy)
+    access(converted, pattern)
+    allocated = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return {
+        "p50Us": percentile(latencies, 50) * 1e6,
+        "p99Us": percentile(latencies, 99) * 1e6,
+        "allocatedKb": allocated / 1024
+    }
+
+
+def run(size=1000000, repeat=20):
+    encoded = generatePayload(size)
+    results = {}
+    for pattern in ACCESS:
+        results[pattern] = {
+            "eager": measure(encoded, False, pattern, repeat),
+            "lazy": measure(encoded, True, pattern, repeat)
+        }
+    return {
+        "parameters": {"size": len(encoded), "repeat": repeat},
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the DottedDict conversion.")
+    parser.add_argument("--size", type=int, default=1000000,
+                        help="Size of the JSON payload in bytes.")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Amount of conversions per measurement.")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.size, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
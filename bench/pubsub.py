@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Benchmark suite for the data plane (`PubSubSystem` and `DataPubSubSystem`).
+
+    Scenarios:
+        - notify: `--emitters` subscribers with a mix of exact, `+` and `#` subscriptions. `--pushes` changes are
+          pushed with `--rate` pushes per second (0 = as fast as possible). The latency of a push contains the
+          synchronous notification of all affected subscribers.
+        - payload: Pushes a flat and a deep payload with `--payload-size` leafs into a `DataPubSubSystem`.
+        - churn: Registers and unregisters emitters, while `--emitters` emitters are registered.
+
+    Every scenario reports the throughput, the p50/p99 latency (in µs) and the peak RSS of the process. The
+    results are printed as JSON (or stored using `--output`), so that the results of releases can be compared.
+
+    Usage:
+        python -m bench.pubsub --emitters 500 --pushes 10000
+        python -m bench.pubsub --scenario churn --system data --output result.json
+
+    The same scenarios can be executed using pytest-benchmark (see `bench/bench_pubsub.py`).
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+
+from nope.eventEmitter import NopeEventEmitter
+from nope.pubSub import DataPubSubSystem, PubSubSystem
+
+SCENARIOS = ("notify", "payload", "churn")
+SYSTEMS = ("pubsub", "data")
+
+
+def peakRssMb():
+    """ Returns the peak resident set size of the process in MB (or None, if it can not be determined).
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kB, macOS bytes.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except BaseException:
+        return None
+
+
+def percentile(values, p: float):
+    """ Returns the p-th percentile (0..100) of the values (nearest rank).
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def summarize(latencies, duration: float, **extra):
+    """ Helper to create the result of a scenario.
+
+    Args:
+        latencies (list): The latencies in seconds.
+        duration (float): The total duration in seconds.
+
+    Returns:
+        dict: The summary.
+    """
+    return {
+        "operations": len(latencies),
+        "durationS": duration,
+        "throughputPerS": len(latencies) / duration if duration > 0 else None,
+        "p50Us": percentile(latencies, 50) * 1e6 if latencies else None,
+        "p99Us": percentile(latencies, 99) * 1e6 if latencies else None,
+        "maxUs": max(latencies) * 1e6 if latencies else None,
+        **extra,
+        "peakRssMb": peakRssMb()
+    }
+
+
+def createSystem(system: str):
+    return DataPubSubSystem() if system == "data" else PubSubSystem()
+
+
+def topicOf(idx: int) -> str:
+    return f"instance{idx // 20}/properties/prop{idx % 20}"
+
+
+def parseMix(mix: str):
+    """ Parses the mix of the subscriptions ("exact:single:multi", i.e. "80:10:10").
+    """
+    parts = [float(part) for part in mix.split(":")]
+    if len(parts) != 3 or sum(parts) <= 0:
+        raise ValueError(f"Invalid mix '{mix}'. Expected 'exact:single:multi'")
+    total = sum(parts)
+    return [part / total for part in parts]
+
+
+def subscriptionTopics(emitters: int, mix: str):
+    """ Generates the topics of the subscribers. Exact subscriptions use the topic of a property,
+        single-level subscriptions all properties of an instance and multi-level subscriptions
+        everything of an instance.
+    """
+    exact, single, _ = parseMix(mix)
+    instances = max(1, emitters // 20)
+    ret = []
+    for idx in range(emitters):
+        ratio = (idx % 100) / 100.0
+        if ratio < exact:
+            ret.append(topicOf(idx))
+        elif ratio < exact + single:
+            ret.append(f"instance{idx % instances}/properties/+")
+        else:
+            ret.append(f"instance{idx % instances}/#")
+    return ret
+
+
+def register(pubSub, topic: str, mode="subscribe", callback=None):
+    emitter = NopeEventEmitter()
+    if callback is not None:
+        emitter.subscribe(callback)
+    pubSub.register(emitter, {"mode": mode, "schema": {}, "topic": topic})
+    return emitter
+
+
+def generatePayload(kind: str, size: int):
+    """ Generates a payload with `size` leafs. A flat payload contains all leafs on the first level,
+        a deep payload is a (binary) tree.
+    """
+    if kind == "flat":
+        return {f"key{idx}": idx for idx in range(size)}
+
+    def build(start, amount):
+        if amount <= 2:
+            return {f"key{start + idx}": start + idx for idx in range(amount)}
+        half = amount // 2
+        return {
+            "left": build(start, half),
+            "right": build(start + half, amount - half)
+        }
+
+    return build(0, size)
+
+
+def push(pubSub, topic: str, data):
+    if isinstance(pubSub, DataPubSubSystem):
+        pubSub.pushData(topic, data)
+    else:
+        pubSub.emit(topic, data)
+
+
+def setupNotify(system="pubsub", emitters=1000, mix="80:10:10"):
+    """ Creates the system and the subscribers of the notify scenario.
+
+    Returns:
+        (PubSubSystem, list, list): The system, the topics to push and a list with one element, the notification counter.
+    """
+    pubSub = createSystem(system)
+    counter = [0]
+
+    def callback(*args):
+        counter[0] += 1
+
+    for topic in subscriptionTopics(emitters, mix):
+        register(pubSub, topic, callback=callback)
+
+    topics = [topicOf(idx) for idx in range(emitters)]
+    return pubSub, topics, counter
+
+
+def runNotify(system="pubsub", emitters=1000, pushes=10000, rate=0, mix="80:10:10"):
+    pubSub, topics, counter = setupNotify(system, emitters, mix)
+    interval = 1.0 / rate if rate > 0 else 0
+    latencies = []
+
+    gc.collect()
+    start = time.perf_counter()
+    for idx in range(pushes):
+        if interval:
+            # Pace the pushes.
+            scheduled = start + idx * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        begin = time.perf_counter()
+        push(pubSub, topics[idx % len(topics)], idx)
+        latencies.append(time.perf_counter() - begin)
+    duration = time.perf_counter() - start
+
+    return summarize(
+        latencies,
+        duration,
+        notifications=counter[0],
+        notificationsPerS=counter[0] / duration if duration > 0 else None
+    )
+
+
+def runPayload(emitters=1000, pushes=1000, payloadSize=1000, mix="80:10:10"):
+    ret = {}
+    for kind in ("flat", "deep"):
+        pubSub, topics, counter = setupNotify("data", emitters, mix)
+        payload = generatePayload(kind, payloadSize)
+        latencies = []
+
+        gc.collect()
+        start = time.perf_counter()
+        for idx in range(pushes):
+            # The payload is changed on every push.
+            payload = dict(payload)
+            payload["version"] = idx
+            begin = time.perf_counter()
+            pubSub.pushData(topics[idx % len(topics)], payload)
+            latencies.append(time.perf_counter() - begin)
+        duration = time.perf_counter() - start
+
+        ret[kind] = summarize(latencies, duration,
+                              notifications=counter[0])
+    return ret
+
+
+def runChurn(system="pubsub", emitters=1000, operations=1000, mix="80:10:10"):
+    pubSub, _, _ = setupNotify(system, emitters, mix)
+    topics = subscriptionTopics(emitters, mix)
+    registerLatencies = []
+    unregisterLatencies = []
+
+    gc.collect()
+    start = time.perf_counter()
+    for idx in range(operations):
+        emitter = NopeEventEmitter()
+        topic = topics[idx % len(topics)]
+        # Only exact topics can be published.
+        publish = idx % 2 and "+" not in topic and "#" not in topic
+        begin = time.perf_counter()
+        pubSub.register(emitter, {
+            "mode": ["publish", "subscribe"] if publish else "subscribe",
+            "schema": {},
+            "topic": topic
+        })
+        registerLatencies.append(time.perf_counter() - begin)
+
+        begin = time.perf_counter()
+        pubSub.unregister(emitter)
+        unregisterLatencies.append(time.perf_counter() - begin)
+    duration = time.perf_counter() - start
+
+    return {
+        "durationS": duration,
+        "register": summarize(registerLatencies, sum(registerLatencies)),
+        "unregister": summarize(unregisterLatencies, sum(unregisterLatencies))
+    }
+
+
+def run(scenarios=SCENARIOS, system="pubsub", emitters=1000, pushes=10000, rate=0,
+        mix="80:10:10", payloadSize=1000, label=None):
+    """ Runs the scenarios and returns the results.
+    """
+    results = {}
+    for scenario in scenarios:
+        if scenario == "notify":
+            results[scenario] = runNotify(
+                system, emitters, pushes, rate, mix)
+        elif scenario == "payload":
+            results[scenario] = runPayload(
+                emitters, min(pushes, 1000), payloadSize, mix)
+        elif scenario == "churn":
+            results[scenario] = runChurn(
+                system, emitters, min(pushes, 1000), mix)
+        else:
+            raise ValueError(f"Unknown scenario '{scenario}'")
+
+    return {
+        "label": label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "system": system,
+            "emitters": emitters,
+            "pushes": pushes,
+            "rate": rate,
+            "mix": mix,
+            "payloadSize": payloadSize
+        },
+        "results": results,
+        "peakRssMb": peakRssMb()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for the pub-sub data plane.")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, dest="scenarios",
+                        help="Scenario to run. Can be used multiple times. Defaults to all scenarios.")
+    parser.add_argument("--system", choices=SYSTEMS, default="pubsub",
+                        help="The system used by 'notify' and 'churn'.")
+    parser.add_argument("--emitters", type=int, default=500,
+                        help="Amount of subscribers.")
+    parser.add_argument("--pushes", type=int, default=10000,
+                        help="Amount of pushes (the payload and churn scenarios are limited to 1000).")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="Pushes per second. 0 = as fast as possible.")
+    parser.add_argument("--mix", default="80:10:10",
+                        help="Ratio of exact, single-level and multi-level subscriptions.")
+    parser.add_argument("--payload-size", type=int, default=1000, dest="payloadSize",
+                        help="Amount of leafs of the payload scenario.")
+    parser.add_argument("--label", default=None,
+                        help="A label stored in the result, i.e. the release.")
+    parser.add_argument("--output", default=None,
+                        help="File to store the JSON result. Defaults to stdout.")
+    args = parser.parse_args()
+
+    result = run(
+        args.scenarios or SCENARIOS,
+        args.system,
+        args.emitters,
+        args.pushes,
+        args.rate,
+        args.mix,
+        args.payloadSize,
+        args.label
+    )
+
+    content = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(content)
+    else:
+        print(content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Benchmark for registering emitters in the `PubSubSystem`.
+
+    Compares the time required to determine the matching between subscriptions and
+    topics using the linear scan (every registration is compared against every known
+    topic using `comparePatternAndPath`) and the segment-trie based `TopicIndex`.
+
+    The linear scan is quadratic. Therefore its per-registration latency is sampled at
+    the final size only (the last `--samples` registrations).
+
+    Usage:
+        python -m bench.register_emitters --emitters 10000
+"""
+
+import argparse
+import json
+import time
+
+from nope.eventEmitter import NopeEventEmitter
+from nope.helpers import comparePatternAndPath
+from nope.pubSub import PubSubSystem, TopicIndex
+
+
+def generateTopics(amount: int, wildcards: int = 100):
+    """ Generates the topics of the emitters. Every emitter publishes and subscribes on the topic
+        of a module property. Additionally some wildcard subscriptions are generated.
+    """
+    topics = [
+        f"instance{idx // 20}/properties/prop{idx % 20}" for idx in range(amount)]
+    patterns = []
+    for idx in range(wildcards):
+        if idx % 2:
+            patterns.append(f"instance{idx}/properties/+")
+        else:
+            patterns.append(f"instance{idx}/#")
+    return topics, patterns
+
+
+def linearScan(topics, patterns, samples):
+    """ The matching as it has been determined before: Every registration is compared
+        with every known topic.
+    """
+    known = topics[:-samples]
+    start = time.perf_counter()
+    for topic in topics[-samples:]:
+        # The subscription of the emitter against every published topic.
+        for other in known:
+            comparePatternAndPath(topic, other)
+        # The published topic against every subscription.
+        for other in known + patterns:
+            comparePatternAndPath(other, topic)
+        known.append(topic)
+    return (time.perf_counter() - start) / samples
+
+
+def indexed(topics, patterns, samples):
+    """ The matching based on our indices.
+    """
+    published = TopicIndex()
+    subscriptions = TopicIndex()
+    for pattern in patterns:
+        subscriptions.add(pattern, pattern)
+
+    def register(topic):
+        published.add(topic)
+        subscriptions.add(topic, topic)
+        for pattern, _ in subscriptions.patternsMatching(topic):
+            comparePatternAndPath(pattern, topic)
+        for other, _ in published.topicsMatching(topic):
+            comparePatternAndPath(topic, other)
+
+    start = time.perf_counter()
+    for topic in topics[:-samples]:
+        register(topic)
+    total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for topic in topics[-samples:]:
+        register(topic)
+    sampled = time.perf_counter() - start
+
+    return total + sampled, sampled / samples
+
+
+def system(topics, patterns):
+    """ Registers the emitters in a real `PubSubSystem`.
+    """
+    pubSub = PubSubSystem()
+    start = time.perf_counter()
+    for pattern in patterns:
+        pubSub.register(NopeEventEmitter(), {
+                        "mode": "subscribe", "topic": pattern})
+    for topic in topics:
+        pubSub.register(NopeEventEmitter(), {
+                        "mode": ["publish", "subscribe"], "topic": topic})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the topic matching during registering emitters.")
+    parser.add_argument("--emitters", type=int, default=10000,
+                        help="Amount of emitters to register.")
+    parser.add_argument("--wildcards", type=int, default=100,
+                        help="Amount of additional wildcard subscriptions.")
+    parser.add_argument("--samples", type=int, default=20,
+                        help="Amount of registrations used to sample the latency at the final size.")
+    parser.add_argument("--system", action="store_true",
+                        help="Additionally register the emitters in a `PubSubSystem`.")
+    args = parser.parse_args()
+
+    topics, patterns = generateTopics(args.emitters, args.wildcards)
+
+    totalIndexed, perRegistrationIndexed = indexed(
+        topics, patterns, args.samples)
+    perRegistrationLinear = linearScan(topics, patterns, args.samples)
+
+    result = {
+        "emitters": args.emitters,
+        "wildcards": args.wildcards,
+        "linear": {
+            "perRegistrationMs": perRegistrationLinear * 1000,
+            # Extrapolated, because the scan is quadratic.
+            "estimatedTotalS": perRegistrationLinear * args.emitters / 2
+        },
+        "indexed": {
+            "perRegistrationMs": perRegistrationIndexed * 1000,
+            "totalS": totalIndexed
+        },
+        "speedup": perRegistrationLinear / perRegistrationIndexed
+    }
+
+    if args.system:
+        result["system"] = {"totalS": system(topics, patterns)}
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
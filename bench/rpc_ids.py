@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Benchmark of the id generators (see `IdGenerator`) used for the task- and message-ids.
+
+    Measures the time to generate an id and the RPC round-trips per second of a
+    `NopeRpcManager` (event layer), using the uuid based ids (`generateId`, former
+    default) and the counter based ids (`IdGenerator`, default).
+
+    Usage:
+        python -m bench.rpc_ids --calls 5000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from nope import EXECUTOR, NopeRpcManager, getLayer
+from nope.helpers import IdGenerator, generateId
+
+GENERATORS = {
+    "uuid": lambda: generateId,
+    "counter": IdGenerator
+}
+
+
+def measureGeneration(generator, amount: int) -> float:
+    begin = time.perf_counter()
+    for _ in range(amount):
+        generator()
+    return (time.perf_counter() - begin) / amount * 1e9
+
+
+async def measureRoundTrips(generator, calls: int) -> float:
+    manager = NopeRpcManager({
+        "communicator": await getLayer("event"),
+        "logger": False,
+        "idGenerator": generator
+    }, lambda *args: "bench", "bench")
+    await manager.ready.waitFor()
+
+    async def hello(name):
+        return name
+
+    await manager.registerService(hello, {"id": "hello"})
+    await asyncio.sleep(0.1)
+
+    begin = time.perf_counter()
+    for _ in range(calls):
+        await manager.performCall("hello", ["bench"])
+    duration = time.perf_counter() - begin
+
+    await manager.dispose()
+    return calls / duration
+
+
+def roundTrips(generator, calls: int) -> float:
+    # Every measurement uses a new loop, so remaining tasks dont affect the next one.
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    try:
+        return loop.run_until_complete(measureRoundTrips(generator, calls))
+    finally:
+        loop.close()
+
+
+def run(calls=5000, ids=100000, repeat=3):
+    results = {name: {"nsPerId": None, "roundTripsPerS": 0} for name in GENERATORS}
+    # Alternate the generators and use the best run, to reduce the noise.
+    for _ in range(repeat):
+        for name, factory in GENERATORS.items():
+            result = results[name]
+            nsPerId = measureGeneration(factory(), ids)
+            result["nsPerId"] = min(nsPerId, result["nsPerId"] or nsPerId)
+            result["roundTripsPerS"] = max(
+                result["roundTripsPerS"], roundTrips(factory(), calls))
+    results["speedup"] = results["counter"]["roundTripsPerS"] / \
+        results["uuid"]["roundTripsPerS"]
+    return {
+        "parameters": {"calls": calls, "ids": ids, "repeat": repeat},
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the id generators.")
+    parser.add_argument("--calls", type=int, default=5000,
+                        help="Amount of rpc calls per generator.")
+    parser.add_argument("--ids", type=int, default=100000,
+                        help="Amount of generated ids per generator.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Amount of runs per generator (the best run is used).")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.calls, args.ids, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
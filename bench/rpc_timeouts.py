@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Benchmark of the timers used for the timeouts of rpc-calls.
+
+    Measures the time to create and cancel a timeout using `EXECUTOR.setTimeout` (one task
+    per timeout, former default) and `EXECUTOR.callLater` (timing wheel, default) and the
+    RPC round-trips per second of a `NopeRpcManager` (event layer) using the option
+    `timeout` in every call.
+
+    Usage:
+        python -m bench.rpc_timeouts --calls 5000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from nope import EXECUTOR, NopeRpcManager, getLayer
+
+TIMERS = {
+    "task": lambda: EXECUTOR.setTimeout,
+    "wheel": lambda: EXECUTOR.callLater
+}
+
+
+def noop():
+    pass
+
+
+async def measureTimers(factory, amount: int, batch: int = 100) -> float:
+    schedule = factory()
+    begin = time.perf_counter()
+    for _ in range(amount // batch):
+        for timer in [schedule(noop, 1000) for _ in range(batch)]:
+            timer.cancel()
+        # Let the loop process the canceled tasks.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    return (time.perf_counter() - begin) / amount * 1e9
+
+
+async def measureRoundTrips(factory, calls: int) -> float:
+    manager = NopeRpcManager({
+        "communicator": await getLayer("event"),
+        "logger": False,
+    }, lambda *args: "bench", "bench")
+    await manager.ready.waitFor()
+
+    async def hello(name):
+        return name
+
+    await manager.registerService(hello, {"id": "hello"})
+    await asyncio.sleep(0.1)
+
+    # Use the timer to measure for the timeouts of the calls.
+    EXECUTOR.callLater = factory()
+
+    begin = time.perf_counter()
+    for _ in range(calls):
+        await manager.performCall("hello", ["bench"], {"timeout": 1000})
+    duration = time.perf_counter() - begin
+
+    del EXECUTOR.callLater
+    await manager.dispose()
+    return calls / duration
+
+
+def measure(coro):
+    # Every measurement uses a new loop, so remaining tasks dont affect the next one.
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    try:
+        return loop.run_until_complete(coro())
+    finally:
+        loop.close()
+
+
+def run(calls=5000, timers=100000, repeat=3):
+    results = {name: {"nsPerTimer": None, "roundTripsPerS": 0} for name in TIMERS}
+    # Alternate the timers and use the best run, to reduce the noise.
+    for _ in range(repeat):
+        for name, factory in TIMERS.items():
+            result = results[name]
+            nsPerTimer = measure(lambda: measureTimers(factory, timers))
+            result["nsPerTimer"] = min(nsPerTimer, result["nsPerTimer"] or nsPerTimer)
+            result["roundTripsPerS"] = max(
+                result["roundTripsPerS"], measure(lambda: measureRoundTrips(factory, calls)))
+    results["speedup"] = results["wheel"]["roundTripsPerS"] / \
+        results["task"]["roundTripsPerS"]
+    return {
+        "parameters": {"calls": calls, "timers": timers, "repeat": repeat},
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the timers used for the timeouts of rpc-calls.")
+    parser.add_argument("--calls", type=int, default=5000,
+                        help="Amount of rpc calls per timer.")
+    parser.add_argument("--timers", type=int, default=100000,
+                        help="Amount of created and canceled timers per timer.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Amount of runs per timer (the best run is used).")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.calls, args.timers, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
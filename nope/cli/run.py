@@ -27,6 +27,7 @@ def getDefaultParameters():
         "delay": 2,
         "timings": {},
         "defaultSelector": "first",
+        "dataDelivery": "full",
         "forceUsingSelectors": False,
         "preventVarifiedNames": False,
         # "logToFile": False,
@@ -65,6 +66,9 @@ def getArgs(add_mode=True, parser=None, default_args=None):
                         ", ".join(ValidDefaultSelectors)
                         )
 
+    parser.add_argument("--data-delivery", default=default_args.get("dataDelivery", "full"), dest="dataDelivery",
+                        help='Determines, how data-changes are forwarded. Possible Values are "full" and "delta". Defaults to "full"')
+
     parser.add_argument("--log-to-file", help="Log will be stored in a logfile.",
                         action="store_true", dest='logToFile')
 
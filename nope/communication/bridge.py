@@ -1,14 +1,42 @@
 import asyncio
+import sys
+from collections import deque
 
 from nope.helpers import Emitter, generateId, formatException, ensureDottedAccess, \
     EXECUTOR
 from nope.logger import defineNopeLogger
 from nope.observable import NopeObservable
+from nope.types.messages import MESSAGES, Message
+
+from .handles import (HANDLES_EVENT, HANDLES_KEY, HANDLES_REQUEST_ATTEMPTS, HANDLES_REQUEST_EVENT,
+                      HANDLES_REQUEST_TIMEOUT, INTERNED_FIELDS, MAX_PENDING_MESSAGES, HandleTable, decode,
+                      encode)
+
+
+class _PendingMessages:
+    """ Messages of a sender, waiting for the definitions of their handles. """
+
+    __slots__ = ("messages", "attempts", "dropped", "timer")
+
+    def __init__(self):
+        self.messages = deque()
+        self.attempts = 0
+        self.dropped = 0
+        self.timer = None
 
 
 class Bridge:
 
-    def __init__(self, _id=generateId(), logger=False):
+    def __init__(self, _id=generateId(), logger=False, useHandles=False):
+        """ Creates the Bridge.
+
+        Args:
+            _id (str, optional): The id of the bridge.
+            logger (optional): The logger to use. Defaults to False.
+            useHandles (bool, optional): Replace frequently used service ids, topics and dispatcher ids by
+                integer handles (see `nope.communication.handles`). Received handles are always resolved.
+                Only enable it, if every connected peer supports handles. Defaults to False.
+        """
 
         def getter(storedValue):
             for data in self._layers.values():
@@ -32,6 +60,17 @@ class Bridge:
 
         self._subscribedEvents = dict()
 
+        self.useHandles = useHandles
+        # The handles used by this bridge (layer-id -> HandleTable)
+        self._handleTables = dict()
+        # The handles of the other bridges ((layer-id, bridge-id) -> dict)
+        self._remoteHandles = dict()
+        # Messages waiting for the definitions of their handles ((layer-id, bridge-id) -> _PendingMessages)
+        self._pendingMessages = dict()
+        self.handlesRequestTimeout = HANDLES_REQUEST_TIMEOUT
+        self.handlesRequestAttempts = HANDLES_REQUEST_ATTEMPTS
+        self.maxPendingMessages = MAX_PENDING_MESSAGES
+
     @property
     def receivesOwnMessages(self):
         for layer in self._layers.values():
@@ -44,18 +83,33 @@ class Bridge:
         return self._id
 
     async def on(self, eventName: str, cb):
-        return await self._on(eventName, lambda data: cb(ensureDottedAccess(data)))
+        message = MESSAGES.get(eventName)
+        if message is not None:
+            # Typed messages of the core protocol (see `nope.types.messages`)
+            return await self._on(eventName, lambda data: cb(message.from_wire(data)))
+        # The payload is converted lazily (only the accessed items are converted).
+        return await self._on(eventName, lambda data: cb(ensureDottedAccess(data, lazy=True)))
 
     async def emit(self, eventName: str, data, **kwargs):
+        if isinstance(data, Message):
+            return await self._emit(eventName, None, data.to_wire())
         return await self._emit(eventName, None, ensureDottedAccess(data))
 
     def detailListeners(self, t, listeners):
         raise Exception('Method not implemented.')
 
     async def dispose(self):
+        self._clearPendingMessages()
         for item in self._layers.values():
             await item.layer.dispose()
 
+    def _clearPendingMessages(self, layerId=None):
+        """ Drops the delayed messages (of the layer) and stops requesting the definitions.
+        """
+        for key in list(self._pendingMessages):
+            if layerId is None or key[0] == layerId:
+                self._pendingMessages.pop(key).timer.cancel()
+
     def _checkInternalEmitter(self):
         self._useInternalEmitter = True
         for layer in self._layers.values():
@@ -65,9 +119,106 @@ class Bridge:
 
     async def _subscribeToCallback(self, layer, event, forwardData):
         if forwardData:
-            await layer.on(event, lambda data: EXECUTOR.callParallel(self._emit, event, layer, data))
+            def deliver(data):
+                EXECUTOR.callParallel(self._emit, event, layer, data)
         else:
-            await layer.on(event, lambda data: self._internalEmitter.emit(event, data))
+            def deliver(data):
+                self._internalEmitter.emit(event, data)
+
+        await layer.on(event, lambda data: self._receive(layer, event, data, deliver))
+
+    def _receive(self, layer, event, data, deliver):
+        """ Resolves the handles of a received message. If a definition is missing, the
+            message is delayed, until the sender has sent its definitions (see `_requestHandles`).
+        """
+        if event not in INTERNED_FIELDS:
+            return deliver(data)
+
+        meta = data.get(HANDLES_KEY) if isinstance(data, dict) else None
+        if meta is None:
+            return deliver(decode(event, data, None))
+
+        key = (layer.id, meta["bridge"])
+        pending = self._pendingMessages.get(key)
+        decoded = decode(event, data, self._remoteHandles.setdefault(key, dict()))
+
+        if decoded is None or pending is not None:
+            # Keep the order of the messages.
+            if pending is None:
+                self._pendingMessages[key] = pending = _PendingMessages()
+                self._requestHandles(layer, key)
+            if len(pending.messages) >= self.maxPendingMessages:
+                pending.messages.popleft()
+                pending.dropped += 1
+            pending.messages.append((event, data, deliver))
+            return
+
+        deliver(decoded)
+
+    def _requestHandles(self, layer, key):
+        """ Requests the definitions of the sender. Repeated, until the definitions are received
+            or `handlesRequestAttempts` requests have been sent. Afterwards the delayed messages
+            are dropped.
+        """
+        pending = self._pendingMessages.get(key)
+        if pending is None:
+            return
+
+        if pending.attempts >= self.handlesRequestAttempts:
+            del self._pendingMessages[key]
+            if self._logger:
+                self._logger.error(
+                    f'Bridge "{key[1]}" didnt send the definitions of its handles. '
+                    f'Dropped {len(pending.messages) + pending.dropped} message(s).')
+            return
+
+        pending.attempts += 1
+        EXECUTOR.callParallel(
+            layer.emit, HANDLES_REQUEST_EVENT, {"bridge": key[1]})
+        pending.timer = EXECUTOR.callLater(
+            self._requestHandles, self.handlesRequestTimeout, layer, key)
+
+    def _onHandlesRequest(self, layer, data):
+        table = self._handleTables.get(layer.id)
+        if data.get("bridge") == self._id and table is not None:
+            EXECUTOR.callParallel(layer.emit, HANDLES_EVENT, {
+                "bridge": self._id,
+                "defs": table.definitions()
+            })
+
+    def _onHandles(self, layer, data):
+        key = (layer.id, data.get("bridge"))
+        definitions = self._remoteHandles.setdefault(key, dict())
+        for handle, value in (data.get("defs") or {}).items():
+            definitions[int(handle)] = sys.intern(value)
+
+        pending = self._pendingMessages.pop(key, None)
+        if pending is None:
+            return
+        pending.timer.cancel()
+
+        dropped = pending.dropped
+        for event, msg, deliver in pending.messages:
+            decoded = decode(event, msg, definitions)
+            if decoded is None:
+                # The sender doesnt know the handle anymore.
+                dropped += 1
+            else:
+                deliver(decoded)
+
+        if dropped and self._logger:
+            self._logger.warn(
+                f'Dropped {dropped} message(s) of bridge "{key[1]}" with unknown handles.')
+
+    def _encode(self, layer, event, data):
+        """ Replaces the interned fields by the handles of the layer (if enabled).
+        """
+        if not self.useHandles or event not in INTERNED_FIELDS:
+            return data
+        table = self._handleTables.get(layer.id)
+        if table is None:
+            table = self._handleTables[layer.id] = HandleTable()
+        return encode(event, data, table, self._id)
 
     async def _on(self, event, cb):
 
@@ -115,21 +266,21 @@ class Bridge:
         # Collect all events
         promises = []
 
+        async def emitOnLayer(layer, payload):
+            try:
+                await layer.emit(event, payload)
+            except Exception as error:
+                if self._logger:
+                    self._logger.error(
+                        'failed to emit the event "{event}"')
+                    self._logger.error(error)
+                else:
+                    print(formatException(error))
+
         for data in self._layers.values():
             if data.layer != toExclude and data.layer.connected.getContent():
-
-                async def emitOnLayer():
-                    try:
-                        await data.layer.emit(event, dataToSend)
-                    except Exception as error:
-                        if self._logger:
-                            self._logger.error(
-                                'failed to emit the event "{event}"')
-                            self._logger.error(error)
-                        else:
-                            print(formatException(error))
-
-                promises.append(emitOnLayer())
+                promises.append(emitOnLayer(
+                    data.layer, self._encode(data.layer, event, dataToSend)))
 
         # Now wait for all Layers to emit
         if promises:
@@ -150,12 +301,21 @@ class Bridge:
 
             await layer.connected.waitFor()
 
-            for event, cbs in self._callbacks.items():
-                for callback in cbs:
-                    layer.on(event, callback)
-                    self._checkInternalEmitter()
+            await layer.on(HANDLES_EVENT, lambda data: self._onHandles(layer, data))
+            await layer.on(HANDLES_REQUEST_EVENT,
+                           lambda data: self._onHandlesRequest(layer, data))
+
+            # The callbacks are registered on the internal emitter.
+            for event in self._callbacks:
+                await self._subscribeToCallback(layer, event, forwardData)
+
+            self._checkInternalEmitter()
 
     async def removeCommunicationLayer(self, layer):
         if layer.id in self._layers:
             self._layers.pop(layer.id)
+            self._handleTables.pop(layer.id, None)
+            self._clearPendingMessages(layer.id)
+            for key in [key for key in self._remoteHandles if key[0] == layer.id]:
+                del self._remoteHandles[key]
             self._checkInternalEmitter()
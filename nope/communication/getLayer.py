@@ -5,9 +5,9 @@ from nope.helpers import generateId, DottedDict
 from .addLayer import addLayer
 
 
-async def getLayer(layer: str, parameter=None, logger=False):
+async def getLayer(layer: str, parameter=None, logger=False, useHandles=False):
     # Add the Bridge
-    bridge = Bridge(generateId(), logger)
+    bridge = Bridge(generateId(), logger, useHandles)
 
     # Add the Layer
     await addLayer(bridge, layer, parameter, logger, True, True)
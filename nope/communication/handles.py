@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Compact handles for frequently used strings (service ids, topics and dispatcher ids).
+
+    A sender replaces the strings of the fields listed in `INTERNED_FIELDS` by integers. The
+    handles are assigned per layer (see `HandleTable`). The first message using a handle
+    contains its definition, afterwards only the integer is sent. Strings without handle are
+    sent unchanged. A message containing handles is marked with the field `HANDLES_KEY`:
+
+    >>> table = HandleTable(threshold=1)
+    >>> encode("rpcRequest", {"functionId": "service", "taskId": "a"}, table, "bridge")
+    {'functionId': 0, 'taskId': 'a', '__handles': {'bridge': 'bridge', 'defs': {'0': 'service'}}}
+    >>> encode("rpcRequest", {"functionId": "service", "taskId": "b"}, table, "bridge")
+    {'functionId': 0, 'taskId': 'b', '__handles': {'bridge': 'bridge'}}
+
+    A receiver resolves the handles using the definitions of the sender (see `decode`). If a
+    definition is missing (i.e. the receiver connected later), the receiver requests the
+    definitions (event `HANDLES_REQUEST_EVENT`); the sender answers with all of its
+    definitions (event `HANDLES_EVENT`). Until then, at most `MAX_PENDING_MESSAGES` messages
+    of the sender are delayed. Without answer, the request is repeated after
+    `HANDLES_REQUEST_TIMEOUT` ms. After `HANDLES_REQUEST_ATTEMPTS` requests, the delayed
+    messages are dropped.
+"""
+
+import sys
+
+HANDLES_KEY = "__handles"
+""" Field marking a message containing handles. """
+
+HANDLES_EVENT = "bridgeHandles"
+""" Event used to share the definitions of the handles. """
+
+HANDLES_REQUEST_EVENT = "bridgeHandlesRequest"
+""" Event used to request the definitions of the handles of a bridge. """
+
+HANDLES_REQUEST_TIMEOUT = 1000
+""" Time in ms to wait for the definitions, before they are requested again. """
+
+HANDLES_REQUEST_ATTEMPTS = 3
+""" Amount of requests of the definitions, before the delayed messages are dropped. """
+
+MAX_PENDING_MESSAGES = 1024
+""" Max amount of delayed messages per sender. If exceeded, the oldest message is dropped. """
+
+INTERNED_FIELDS = {
+    "rpcRequest": ("functionId", "resultSink", "requestedBy", "target"),
+    "rpcRequestBatch": ("requestedBy", "target"),
+    "dataChanged": ("path", "sender"),
+    "event": ("path", "sender"),
+    "statusChanged": ("id",),
+}
+""" The fields of the events, which are replaced by handles. """
+
+
+class HandleTable:
+    """ The handles of a sender on a single layer. A string receives a handle, once it has been
+        used `threshold` times. At most `maxHandles` handles are assigned; afterwards the other
+        strings are sent unchanged.
+    """
+
+    __slots__ = ("handles", "strings", "announced", "threshold", "maxHandles", "_usage")
+
+    def __init__(self, threshold=2, maxHandles=4096):
+        self.handles = dict()
+        self.strings = list()
+        self.announced = set()
+        self.threshold = threshold
+        self.maxHandles = maxHandles
+        self._usage = dict()
+
+    def handleOf(self, value: str):
+        """ Returns the handle of the string or `None`, if the string (still) has to be sent.
+        """
+        handle = self.handles.get(value)
+        if handle is not None or len(self.strings) >= self.maxHandles:
+            return handle
+
+        usage = self._usage.get(value, 0) + 1
+        if usage < self.threshold:
+            if len(self._usage) >= self.maxHandles:
+                # Prevent collecting every string, which is used only once.
+                self._usage.clear()
+            self._usage[value] = usage
+            return None
+
+        self._usage.pop(value, None)
+        handle = len(self.strings)
+        self.handles[value] = handle
+        self.strings.append(value)
+        return handle
+
+    def definitions(self) -> dict:
+        """ Returns all definitions (handle -> string). The handles are sent as strings (JSON).
+        """
+        return {str(handle): value for handle, value in enumerate(self.strings)}
+
+
+def encode(event: str, data: dict, table: HandleTable, bridgeId: str) -> dict:
+    """ Replaces the interned fields of the message by handles.
+
+    Args:
+        event (str): The name of the event.
+        data (dict): The message (wire format).
+        table (HandleTable): The handles of the layer.
+        bridgeId (str): The id of the sending bridge.
+
+    Returns:
+        dict: The encoded message or the message itself, if no handle is used.
+    """
+    fields = INTERNED_FIELDS.get(event)
+    if fields is None or not isinstance(data, dict):
+        return data
+
+    ret = None
+    definitions = None
+
+    for field in fields:
+        value = data.get(field)
+        if type(value) is not str:
+            continue
+        handle = table.handleOf(value)
+        if handle is None:
+            continue
+        if ret is None:
+            ret = dict(data)
+        ret[field] = handle
+        if handle not in table.announced:
+            table.announced.add(handle)
+            if definitions is None:
+                definitions = dict()
+            definitions[str(handle)] = value
+
+    if ret is None:
+        return data
+
+    ret[HANDLES_KEY] = {"bridge": bridgeId, "defs": definitions} if definitions else {"bridge": bridgeId}
+    return ret
+
+
+def decode(event: str, data, definitions: dict):
+    """ Replaces the handles of the message by their strings. The strings of the
+        interned fields are interned (`sys.intern`), so equal keys share one string.
+
+    Args:
+        event (str): The name of the event.
+        data (dict): The received message.
+        definitions (dict): The known definitions of the sender (handle -> string). The
+            definitions contained in the message are added.
+
+    Returns:
+        dict: The decoded message or `None`, if a definition is missing.
+    """
+    fields = INTERNED_FIELDS.get(event)
+    if fields is None or not isinstance(data, dict):
+        return data
+
+    meta = data.get(HANDLES_KEY)
+
+    if meta is None:
+        for field in fields:
+            value = data.get(field)
+            if type(value) is str:
+                data[field] = sys.intern(value)
+        return data
+
+    for handle, value in (meta.get("defs") or {}).items():
+        definitions[int(handle)] = sys.intern(value)
+
+    ret = dict(data)
+    del ret[HANDLES_KEY]
+
+    for field in fields:
+        value = ret.get(field)
+        if type(value) is int:
+            value = definitions.get(value)
+            if value is None:
+                return None
+            ret[field] = value
+        elif type(value) is str:
+            ret[field] = sys.intern(value)
+
+    return ret
@@ -13,6 +13,7 @@ from nope.helpers import getTimestamp, ensureDottedAccess, generateId, DottedDic
 from nope.logger import defineNopeLogger
 from nope.merging import DictBasedMergeData
 from nope.observable import NopeObservable
+from nope.types.messages import StatusChanged
 
 
 class ENopeDispatcherStatus(IntEnum):
@@ -65,6 +66,9 @@ class NopeConnectivityManager:
 
         self._timeouts = ensureDottedAccess({})
 
+        # Function returning the load of the dispatcher (see `NopeRpcManager.load`)
+        self.getLoad = None
+
         self._communicator = options.communicator
         self._connectedSince = getTimestamp()
         self._isMaster = options.isMaster if isinstance(
@@ -92,18 +96,18 @@ class NopeConnectivityManager:
     def info(self):
         return self._info()
 
-    def _info(self):
+    def _info(self) -> StatusChanged:
 
         # Helper for the Memory.
         _virtual_memory = psutil.virtual_memory()
 
-        return ensureDottedAccess({
-            'id': self.id,
-            'env': 'python',
-            'version': _VERSION,
-            'isMaster': self.isMaster,
-            'isMasterForced': isinstance(self._isMaster, bool),
-            'host': {
+        return StatusChanged(
+            id=self.id,
+            env='python',
+            version=_VERSION,
+            isMaster=self.isMaster,
+            isMasterForced=isinstance(self._isMaster, bool),
+            host=ensureDottedAccess({
                 'cores': os.cpu_count(),
                 'cpu': {
                     'model': _PROCESSOR_NAME,
@@ -117,13 +121,14 @@ class NopeConnectivityManager:
                     'total': round(_virtual_memory.total / 1048576)
                 },
                 'name': gethostname()
-            },
-            'pid': os.getpid(),
-            'timestamp': self.now,
-            'connectedSince': self.connectedSince,
-            'status': ENopeDispatcherStatus.HEALTHY.value,
-            'plugins': []
-        })
+            }),
+            pid=os.getpid(),
+            timestamp=self.now,
+            connectedSince=self.connectedSince,
+            status=ENopeDispatcherStatus.HEALTHY.value,
+            plugins=[],
+            load=self.getLoad() if self.getLoad is not None else None
+        )
 
     @property
     def upTime(self):
@@ -193,11 +198,14 @@ class NopeConnectivityManager:
         self._communicator.connected.subscribe(onConnect)
         await self._communicator.connected.waitFor()
 
-        def onStatusChanged(info):
-            self._externalDispatchers[info.id] = ensureDottedAccess(info)
+        def onStatusChanged(info: StatusChanged):
+            info = StatusChanged.from_wire(info)
             if info.id != self.id:
-                self._externalDispatchers[self.id] = self.info
-                self.dispatchers.update()
+                # Only the entries of the dispatchers are adapted.
+                self.dispatchers.updateKey(info.id, info)
+                self.dispatchers.updateKey(self.id, self.info)
+            else:
+                self._externalDispatchers[info.id] = info
 
         await self._communicator.on('statusChanged', onStatusChanged)
 
@@ -213,9 +221,8 @@ class NopeConnectivityManager:
 
         def onAurevoir(msg):
             # We try to pop the item. If it fails we wont update the elements
-            item = self._externalDispatchers.pop(msg.dispatcherId, False)
-            if item:
-                self.dispatchers.update()
+            if msg.dispatcherId in self._externalDispatchers:
+                self.dispatchers.removeKey(msg.dispatcherId)
 
         await self._communicator.on('aurevoir', onAurevoir)
 
@@ -245,39 +252,40 @@ class NopeConnectivityManager:
 
         for status in list(self._externalDispatchers.values()):
             # determine the Difference
-            diff = currentTime - status['timestamp']
+            diff = currentTime - status.timestamp
 
             # Based on the Difference Determine the Status
             if diff > self._timeouts['remove']:
                 # remove the Dispatcher. But be quiet.
                 # Perhaps more dispatchers will be removed
-                self._removeDispatcher(status['id'], True)
+                self._removeDispatcher(status.id, True)
                 changes = True
-            elif diff > self._timeouts['dead'] and status['status'] != ENopeDispatcherStatus.DEAD:
-                status['status'] = ENopeDispatcherStatus.DEAD
+            elif diff > self._timeouts['dead'] and status.status != ENopeDispatcherStatus.DEAD:
+                status.status = ENopeDispatcherStatus.DEAD
                 changes = True
-            elif self._timeouts['warn'] < diff <= self._timeouts['dead'] and status[
-                    'status'] != ENopeDispatcherStatus.WARNING:
-                status['status'] = ENopeDispatcherStatus.WARNING
+            elif self._timeouts['warn'] < diff <= self._timeouts['dead'] and status.status != ENopeDispatcherStatus.WARNING:
+                status.status = ENopeDispatcherStatus.WARNING
                 changes = True
-            elif self._timeouts['slow'] < diff <= self._timeouts['warn'] and status[
-                    'status'] != ENopeDispatcherStatus.SLOW:
-                status['status'] = ENopeDispatcherStatus.SLOW
+            elif self._timeouts['slow'] < diff <= self._timeouts['warn'] and status.status != ENopeDispatcherStatus.SLOW:
+                status.status = ENopeDispatcherStatus.SLOW
                 changes = True
-            elif diff <= self._timeouts['slow'] and status['status'] != ENopeDispatcherStatus.HEALTHY:
-                status['status'] = ENopeDispatcherStatus.HEALTHY
+            elif diff <= self._timeouts['slow'] and status.status != ENopeDispatcherStatus.HEALTHY:
+                status.status = ENopeDispatcherStatus.HEALTHY
                 changes = True
 
         if changes:
             # Execute the following function parallel.
-            EXECUTOR.callParallel(lambda: self.dispatchers.update)
+            EXECUTOR.callParallel(self.dispatchers.update)
 
     def _removeDispatcher(self, dispatcher: str, quiet=False):
         """ Removes a dispatcher.
         """
-        dispatcherInfo = self._externalDispatchers.pop(dispatcher, None)
-        if not quiet:
-            self.dispatchers.update()
+        dispatcherInfo = self._externalDispatchers.get(dispatcher, None)
+        if quiet:
+            # The changes are merged later on (see `_checkDispachterHealth`)
+            self._externalDispatchers.pop(dispatcher, None)
+        else:
+            self.dispatchers.removeKey(dispatcher)
         if self._logger and dispatcherInfo:
             self._logger.warn(
                 f'a dispatcher on {dispatcherInfo.host.name} went offline. ID of the Dispatcher: "{dispatcher}"')
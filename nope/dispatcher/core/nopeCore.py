@@ -55,10 +55,24 @@ class NopeCore:
         def onData(msg):
             msg = ensureDottedAccess(msg)
             if msg.sender != self._id:
-                data = msg.get("data")
-                name = msg.get("path")
+                changes = msg.get("changes")
                 msg.sender = rcvExternally
-                self.dataDistributor.pushData(name, data, msg)
+                if changes is not None:
+                    # A batch of changes (see `DataPubSubSystem.transaction`)
+                    with self.dataDistributor.transaction():
+                        for change in changes:
+                            applyChange(change, msg)
+                else:
+                    applyChange(msg, msg)
+
+        def applyChange(change, msg):
+            if "delta" in change:
+                # The sender only forwards the differences (see option `dataDelivery`)
+                self.dataDistributor.applyDelta(
+                    change["path"], change["delta"], msg)
+            else:
+                self.dataDistributor.pushData(
+                    change["path"], change.get("data"), msg)
 
         self._options = _options
         self._id = id
@@ -78,7 +92,11 @@ class NopeCore:
 
         self.eventDistributor = PubSubSystem()
         self.eventDistributor.id = self._id
-        self.dataDistributor = DataPubSubSystem()
+        # If `dataDelivery` is set to "delta", only the differences
+        # of the data are forwarded.
+        self.dataDistributor = DataPubSubSystem({
+            'delivery': _options.get("dataDelivery", "full")
+        })
         self.dataDistributor.id = self._id
 
         defaultSelector = generateSelector(
@@ -13,6 +13,7 @@ from nope.logger import defineNopeLogger
 from nope.merging import DictBasedMergeData
 from nope.modules import NopeGenericModule
 from nope.observable import NopeObservable
+from nope.types.messages import InstancesChanged
 
 
 class NopeInstanceManager:
@@ -122,13 +123,13 @@ class NopeInstanceManager:
         # Update the Instances provided by this module.
         await self._communicator.emit(
             "instancesChanged",
-            {
-                "dispatcher": self._id,
+            InstancesChanged(
+                dispatcher=self._id,
                 # We will send the descriptions.
                 # Generate the Module Description for every identifier:
-                "instances": list(
+                instances=list(
                     map(lambda item: self._instances[item]["instance"].toDescription(), self._internalInstances))
-            }
+            )
         )
 
         # Update the Instances
@@ -183,10 +184,10 @@ class NopeInstanceManager:
                 message: The Message from the System.
             """
             # Store the instance.
-            self._mappingOfRemoteDispatchersAndInstances[message.dispatcher] = message
+            message = InstancesChanged.from_wire(message)
 
             # Update the Mapping
-            self.instances.update()
+            self.instances.updateKey(message.dispatcher, message)
 
             if self._logger:
                 self._logger.debug(
@@ -255,8 +256,8 @@ class NopeInstanceManager:
         Args:
             dispatcher (str): The Id of the Dispatcher
         """
-        if self._mappingOfRemoteDispatchersAndInstances.pop(dispatcher, False):
-            self.instances.update()
+        if dispatcher in self._mappingOfRemoteDispatchersAndInstances:
+            self.instances.removeKey(dispatcher)
 
     async def registerConstructor(self, identifier: str, cb):
         """ Registers a Constructor, that enables other NopeInstanceManagers to create an instance of the given type. Therefore a callback "cb" is registered with the given "typeIdentifier"
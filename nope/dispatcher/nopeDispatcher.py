@@ -1,5 +1,6 @@
 from nope.dispatcher.core import NopeCore
-from nope.helpers.pathMatchingMethods import comparePatternAndPath, ensureDottedAccess
+from nope.helpers import ensureDottedAccess
+from nope.helpers.pathMatchingMethods import MATCH_CACHE
 
 
 class NopeDispatcher(NopeCore):
@@ -20,6 +21,15 @@ class NopeDispatcher(NopeCore):
         options = ensureDottedAccess(options)
         return self.dataDistributor.pushData(path, content, options)
 
+    def pushMany(self, changes: dict, options=None) -> None:
+        """ Pushs multiple values at once. The subscribers are informed once.
+        Args:
+            changes (dict): The paths and their content.
+            options (dict-like, optional): The Options during pushing. Defaults to None.
+        """
+        options = ensureDottedAccess(options)
+        return self.dataDistributor.pushMany(changes, options)
+
     def pullData(self, path: str, _default=None):
         """ Helper to pull some data from the system.
 
@@ -32,17 +42,18 @@ class NopeDispatcher(NopeCore):
         """
         return self.dataDistributor.pullData(path, _default)
 
-    def subscribeToEvent(self, event: str, callback):
+    def subscribeToEvent(self, event: str, callback, options=None):
         """ Helper to subscribe to specific events.
 
         Args:
             event (str): Name of the event to listen to.
             callback (callable): the Callback to use. Must receive *args.
+            options (dict-like, optional): Options of the subscription, for instance `throttleMs`, `debounceMs` or `sample`. Defaults to None.
 
         Returns:
             Observer: Observer for the Subcription. contains the methods "pause", "unpause" and "unsubscribe"
         """
-        return self.eventDistributor.registerSubscription(event, callback)
+        return self.eventDistributor.registerSubscription(event, callback, options)
 
     def emitEvent(self, eventName, data, options=None):
         """ Emits an event with the given name. All event-subscriber, where the topic matches will receive this notification.
@@ -84,8 +95,9 @@ class NopeDispatcher(NopeCore):
         else:
             raise Exception('Invalid Type-Parameter')
 
-        return list(filter(lambda item: comparePatternAndPath(
-            pattern, item).affected, items))
+        # Uses the cache shared with the pub-sub-systems. In contrast to them, a topic without
+        # wildcards only matches itself.
+        return [item for item in items if MATCH_CACHE.compare(pattern, item, False).affected]
 
     def getAllHosts(self):
         hosts = set()
@@ -95,7 +107,7 @@ class NopeDispatcher(NopeCore):
 
     def toDescription(self):
 
-        ret = self.connectivityManager.info.copy()
+        ret = ensureDottedAccess(self.connectivityManager.info.to_wire())
         ret.update(
             ensureDottedAccess({
                 'isMaster': self.connectivityManager.isMaster,
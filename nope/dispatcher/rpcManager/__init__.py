@@ -1,2 +1,3 @@
 from .rpcManager import NopeRpcManager
+from .streaming import RpcStream
 from .selectors import generateSelector
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+import asyncio
+from collections import deque
+
+POLICIES = ("wait", "reject")
+""" The valid policies of the `ServiceLimiter`. """
+
+
+class ServiceLimiter:
+    """ Limits the concurrent executions of a service (see the options `maxConcurrency`,
+        `queueSize` and `policy` of `registerService`). If `maxConcurrency` executions
+        are running, a request either waits (policy "wait") in a queue with at most
+        `queueSize` entries or is rejected (policy "reject"). A request, which doesnt
+        fit into the queue, is rejected as well.
+    """
+
+    def __init__(self, serviceName: str, maxConcurrency: int, queueSize: int = None, policy: str = "wait"):
+        if policy not in POLICIES:
+            raise Exception(
+                f'Invalid policy "{policy}". Valid policies are: {", ".join(POLICIES)}')
+        self.serviceName = serviceName
+        self.maxConcurrency = maxConcurrency
+        self.queueSize = queueSize
+        self.policy = policy
+        self.running = 0
+        self._waiting = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    async def acquire(self):
+        """ Waits until the service could be executed.
+
+        Raises:
+            Exception: If the request is rejected.
+        """
+        if self.running < self.maxConcurrency and not self._waiting:
+            self.running += 1
+            return
+
+        if self.policy == "reject" or (self.queueSize is not None and len(self._waiting) >= self.queueSize):
+            raise Exception(
+                f'The service "{self.serviceName}" is overloaded. The request has been rejected.')
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot has already been handed over.
+                self.release()
+            else:
+                self._waiting.remove(waiter)
+            raise
+
+    def release(self):
+        """ Marks an execution as finished. The slot is handed over to the next waiting request.
+        """
+        while self._waiting:
+            waiter = self._waiting.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def toStatus(self) -> dict:
+        """ Returns the load of the service.
+
+        Returns:
+            dict: Contains `running`, `waiting` and `maxConcurrency`.
+        """
+        return {
+            "running": self.running,
+            "waiting": len(self._waiting),
+            "maxConcurrency": self.maxConcurrency
+        }
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+import asyncio
+
+from nope.helpers import EXECUTOR
+
+
+class MessageBatcher:
+    """ Collects items (i.e. rpc-requests) per key (i.e. the target) and sends them together.
+        The items of a key are sent, once `size` items have been collected or `delay` µs
+        have passed since the first item has been added.
+    """
+
+    def __init__(self, send, delay: float = 500, size: int = 50):
+        """ Creates the batcher.
+
+        Args:
+            send (async callable): Function called with the key and the list of items.
+            delay (float, optional): Maximal delay of an item in µs. Defaults to 500.
+            size (int, optional): Maximal amount of items per batch. Defaults to 50.
+        """
+        self._send = send
+        self.delay = delay
+        self.size = size
+        self._pending = dict()
+        self._timers = dict()
+
+    async def add(self, key, item, delay: float = None):
+        """ Adds an item.
+
+        Args:
+            key: The key of the batch.
+            item: The item.
+            delay (float, optional): Delay (in µs) to use instead of the default one. Defaults to None.
+        """
+        items = self._pending.get(key)
+        if items is None:
+            items = self._pending[key] = []
+            self._timers[key] = EXECUTOR.setTimeout(
+                self._onTimeout, (self.delay if delay is None else delay) / 1000, key)
+
+        items.append(item)
+
+        if len(items) >= self.size:
+            await self.flush(key)
+
+    async def _onTimeout(self, key):
+        # The timer must not cancel itself.
+        self._timers.pop(key, None)
+        await self.flush(key)
+
+    async def flush(self, key):
+        """ Sends the collected items of the key.
+
+        Args:
+            key: The key of the batch.
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        items = self._pending.pop(key, None)
+        if items:
+            await self._send(key, items)
+
+    async def flushAll(self):
+        """ Sends all collected items.
+        """
+        await asyncio.gather(*(self.flush(key) for key in list(self._pending)))
+
+    def clear(self):
+        """ Drops all collected items.
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
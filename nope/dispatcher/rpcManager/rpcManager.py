@@ -3,6 +3,7 @@
 # @email m.karkowski@zema.de
 
 import asyncio
+import inspect
 
 from nope.communication.bridge import Bridge
 from nope.dispatcher.connectivityManager import NopeConnectivityManager
@@ -12,6 +13,13 @@ from nope.helpers import generateId, ensureDottedAccess, isAsyncFunction, \
 from nope.logger import defineNopeLogger
 from nope.merging import DictBasedMergeData
 from nope.observable import NopeObservable
+from nope.types.messages import RpcRequest, RpcRequestBatch, RpcResponse, RpcResponseBatch, RpcStreamAck, \
+    RpcStreamChunk, ServicesChanged
+
+from .admission import ServiceLimiter
+from .batching import MessageBatcher
+from .selectors import ServiceCandidates, TargetStatistics, generateSelector
+from .streaming import DEFAULT_WINDOW, STREAM_ACK_TIMEOUT, ProvidedStream, RpcStream
 
 _DEFAULT_RESULT = object()
 
@@ -23,8 +31,12 @@ class WrappedFunction:
         self._unregister = unregister
         self.id = _id
         self.isAsync = isAsyncFunction(func)
+        self.isStream = inspect.isasyncgenfunction(func)
 
     def __call__(self, *args, **kwarg):
+        if self.isStream:
+            # Returns the async generator.
+            return self._func(*args, **kwarg)
         return EXECUTOR.callParallel(self._func, *args, **kwarg)
 
 
@@ -32,6 +44,22 @@ class NopeRpcManager:
 
     def __init__(self, options, defaultSelector, id=None,
                  connectivityManager=None):
+        """ Creates the rpc-manager.
+
+        Args:
+            options (dict): The options. Contains the `communicator` and the `logger`. To send the
+                requests to the same target in batches (`rpcRequestBatch`), provide `batchSize` (maximal
+                amount of requests per batch, > 1) and `batchDelay` (maximal delay of a request in µs,
+                defaults to 500). Only enable batching, if every provider supports batches. Streamed
+                results are stopped, if the requester doesnt acknowledge the chunks within
+                `streamAckTimeout` ms (defaults to `STREAM_ACK_TIMEOUT`).
+            defaultSelector (callable): The selector used, if multiple providers exist. The
+                selectors receive the `rpcManager`, which provides the providers of the services
+                (`candidates`) and the outstanding requests and response times per target
+                (`statistics`).
+            id (str, optional): The id of the manager. Defaults to None.
+            connectivityManager (NopeConnectivityManager, optional): The connectivity-manager to use. Defaults to None.
+        """
 
         options = ensureDottedAccess(options)
 
@@ -51,6 +79,9 @@ class NopeRpcManager:
             self._connectivityManager = NopeConnectivityManager(
                 options, self.id)
 
+        # Publish the load in the status of the dispatcher.
+        self._connectivityManager.getLoad = lambda: self.load
+
         self._logger = defineNopeLogger(options.logger, 'core.rpc-manager')
         self.ready = NopeObservable()
         self.ready.setContent(False)
@@ -62,11 +93,29 @@ class NopeRpcManager:
             self._mappingOfDispatchersAndServices, 'services/+', 'services/+/id')
         self.onCancelTask = NopeEventEmitter()
 
+        # Used by the selectors (see `generateSelector`).
+        self.candidates = ServiceCandidates(self.services)
+        self.statistics = TargetStatistics()
+        self._selectors = dict()
+
         if self._logger:
             self._logger.info(f'manager created id={self.id}')
 
         self._runningExternalRequestedTasks = dict()
 
+        # Streamed results (see `RpcStream`), requested by this manager and provided by this manager.
+        self._openStreams = dict()
+        self._providedStreams = dict()
+        self._streamAckTimeout = options.streamAckTimeout or STREAM_ACK_TIMEOUT
+
+        # Batching of the requests (opt-in) and of the responses to batched requests.
+        self._requestBatcher = None
+        if (options.batchSize or 0) > 1:
+            self._requestBatcher = MessageBatcher(
+                self._sendRequestBatch, options.batchDelay or 500, options.batchSize)
+        self._responseBatcher = MessageBatcher(
+            self._sendResponseBatch, size=options.batchSize or 50)
+
         self.reset()
         EXECUTOR.callParallel(self._init)
 
@@ -74,11 +123,37 @@ class NopeRpcManager:
     def id(self):
         return self._id
 
-    def updateDispatcher(self, msg):
-        self._mappingOfDispatchersAndServices[msg.dispatcher] = msg
-        self.services.update()
+    def updateDispatcher(self, msg: ServicesChanged):
+        msg = ServicesChanged.from_wire(msg)
+        self.services.updateKey(msg.dispatcher, msg)
+
+    def _getLimiter(self, serviceName: str) -> ServiceLimiter | None:
+        service = self._registeredServices.get(serviceName)
+        return service.limiter if service is not None else None
 
-    async def _handleExternalRequest(self, data, func: WrappedFunction | None = None):
+    @property
+    def load(self) -> dict:
+        """ The load of the provided services. Published in `statusChanged` (field `load`).
+
+        Returns:
+            dict: Contains the amount of running `tasks` and the load of the `services`
+                with limited concurrency (see `ServiceLimiter.toStatus`).
+        """
+        return {
+            "tasks": len(self._runningExternalRequestedTasks),
+            "services": {
+                name: service.limiter.toStatus()
+                for name, service in self._registeredServices.items()
+                if service.limiter is not None
+            }
+        }
+
+    async def _emitResponse(self, result: RpcResponse):
+        await self._communicator.emit("rpcResponse", result)
+
+    async def _handleExternalRequest(self, data: RpcRequest, func: WrappedFunction | None = None, respond=None):
+        # Function used to send the result.
+        respond = respond if respond is not None else self._emitResponse
         try:
             if not callable(func):
                 if data.functionId not in self._registeredServices:
@@ -119,9 +194,7 @@ class NopeRpcManager:
                 for item in data.params:
                     args[item.idx] = item.data
 
-                _result = _DEFAULT_RESULT
-
-                if not func.isAsync and not self.__warned:
+                if not (func.isAsync or func.isStream) and not self.__warned:
                     if self._logger:
                         self._logger.warn(
                             "!!! You have provided synchronous functions. They may break NoPE. Use them with care !!!")
@@ -134,40 +207,7 @@ class NopeRpcManager:
                     # We only want to warn the user once.
                     self.__warned = True
 
-                resultPromise = func(*args)
-
-                try:
-                    if resultPromise is not None and getattr(
-                            resultPromise, 'cancelCallback', False):
-                        def _cancel_main(reason):
-                            resultPromise.cancelCallback(reason)
-
-                        cbs.append(_cancel_main)
-
-                except Exception as error:
-                    # The Cancel Function isn't available in
-                    # the provided promise.
-                    pass
-
-                self._runningExternalRequestedTasks[data.taskId] = data.requestedBy
-
-                # Wait for the Result to finish.
-                _result = await resultPromise
-
-                # Define the Result message
-                result = {
-                    'result': _result if _result is not _DEFAULT_RESULT else None,
-                    'taskId': data.taskId,
-                    'type': 'response'
-                }
-
-                if self._logger:
-                    self._logger.debug(
-                        'Internally executed requested Function for Task: ' + str(data['taskId']) + " - Function \"" +
-                        data['functionId'] + '\". Sending result on ' + str(data['resultSink']))
-
-                # Use the communicator to publish the result.
-                await self._communicator.emit("rpcResponse", result)
+                await self._executeRequest(data, func, args, cbs, respond)
 
         except Exception as error:
 
@@ -178,21 +218,196 @@ class NopeRpcManager:
             else:
                 print(formatException(error))
 
-            self._runningExternalRequestedTasks.pop(data.requestedBy, None)
+            self._runningExternalRequestedTasks.pop(data.taskId, None)
 
-            result = {
-                'error': {
+            result = RpcResponse(
+                taskId=data.taskId,
+                error={
                     'error': str(error),
                     'msg': str(error)
-                },
-                'taskId': data.taskId,
-                'type': 'response'
-            }
+                }
+            )
 
             # Use the communicator to publish the result.
-            await self._communicator.emit("rpcResponse", result)
+            await respond(result)
+
+    async def _executeRequest(self, data: RpcRequest, func: WrappedFunction, args: list, cbs: list, respond):
+        """ Executes the requested function and sends the result. Waits for a slot of the
+            `ServiceLimiter` of the service (if present). The task is listed as running (see
+            `load`) until it has been executed. Used by every handler of requests (i.e. plugins).
+
+        Args:
+            data (RpcRequest): The request.
+            func (WrappedFunction): The function to execute.
+            args (list): The arguments.
+            cbs (list): The callbacks called on canceling the task.
+            respond (callable): Function used to send the result.
+        """
+        self._runningExternalRequestedTasks[data.taskId] = data.requestedBy
+
+        try:
+            limiter = self._getLimiter(data.functionId)
+            if limiter is not None:
+                # Wait for a free slot (or get rejected). A canceled task stops waiting.
+                acquiring = asyncio.ensure_future(limiter.acquire())
+                cbs.append(lambda reason: acquiring.cancel())
+                try:
+                    await acquiring
+                except asyncio.CancelledError:
+                    return
+
+            _result = _DEFAULT_RESULT
+
+            try:
+                if func.isStream:
+                    # Stream the items. The result contains the amount of chunks.
+                    _result = await self._streamResult(data, func(*args), cbs)
+                else:
+                    resultPromise = func(*args)
+
+                    try:
+                        if resultPromise is not None and getattr(
+                                resultPromise, 'cancelCallback', False):
+                            def _cancel_main(reason):
+                                resultPromise.cancelCallback(reason)
+
+                            cbs.append(_cancel_main)
+
+                    except Exception as error:
+                        # The Cancel Function isn't available in
+                        # the provided promise.
+                        pass
+
+                    # Wait for the Result to finish.
+                    _result = await resultPromise
+            finally:
+                if limiter is not None:
+                    limiter.release()
+        finally:
+            self._runningExternalRequestedTasks.pop(data.taskId, None)
+
+        # Define the Result message
+        result = RpcResponse(
+            taskId=data.taskId,
+            result=_result if _result is not _DEFAULT_RESULT else None
+        )
+
+        if self._logger:
+            self._logger.debug(
+                'Internally executed requested Function for Task: ' + str(data['taskId']) + " - Function \"" +
+                data['functionId'] + '\". Sending result on ' + str(data['resultSink']))
+
+        # Use the communicator to publish the result.
+        await respond(result)
+
+    async def _streamResult(self, data: RpcRequest, generator, cbs: list) -> int:
+        """ Sends the items of the generator as `rpcStreamChunk`, considering the
+            credits of the requester.
+
+        Returns:
+            int: The amount of sent chunks.
+        """
+        stream = ProvidedStream(data.get("streamWindow") or DEFAULT_WINDOW, data.requestedBy)
+        sent = 0
+
+        async def pump():
+            nonlocal sent
+            async for chunk in generator:
+                if not await stream.acquire(self._streamAckTimeout):
+                    break
+                await self._communicator.emit("rpcStreamChunk", RpcStreamChunk(
+                    taskId=data.taskId,
+                    seq=sent,
+                    data=chunk
+                ))
+                sent += 1
+
+        task = asyncio.ensure_future(pump())
+
+        def cancel(reason):
+            stream.cancel()
+            task.cancel()
+
+        cbs.append(cancel)
+        self._providedStreams[data.taskId] = stream
 
-    async def _handle_external_response(self, data):
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._providedStreams.pop(data.taskId, None)
+            await generator.aclose()
+
+        return sent
+
+    def _handleStreamChunk(self, msg: RpcStreamChunk):
+        stream = self._openStreams.get(msg.taskId)
+        if stream is not None:
+            stream._addChunk(msg.data)
+
+    def _handleStreamAck(self, msg: RpcStreamAck):
+        if msg.dispatcher == self._id:
+            stream = self._providedStreams.get(msg.taskId)
+            if stream is not None:
+                stream.addCredits(msg.credits)
+
+    async def _acknowledgeChunks(self, taskId: str, credits: int):
+        task = self._runningInternalRequestedTasks.get(taskId)
+        if task is not None:
+            await self._communicator.emit("rpcStreamAck", RpcStreamAck(
+                taskId=taskId,
+                dispatcher=task.target,
+                credits=credits
+            ))
+
+    async def _handleExternalRequestBatch(self, msg: RpcRequestBatch):
+        """ Executes the requests of the batch concurrently. The responses are sent
+            in batches (`rpcResponseBatch`).
+        """
+        if msg.target is not None and msg.target != self.id:
+            return
+
+        requestedBy = msg.requestedBy
+
+        async def respond(result):
+            await self._responseBatcher.add(requestedBy, result, msg.delay)
+
+        await asyncio.gather(*(self._handleExternalRequest(RpcRequest.from_wire(item), respond=respond)
+                               for item in msg.requests))
+
+        # Every request has been answered.
+        await self._responseBatcher.flush(requestedBy)
+
+    async def _sendRequestBatch(self, target, packets):
+        # Skip the tasks, which have been canceled in the meantime.
+        packets = [packet for packet in packets
+                   if packet.taskId in self._runningInternalRequestedTasks]
+
+        if len(packets) == 1:
+            await self._communicator.emit("rpcRequest", packets[0])
+        elif packets:
+            await self._communicator.emit("rpcRequestBatch", RpcRequestBatch(
+                requestedBy=self._id,
+                target=target,
+                requests=[packet.to_wire() for packet in packets],
+                delay=self._requestBatcher.delay
+            ))
+
+    async def _sendResponseBatch(self, requestedBy, results):
+        if len(results) == 1:
+            await self._communicator.emit("rpcResponse", results[0])
+        else:
+            await self._communicator.emit("rpcResponseBatch", RpcResponseBatch(
+                # Plugins may respond with plain dicts.
+                responses=[RpcResponse.from_wire(result).to_wire() for result in results]
+            ))
+
+    async def _handleExternalResponseBatch(self, msg: RpcResponseBatch):
+        for item in msg.responses:
+            await self._handle_external_response(RpcResponse.from_wire(item))
+
+    async def _handle_external_response(self, data: RpcResponse):
         try:
             # Extract the Task
             task: DottedDict = self._runningInternalRequestedTasks.get(
@@ -217,7 +432,7 @@ class NopeRpcManager:
 
                     if "timeout" in task and task.timeout is not None:
                         # Assume, that the timeout has been
-                        # defined with setTimeout
+                        # defined with callLater
                         task.timeout.cancel()
 
                     return True
@@ -251,10 +466,11 @@ class NopeRpcManager:
         """ Function used to update the Available Services.
         """
 
-        message = ensureDottedAccess({
-            "dispatcher": self.id,
-            "services": list(map(lambda item: item.options, self._registeredServices.values()))
-        })
+        message = ServicesChanged(
+            dispatcher=self.id,
+            services=list(map(lambda item: item.options,
+                          self._registeredServices.values()))
+        )
 
         if self._logger:
             self._logger.debug("sending available services")
@@ -281,6 +497,12 @@ class NopeRpcManager:
         await self._communicator.on("rpcRequest", lambda data: EXECUTOR.callParallel(self._handleExternalRequest, data))
         await self._communicator.on("rpcResponse",
                                     lambda data: EXECUTOR.callParallel(self._handle_external_response, data))
+        await self._communicator.on("rpcRequestBatch",
+                                    lambda data: EXECUTOR.callParallel(self._handleExternalRequestBatch, data))
+        await self._communicator.on("rpcResponseBatch",
+                                    lambda data: EXECUTOR.callParallel(self._handleExternalResponseBatch, data))
+        await self._communicator.on("rpcStreamChunk", self._handleStreamChunk)
+        await self._communicator.on("rpcStreamAck", self._handleStreamAck)
 
         def on_cancelation(msg):
             if msg.dispatcher == self._id:
@@ -315,9 +537,8 @@ class NopeRpcManager:
         self.ready.setContent(True)
 
     def removeDispatcher(self, dispatcherId: str):
-        res = self._mappingOfDispatchersAndServices.pop(dispatcherId, False)
-        if (res):
-            self.services.update()
+        if dispatcherId in self._mappingOfDispatchersAndServices:
+            self.services.removeKey(dispatcherId)
 
             # Now we need to cancel every Task of the dispatcher,
             # which isnt present any more.
@@ -380,6 +601,11 @@ class NopeRpcManager:
             if requestedBy == dispatcher:
                 toCancel.add(taskId)
 
+        # Stop the streams, the dispatcher wont acknowledge any more.
+        for stream in self._providedStreams.values():
+            if stream.requestedBy == dispatcher:
+                stream.cancel()
+
         return await self._cancelHelper(toCancel, reason)
 
     async def cancelRunningTasksOfDispatcher(self, dispatcher: str, reason):
@@ -432,6 +658,17 @@ class NopeRpcManager:
         return f'nope{SPLITCHAR}service{SPLITCHAR}{serviceName}'
 
     async def registerService(self, func, options):
+        """ Registers a service.
+
+        Args:
+            func (callable): The service. Async generators stream their items (see `RpcStream`).
+            options (dict): The options of the service. Contains the `id` and optionally the limits of
+                the concurrent executions: `maxConcurrency`, `queueSize` and `policy` ("wait" or "reject",
+                see `ServiceLimiter`).
+
+        Returns:
+            WrappedFunction: The wrapped service.
+        """
         options = ensureDottedAccess(options)
 
         # Define / Use the ID of the Function.
@@ -447,7 +684,7 @@ class NopeRpcManager:
 
         options.id = idOfFunc
 
-        if not self.__warned and not isAsyncFunction(func):
+        if not self.__warned and not isAsyncFunction(func) and not inspect.isasyncgenfunction(func):
             if self._logger:
                 self._logger.warn(
                     "!!! You have provided synchronous functions. They may break NoPE. Use them with care !!!")
@@ -467,9 +704,16 @@ class NopeRpcManager:
         # Create a Wrapper
         wrapped = WrappedFunction(func, idOfFunc, unregister)
 
+        # Limit the concurrent executions (if desired)
+        limiter = None
+        if options.maxConcurrency:
+            limiter = ServiceLimiter(
+                idOfFunc, options.maxConcurrency, options.queueSize, options.policy or "wait")
+
         self._registeredServices[idOfFunc] = ensureDottedAccess({
             "options": options,
-            "func": wrapped
+            "func": wrapped,
+            "limiter": limiter
         })
 
         await self._sendAvailableServices()
@@ -480,6 +724,18 @@ class NopeRpcManager:
 
         return wrapped
 
+    def _generateTaskId(self) -> str:
+        """ Generates the id of a task. Uses the option `idGenerator` or the generator
+            of the executor (see `EXECUTOR.useIdGenerator`).
+
+        Returns:
+            str: The id of the task.
+        """
+        generator = self.options.get("idGenerator")
+        if generator is None:
+            generator = EXECUTOR.idGenerator
+        return generator()
+
     async def _performCall(self, serviceName, params, options=None):
         optionsToUse = ensureDottedAccess({
             "resultSink": self._getServiceName(serviceName, "response"),
@@ -487,11 +743,18 @@ class NopeRpcManager:
         })
         optionsToUse.update(ensureDottedAccess(options))
 
-        taskId = generateId()
+        taskId = self._generateTaskId()
 
         # Create a Future of the Loop.
         future = EXECUTOR.generatePromise(taskId=taskId)
 
+        stream = None
+        if optionsToUse.stream:
+            # The chunks of the result are provided by the stream.
+            stream = RpcStream(self, taskId, future,
+                               optionsToUse.window or DEFAULT_WINDOW)
+            self._openStreams[taskId] = stream
+
         def clear():
             if taskId in self._runningInternalRequestedTasks:
                 task = self._runningInternalRequestedTasks[taskId]
@@ -516,14 +779,17 @@ class NopeRpcManager:
             self._runningInternalRequestedTasks[taskId] = tastRequest
 
             # Define the packet to send:
-            packet = {
-                'functionId': serviceName,
-                'params': [],
-                'taskId': taskId,
-                'resultSink': optionsToUse['resultSink'],
-                'requestedBy': self._id,
-                'target': None
-            }
+            packet = RpcRequest(
+                functionId=serviceName,
+                params=[],
+                taskId=taskId,
+                resultSink=optionsToUse['resultSink'],
+                requestedBy=self._id,
+                target=None
+            )
+
+            if stream is not None:
+                packet["streamWindow"] = stream.window
 
             # Iterate over all Parameters and
             # Determin Callbacks. Based on the Parameter-
@@ -531,7 +797,7 @@ class NopeRpcManager:
             # for parsable Parameters) and packet.callbacks
             # (for callback Parameters)
             for idx, param in enumerate(params):
-                packet['params'].append({
+                packet.params.append({
                     'idx': idx,
                     'data': param
                 })
@@ -546,28 +812,15 @@ class NopeRpcManager:
 
                 raise error
 
-            if self.options.forceUsingSelectors or self.services.amountOf.get(
-                    serviceName, 0) > 1:
-
-                optionsForSelector = ensureDottedAccess({
-                    "rpcManager": self,
-                    "serviceName": serviceName
-                })
+            tastRequest.target = await self._selectTarget(serviceName, optionsToUse)
+            self.statistics.track(tastRequest.target, future)
 
-                if isinstance(optionsToUse.target, str):
-                    tastRequest.target = optionsToUse.target
-                elif callable(optionsToUse.selector):
-                    tastRequest.target = await options.selector(optionsForSelector)
-                elif isinstance(optionsToUse.selector, str):
-                    tastRequest.target = await self._defaultSelector(optionsForSelector)
+            packet.target = tastRequest.target
 
+            if self._requestBatcher is not None:
+                await self._requestBatcher.add(packet.target, packet)
             else:
-                tastRequest.target = list(
-                    self.services.keyMappingreverse[serviceName])[0]
-
-            packet["target"] = tastRequest.target
-
-            await self._communicator.emit("rpcRequest", packet)
+                await self._communicator.emit("rpcRequest", packet)
 
             if self._logger:
                 self._logger.debug(
@@ -582,7 +835,7 @@ class NopeRpcManager:
                     )
 
                 # Create our timeout and store it.
-                tastRequest.timeout = EXECUTOR.setTimeout(
+                tastRequest.timeout = EXECUTOR.callLater(
                     onTimeout, optionsToUse.timeout)
 
         except Exception as err:
@@ -604,6 +857,9 @@ class NopeRpcManager:
 
         future.cancelCallback = _cancelTask
 
+        if stream is not None:
+            return stream
+
         if not optionsToUse.waitForResult:
             EXECUTOR.loop.create_task(future)
             return future
@@ -639,8 +895,49 @@ class NopeRpcManager:
 
             return await self._performCall(serviceName, params, options)
 
+    def _getSelector(self, selector: str):
+        func = self._selectors.get(selector)
+        if func is None:
+            func = self._selectors[selector] = generateSelector(selector, ensureDottedAccess({
+                "id": self._id,
+                "rpcManager": self,
+                "connectivityManager": self._connectivityManager
+            }))
+        return func
+
+    async def _selectTarget(self, serviceName: str, options) -> str:
+        """ Determines the dispatcher, which should execute the service.
+
+        Args:
+            serviceName (str): The name of the service.
+            options: The options of the call. Either a `target` (id of a dispatcher) or a
+                `selector` (callable or the name of a selector, see `generateSelector`).
+
+        Returns:
+            str: The id of the dispatcher.
+        """
+        if isinstance(options.target, str):
+            return options.target
+
+        if self.options.forceUsingSelectors or self.services.amountOf.get(serviceName, 0) > 1:
+            optionsForSelector = ensureDottedAccess({
+                "rpcManager": self,
+                "serviceName": serviceName
+            })
+
+            if callable(options.selector):
+                return await options.selector(optionsForSelector)
+            elif isinstance(options.selector, str):
+                return await self._getSelector(options.selector)(optionsForSelector)
+            return await self._defaultSelector(optionsForSelector)
+
+        return self.candidates.get(serviceName)[0]
+
     def clearTasks(self):
         self._runningInternalRequestedTasks.clear()
+        self.statistics.clear()
+        if self._requestBatcher is not None:
+            self._requestBatcher.clear()
 
     def unregisterAll(self, log=False):
         toUnregister = list(self._registeredServices.keys())
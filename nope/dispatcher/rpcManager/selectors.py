@@ -2,7 +2,9 @@
 # @author Martin Karkowski
 # @email m.karkowski@zema.de
 
-from nope.helpers import maxOfArray, minOfArray
+import random
+import time
+from functools import partial
 
 
 ValidDefaultSelectors = [
@@ -12,14 +14,135 @@ ValidDefaultSelectors = [
     "host",
     "free-ram",
     "cpu-usage",
+    "round-robin",
+    "least-outstanding",
+    "ewma",
+    "power-of-two",
 ]
 
 
+class ServiceCandidates:
+    """ Cache of the providers of the services. The providers of a service are stored as
+        tuple, which is renewed, once the providers of the service change.
+    """
+
+    __slots__ = ("_services", "_cache")
+
+    def __init__(self, services):
+        """ Creates the cache.
+
+        Args:
+            services (DictBasedMergeData): The services of the rpc-manager.
+        """
+        self._services = services
+        self._cache = dict()
+
+    def get(self, serviceName: str) -> tuple:
+        """ Returns the ids of the dispatchers providing the service.
+
+        Args:
+            serviceName (str): The name of the service.
+
+        Returns:
+            tuple: The ids of the dispatchers.
+        """
+        # The set of the providers is replaced on every change.
+        providers = self._services.keyMappingreverse.get(serviceName)
+        cached = self._cache.get(serviceName)
+        if cached is not None and cached[0] is providers:
+            return cached[1]
+        if providers is None:
+            self._cache.pop(serviceName, None)
+            return ()
+        candidates = tuple(providers)
+        self._cache[serviceName] = (providers, candidates)
+        return candidates
+
+
+class TargetStatistics:
+    """ The outstanding requests and the response times (exponentially weighted moving
+        average, in seconds) per target dispatcher. A failed request (error or timeout)
+        counts with a response time of at least `failurePenalty` seconds, so the selectors
+        avoid failing targets.
+    """
+
+    __slots__ = ("alpha", "failurePenalty", "outstanding", "latency")
+
+    def __init__(self, alpha: float = 0.2, failurePenalty: float = 1.0):
+        self.alpha = alpha
+        self.failurePenalty = failurePenalty
+        self.outstanding = dict()
+        self.latency = dict()
+
+    def track(self, target: str, future):
+        """ Tracks a request, which is finished, once the future is done.
+
+        Args:
+            target (str): The id of the target dispatcher.
+            future (asyncio.Future): The future of the task.
+        """
+        self.outstanding[target] = self.outstanding.get(target, 0) + 1
+        future.add_done_callback(
+            partial(self._done, target, time.perf_counter()))
+
+    def _done(self, target, start, future):
+        amount = self.outstanding.get(target, 0) - 1
+        if amount > 0:
+            self.outstanding[target] = amount
+        else:
+            self.outstanding.pop(target, None)
+
+        if future.cancelled():
+            return
+
+        duration = time.perf_counter() - start
+        if future.exception() is not None:
+            duration = max(duration, self.failurePenalty)
+        latency = self.latency.get(target)
+        self.latency[target] = duration if latency is None else latency + \
+            self.alpha * (duration - latency)
+
+    def clear(self):
+        self.outstanding.clear()
+        self.latency.clear()
+
+
+def _candidatesOf(opts, core):
+    rpcManager = opts.rpcManager or core.rpcManager
+    candidates = rpcManager.candidates.get(opts.serviceName)
+    if not candidates:
+        raise Exception('No matching dispatcher present.')
+    return rpcManager, candidates
+
+
+def _bestOf(candidates, score):
+    """ Returns the candidate with the lowest score (ignoring the candidates with `None`).
+    """
+    best = None
+    bestScore = None
+    for candidate in candidates:
+        value = score(candidate)
+        if value is not None and (bestScore is None or value < bestScore):
+            best = candidate
+            bestScore = value
+    if best is None:
+        raise Exception('No matching dispatcher present.')
+    return best
+
+
+def _hostValue(core, _id, getter):
+    status = core.connectivityManager.dispatchers.originalData.get(_id)
+    try:
+        return getter(status.host)
+    except (AttributeError, TypeError):
+        return None
+
+
 def generateSelector(selector, core):
     """ A Helper Function, to generate the Basic selector Functions.
 
     params:
-        selector (master|first|dispatcher|host|cpu-usage)
+        selector (master|first|dispatcher|host|cpu-usage|free-ram|round-robin|least-outstanding|ewma|power-of-two)
 
     """
 
@@ -84,26 +207,66 @@ def generateSelector(selector, core):
 
     elif selector == 'cpu-usage':
 
-        async def cpuUsage():
-            dispatchers = core.connectivityManager.dispatchers.data.getContent()
-            best_option = minOfArray(dispatchers, 'host.cpu.usage')
-            if best_option.index >= 0:
-                return dispatchers[best_option.index]
-            raise Exception('No matching dispatcher present.')
+        async def cpuUsage(opts):
+            _, candidates = _candidatesOf(opts, core)
+            return _bestOf(candidates, lambda _id: _hostValue(core, _id, lambda host: host.cpu.usage))
 
         return cpuUsage
 
     elif selector == 'free-ram':
 
-        async def ramUsage():
-            dispatchers = core.connectivityManager.dispatchers.data.getContent()
-            best_option = maxOfArray(dispatchers, 'host.ram.free')
-            if best_option.index >= 0:
-                return dispatchers[best_option.index]
-
-            raise Exception('No matching dispatcher present.')
+        async def ramUsage(opts):
+            _, candidates = _candidatesOf(opts, core)
+            # The most free ram has the lowest score.
+            return _bestOf(candidates, lambda _id: _hostValue(core, _id, lambda host: -host.ram.free))
 
         return ramUsage
 
+    elif selector == 'round-robin':
+
+        counters = dict()
+
+        async def roundRobin(opts):
+            _, candidates = _candidatesOf(opts, core)
+            idx = counters.get(opts.serviceName, -1) + 1
+            counters[opts.serviceName] = idx
+            return candidates[idx % len(candidates)]
+
+        return roundRobin
+
+    elif selector == 'least-outstanding':
+
+        async def leastOutstanding(opts):
+            rpcManager, candidates = _candidatesOf(opts, core)
+            outstanding = rpcManager.statistics.outstanding
+            return _bestOf(candidates, lambda _id: outstanding.get(_id, 0))
+
+        return leastOutstanding
+
+    elif selector == 'ewma':
+
+        async def ewma(opts):
+            rpcManager, candidates = _candidatesOf(opts, core)
+            outstanding = rpcManager.statistics.outstanding
+            latency = rpcManager.statistics.latency
+            # The expected response time (failures are penalized, see `TargetStatistics`).
+            # Dispatchers without measurement are preferred.
+            return _bestOf(candidates, lambda _id: latency.get(_id, 0) * (outstanding.get(_id, 0) + 1))
+
+        return ewma
+
+    elif selector == 'power-of-two':
+
+        async def powerOfTwo(opts):
+            rpcManager, candidates = _candidatesOf(opts, core)
+            if len(candidates) == 1:
+                return candidates[0]
+            outstanding = rpcManager.statistics.outstanding
+            latency = rpcManager.statistics.latency
+            return _bestOf(random.sample(candidates, 2),
+                           lambda _id: (outstanding.get(_id, 0), latency.get(_id, 0)))
+
+        return powerOfTwo
+
     else:
         raise Exception('Please use a valid selector')
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Streamed results of services, which are defined as async generators.
+
+    The provider sends every item of the generator as `rpcStreamChunk`. Afterwards the
+    final `rpcResponse` contains the amount of sent chunks. The provider sends at most
+    `window` chunks, which havent been acknowledged by the requester (`rpcStreamAck`). If
+    the requester doesnt acknowledge the chunks within `STREAM_ACK_TIMEOUT` ms, the provider
+    stops the stream (the requester may have left the stream without closing it).
+"""
+
+import asyncio
+from collections import deque
+
+DEFAULT_WINDOW = 16
+""" Default amount of unacknowledged chunks. """
+
+STREAM_ACK_TIMEOUT = 60 * 1000
+""" Default time in ms, the provider waits for an acknowledgement. """
+
+
+class RpcStream:
+    """ Async iterator over the chunks of a streamed result (see `performCall` with the
+        option `stream`):
+
+            async with await manager.performCall("tail", [], {"stream": True}) as stream:
+                async for chunk in stream:
+                    print(chunk)
+
+        Closing the stream early (`aclose` or leaving the `async with` block) cancels the
+        task. Otherwise the provider waits for the acknowledgement of the sent chunks (at most
+        `STREAM_ACK_TIMEOUT` ms).
+    """
+
+    def __init__(self, manager, taskId: str, future: asyncio.Future, window: int = DEFAULT_WINDOW):
+        self.taskId = taskId
+        self.window = window
+        self._manager = manager
+        self._future = future
+        self._chunks = deque()
+        self._received = 0
+        self._unacknowledged = 0
+        self._wakeup = None
+
+        future.add_done_callback(self._onDone)
+
+    def _wake(self):
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def _addChunk(self, data):
+        self._received += 1
+        self._chunks.append(data)
+        self._wake()
+
+    def _onDone(self, future: asyncio.Future):
+        # Mark the exception as retrieved; it is raised by `__anext__`.
+        if not future.cancelled():
+            future.exception()
+        self._wake()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            if self._chunks:
+                self._unacknowledged += 1
+                if self._unacknowledged >= max(1, self.window // 2):
+                    # Acknowledge the consumed chunks, so the provider sends more.
+                    credits = self._unacknowledged
+                    self._unacknowledged = 0
+                    await self._manager._acknowledgeChunks(self.taskId, credits)
+                return self._chunks.popleft()
+
+            future = self._future
+            if future.done():
+                self._manager._openStreams.pop(self.taskId, None)
+                if future.cancelled():
+                    raise StopAsyncIteration
+                error = future.exception()
+                if error is not None:
+                    raise error
+                total = future.result()
+                if not isinstance(total, int) or self._received >= total:
+                    raise StopAsyncIteration
+
+            self._wakeup = asyncio.get_running_loop().create_future()
+            await self._wakeup
+            self._wakeup = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self, reason=None):
+        """ Stops the stream. If the provider still sends chunks, the task is canceled.
+
+        Args:
+            reason (Exception, optional): The reason. Defaults to None.
+        """
+        self._chunks.clear()
+        self._manager._openStreams.pop(self.taskId, None)
+        if not self._future.done():
+            await self._manager.cancelTask(self.taskId, reason or Exception("Stream closed"))
+
+
+class ProvidedStream:
+    """ State of a stream on the providing side (the credits of the requester).
+    """
+
+    __slots__ = ("credits", "requestedBy", "canceled", "_event")
+
+    def __init__(self, credits: int, requestedBy: str | None = None):
+        self.credits = credits
+        self.requestedBy = requestedBy
+        self.canceled = False
+        self._event = asyncio.Event()
+
+    def addCredits(self, credits: int):
+        self.credits += credits
+        self._event.set()
+
+    def cancel(self, *args):
+        self.canceled = True
+        self._event.set()
+
+    async def acquire(self, timeout: float | None = None) -> bool:
+        """ Waits for a credit.
+
+        Args:
+            timeout (float, optional): Max time in ms to wait for an acknowledgement. Defaults to None.
+
+        Raises:
+            TimeoutError: If no credit has been received within the timeout.
+
+        Returns:
+            bool: False, if the stream has been canceled.
+        """
+        while self.credits <= 0 and not self.canceled:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout / 1000.0 if timeout else None)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"The requester didnt acknowledge the chunks within {timeout} [ms]") from None
+        if self.canceled:
+            return False
+        self.credits -= 1
+        return True
@@ -50,3 +50,391 @@ async def test_rpc_manager():
 
     res = await manager.performCall("delayed", ["Pytest"])
     assert res == "Hello Pytest!"
+
+
+async def test_rpc_manager_batching():
+    communicator = await getLayer("event")
+    manager = NopeRpcManager({
+        "communicator": communicator,
+        "logger": False,
+        "batchSize": 10,
+        "batchDelay": 2000
+    }, lambda *args: "test", "test")
+
+    await manager.ready.waitFor()
+
+    messages = {"rpcRequest": 0, "rpcRequestBatch": 0, "rpcResponse": 0, "rpcResponseBatch": 0}
+
+    def count(event):
+        def callback(*args):
+            messages[event] += 1
+        return callback
+
+    for event in messages:
+        await communicator.on(event, count(event))
+
+    async def hello(name: str) -> str:
+        return f"Hello {name}!"
+
+    async def delayed(name: str) -> str:
+        await sleep(1)
+        return await hello(name)
+
+    await manager.registerService(hello, {"id": "hello"})
+    await manager.registerService(delayed, {"id": "delayed"})
+    await sleep(0.1)
+
+    results = await asyncio.gather(*(manager.performCall("hello", [str(idx)]) for idx in range(20)))
+    assert results == [f"Hello {idx}!" for idx in range(20)]
+    assert messages == {"rpcRequest": 0, "rpcRequestBatch": 2, "rpcResponse": 0, "rpcResponseBatch": 2}
+
+    # The timeout of a batched task stays the same.
+    slow = manager.performCall("delayed", ["slow"], {"timeout": 100})
+    fast = manager.performCall("hello", ["fast"])
+    results = await asyncio.gather(slow, fast, return_exceptions=True)
+    assert isinstance(results[0], TimeoutError)
+    assert results[1] == "Hello fast!"
+
+    await manager.dispose()
+
+
+async def test_rpc_manager_batching_with_callbacks_plugin():
+    from .. import connectivityManager, rpcManager
+    from ...plugins.rpc_with_callbacks import extend
+
+    # Extend the classes without installing the plugin globally.
+    _, (extended, _), __ = extend(None, [rpcManager, connectivityManager], {})
+
+    communicator = await getLayer("event")
+    manager = extended.NopeRpcManager({
+        "communicator": communicator,
+        "logger": False,
+        "batchSize": 10,
+        "batchDelay": 2000
+    }, lambda *args: "test", "test")
+
+    await manager.ready.waitFor()
+
+    messages = {"rpcRequest": 0, "rpcRequestBatch": 0, "rpcResponseBatch": 0}
+
+    def count(event):
+        def callback(*args):
+            messages[event] += 1
+        return callback
+
+    for event in messages:
+        await communicator.on(event, count(event))
+
+    async def hello(name: str) -> str:
+        return f"Hello {name}!"
+
+    async def withCallback(name: str, cb) -> str:
+        return await cb(name)
+
+    await manager.registerService(hello, {"id": "hello"})
+    await manager.registerService(withCallback, {"id": "withCallback"})
+    await sleep(0.1)
+
+    results = await asyncio.gather(*(manager.performCall("hello", [str(idx)], {"timeout": 1000})
+                                     for idx in range(5)))
+    assert results == [f"Hello {idx}!" for idx in range(5)]
+    assert messages == {"rpcRequest": 0, "rpcRequestBatch": 1, "rpcResponseBatch": 1}
+
+    results = await asyncio.gather(*(manager.performCall("withCallback", [str(idx), hello], {"timeout": 1000})
+                                     for idx in range(2)))
+    assert results == ["Hello 0!", "Hello 1!"]
+
+    await manager.dispose()
+
+
+async def test_rpc_manager_concurrency_limits_with_callbacks_plugin():
+    from .. import connectivityManager, rpcManager
+    from ...plugins.rpc_with_callbacks import extend
+
+    _, (extended, _), __ = extend(None, [rpcManager, connectivityManager], {})
+
+    manager = extended.NopeRpcManager({
+        "communicator": await getLayer("event"),
+        "logger": False,
+    }, lambda *args: "test", "test")
+
+    await manager.ready.waitFor()
+
+    running = 0
+    maxRunning = 0
+
+    async def work(idx: int) -> int:
+        nonlocal running, maxRunning
+        running += 1
+        maxRunning = max(maxRunning, running)
+        await sleep(0.02)
+        running -= 1
+        if idx < 0:
+            raise ValueError("failed")
+        return idx
+
+    await manager.registerService(work, {"id": "work", "maxConcurrency": 1})
+    await sleep(0.1)
+
+    results = await asyncio.gather(*(manager.performCall("work", [idx]) for idx in (0, 1, -1, 3, 4)),
+                                   return_exceptions=True)
+    assert results[:2] == [0, 1] and results[3:] == [3, 4]
+    assert isinstance(results[2], Exception)
+    assert maxRunning == 1
+    assert manager.load["tasks"] == 0
+
+    await manager.dispose()
+
+
+async def test_rpc_manager_streaming_with_callbacks_plugin():
+    from .. import connectivityManager, rpcManager
+    from ...plugins.rpc_with_callbacks import extend
+
+    _, (extended, _), __ = extend(None, [rpcManager, connectivityManager], {})
+
+    manager = extended.NopeRpcManager({
+        "communicator": await getLayer("event"),
+        "logger": False,
+    }, lambda *args: "test", "test")
+
+    await manager.ready.waitFor()
+
+    async def rows(amount: int):
+        for idx in range(amount):
+            yield {"row": idx}
+
+    await manager.registerService(rows, {"id": "rows"})
+    await sleep(0.1)
+
+    consumed = []
+    async with await manager.performCall("rows", [20], {"stream": True, "window": 4}) as stream:
+        async for chunk in stream:
+            consumed.append(chunk.row)
+
+    assert consumed == list(range(20))
+    assert not manager._providedStreams
+
+    await manager.dispose()
+
+
+async def test_rpc_manager_streaming():
+    manager = NopeRpcManager({
+        "communicator": await getLayer("event"),
+        "logger": False,
+    }, lambda *args: "test", "test")
+
+    await manager.ready.waitFor()
+
+    produced = 0
+    closed = asyncio.Event()
+
+    async def rows(amount: int):
+        nonlocal produced
+        try:
+            for idx in range(amount):
+                produced += 1
+                yield {"row": idx}
+        finally:
+            closed.set()
+
+    await manager.registerService(rows, {"id": "rows"})
+    await sleep(0.1)
+
+    consumed = []
+    async with await manager.performCall("rows", [20], {"stream": True, "window": 4}) as stream:
+        async for chunk in stream:
+            consumed.append(chunk.row)
+            # The provider waits for the acknowledgement of the window.
+            await sleep(0.001)
+            assert produced - len(consumed) <= 4 + 1
+
+    assert consumed == list(range(20))
+    assert not manager._openStreams
+
+    # Closing the stream cancels the task.
+    closed.clear()
+    stream = await manager.performCall("rows", [1000], {"stream": True, "window": 4})
+    async for chunk in stream:
+        if chunk.row == 2:
+            break
+    await stream.aclose()
+    await asyncio.wait_for(closed.wait(), 1)
+    assert produced < 20 + 1000
+
+    await manager.dispose()
+
+
+async def test_rpc_manager_streaming_abandoned():
+    communicator = await getLayer("event")
+    provider = NopeRpcManager({
+        "communicator": communicator,
+        "logger": False,
+        "streamAckTimeout": 100,
+    }, lambda *args: "provider", "provider")
+    consumer = NopeRpcManager({
+        "communicator": communicator,
+        "logger": False,
+    }, lambda *args: "provider", "consumer")
+
+    await provider.ready.waitFor()
+    await consumer.ready.waitFor()
+
+    closed = asyncio.Event()
+
+    async def rows():
+        try:
+            idx = 0
+            while True:
+                yield {"row": idx}
+                idx += 1
+        finally:
+            closed.set()
+
+    await provider.registerService(rows, {"id": "rows"})
+    await consumer._sendAvailableServices()
+    await sleep(0.1)
+
+    async def consume():
+        # Leave the stream without closing it.
+        stream = await consumer.performCall("rows", [], {"stream": True, "window": 4})
+        async for chunk in stream:
+            if chunk.row == 5:
+                return
+
+    # The provider stops waiting for the acknowledgement.
+    await consume()
+    await asyncio.wait_for(closed.wait(), 1)
+    await sleep(0.01)
+    assert not provider._providedStreams
+    assert provider.load["tasks"] == 0
+
+    # The consumer disappears mid-stream.
+    closed.clear()
+    provider._streamAckTimeout = 60 * 1000
+    await consume()
+    await sleep(0.05)
+    assert len(provider._providedStreams) == 1
+    provider.removeDispatcher("consumer")
+    await asyncio.wait_for(closed.wait(), 1)
+    await sleep(0.01)
+    assert not provider._providedStreams
+    assert provider.load["tasks"] == 0
+
+    await consumer.dispose()
+    await provider.dispose()
+
+
+async def test_rpc_manager_concurrency_limits():
+    manager = NopeRpcManager({
+        "communicator": await getLayer("event"),
+        "logger": False,
+    }, lambda *args: "test", "test")
+
+    await manager.ready.waitFor()
+
+    running = 0
+    maxRunning = 0
+
+    async def work(idx: int) -> int:
+        nonlocal running, maxRunning
+        running += 1
+        maxRunning = max(maxRunning, running)
+        await sleep(0.05)
+        running -= 1
+        return idx
+
+    await manager.registerService(work, {"id": "work", "maxConcurrency": 2, "queueSize": 1})
+    await manager.registerService(work, {"id": "rejecting", "maxConcurrency": 1, "policy": "reject"})
+    await sleep(0.1)
+
+    calls = [asyncio.ensure_future(manager.performCall("work", [idx])) for idx in range(5)]
+    await sleep(0.01)
+    assert manager.load["services"]["work"] == {"running": 2, "waiting": 1, "maxConcurrency": 2}
+
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert results[:3] == [0, 1, 2]
+    assert all(isinstance(item, Exception) for item in results[3:]), "The queue should be limited"
+    assert maxRunning == 2
+
+    results = await asyncio.gather(*(manager.performCall("rejecting", [idx]) for idx in range(2)),
+                                   return_exceptions=True)
+    assert results[0] == 0 and isinstance(results[1], Exception)
+
+    assert manager._connectivityManager.info.load == manager.load
+    assert manager.load["tasks"] == 0
+
+    await manager.dispose()
+
+
+async def test_rpc_manager_selectors():
+    communicator = await getLayer("event")
+    managers = [
+        NopeRpcManager({
+            "communicator": communicator,
+            "logger": False,
+        }, lambda *args: "a", _id) for _id in ("a", "b")
+    ]
+
+    for manager in managers:
+        await manager.ready.waitFor()
+
+    executedBy = []
+
+    def provide(_id):
+        async def work(delay: float) -> str:
+            executedBy.append(_id)
+            await sleep(delay)
+            return _id
+        return work
+
+    for manager in managers:
+        await manager.registerService(provide(manager.id), {"id": "work"})
+    await sleep(0.1)
+
+    manager = managers[0]
+    assert sorted(manager.candidates.get("work")) == ["a", "b"]
+    assert manager.candidates.get("work") is manager.candidates.get("work")
+
+    # The requests are spread over the providers.
+    results = await asyncio.gather(*(
+        manager.performCall("work", [0.05], {"selector": "least-outstanding"}) for _ in range(4)))
+    assert sorted(results) == ["a", "a", "b", "b"]
+    assert manager.statistics.outstanding == {}
+    assert set(manager.statistics.latency) == {"a", "b"}
+
+    executedBy.clear()
+    for _ in range(4):
+        await manager.performCall("work", [0], {"selector": "round-robin"})
+    assert executedBy[0::2] == [executedBy[0]] * 2 and executedBy[1::2] == [executedBy[1]] * 2
+    assert executedBy[0] != executedBy[1]
+
+    # The slower provider is avoided.
+    manager.statistics.latency.update({"a": 1.0, "b": 0.001})
+    assert await manager.performCall("work", [0], {"selector": "ewma"}) == "b"
+    assert await manager.performCall("work", [0], {"selector": "power-of-two"}) == "b"
+
+    # A failing provider is avoided as well.
+    async def failing():
+        executedBy.append("a")
+        raise ValueError("failed")
+
+    async def working():
+        executedBy.append("b")
+        await sleep(0.01)
+        return "b"
+
+    await managers[0].registerService(failing, {"id": "flaky"})
+    await managers[1].registerService(working, {"id": "flaky"})
+    await sleep(0.1)
+
+    executedBy.clear()
+    manager.statistics.latency.clear()
+    results = []
+    for amount in (1, 1, 4):
+        results += await asyncio.gather(*(manager.performCall("flaky", [], {"selector": "ewma"})
+                                          for _ in range(amount)), return_exceptions=True)
+    assert executedBy.count("a") == 1
+    assert results[-4:] == ["b"] * 4
+
+    for manager in managers:
+        await manager.dispose()
@@ -1,7 +1,7 @@
 from asyncio import Future
 
-from ..helpers import generateId, DottedDict, Emitter, ensureDottedAccess, isAsyncFunction, getTimestamp, Promise, \
-    EXECUTOR
+from ..helpers import DottedDict, Emitter, ensureDottedAccess, isAsyncFunction, getTimestamp, Promise, \
+    EXECUTOR, FrozenDict
 
 
 # from ..logger.getLogger import getNopeLogger
@@ -11,7 +11,7 @@ from ..helpers import generateId, DottedDict, Emitter, ensureDottedAccess, isAsy
 class NopeEventEmitter:
 
     def __init__(self, options=None):
-        self.id = generateId()
+        self.id = EXECUTOR.idGenerator()
         self.options = ensureDottedAccess({'generateTimestamp': True})
         self.options.update(ensureDottedAccess(options))
         self.setter = None
@@ -37,8 +37,8 @@ class NopeEventEmitter:
         _value = self.getter(_value) if self.getter is not None else _value
         if options.forced or (self.disablePublishing == False):
             options = self._updateSenderAndTimestamp(options)
-            self._emitter.emit(data=ensureDottedAccess(
-                {'value': _value, **options}))
+            # All subscribers receive the same (immutable) options.
+            self._emitter.emit(None, _value, FrozenDict(options))
             return self.hasSubscriptions
         return False
 
@@ -64,24 +64,23 @@ class NopeEventEmitter:
     def _adaptCallback(self, callback, options):
         first = True
 
-        def adaptedCallback(_data: DottedDict):
-            nonlocal first
+        if not options.skipCurrent:
+            def adaptedCallback(value, rest: FrozenDict):
+                # Now we call value, ... rest
+                callback(value, rest)
+
+            return adaptedCallback
 
-            data = _data.copy()
+        def adaptedCallbackSkippingCurrent(value, rest: FrozenDict):
+            nonlocal first
 
-            if first and options.skipCurrent:
+            if first:
                 first = False
                 return
 
-            first = False
-
-            if data is not None:
-                # Pop the value
-                value = data.pop("value")
-                # Now we call value, ... rest
-                callback(value, data)
+            callback(value, rest)
 
-        return adaptedCallback
+        return adaptedCallbackSkippingCurrent
 
     def _subscribe(self, callback):
 
@@ -178,7 +177,7 @@ class NopeEventEmitter:
 
             try:
                 if _options.timeout > 0:
-                    timeout = EXECUTOR.setTimeout(
+                    timeout = EXECUTOR.callLater(
                         finish, _options.timeout, TimeoutError("Time elapsed"), False, False, True)
 
                 subscription = self.subscribe(check_data)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Microbenchmarks of the dispatch path of the `NopeEventEmitter` and the `NopeObservable`.
+    The file isnt collected by the regular test run. Execute it explicitly:
+
+        python -m pytest nope/eventEmitter/tests/bench_nopeEventEmitter.py --benchmark-json=result.json
+"""
+
+import itertools
+
+import pytest
+
+from ..nopeEventEmitter import NopeEventEmitter
+from ...observable import NopeObservable
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _callback(value, rest):
+    pass
+
+
+@pytest.mark.parametrize("subscribers", [1, 20, 100])
+def test_emit(benchmark, subscribers):
+    emitter = NopeEventEmitter()
+    for _ in range(subscribers):
+        emitter.subscribe(_callback)
+
+    benchmark(emitter.emit, 1, {"topic": "a/b", "args": []})
+
+
+@pytest.mark.parametrize("subscribers", [1, 20, 100])
+def test_observable(benchmark, subscribers):
+    observable = NopeObservable()
+    for _ in range(subscribers):
+        observable.subscribe(_callback)
+    counter = itertools.count()
+
+    def run():
+        # The content has to change, otherwise nothing is published.
+        observable.setContent(next(counter), {"topic": "a/b", "args": []})
+
+    benchmark(run)
+
+
+def test_subscribe_and_emit(benchmark):
+    emitter = NopeEventEmitter()
+    for _ in range(20):
+        emitter.subscribe(_callback)
+
+    def run():
+        # Changing the subscribers invalidates the cached subscribers.
+        observer = emitter.subscribe(_callback)
+        emitter.emit(1)
+        observer.unsubscribe()
+
+    benchmark(run)
@@ -153,3 +153,31 @@ def test_order():
     emitter.emit(3)
 
     assert called == [1, 2, 3], "Failed to maintain the order"
+
+
+def test_shared_options():
+    received = []
+
+    def callback(data, rest):
+        received.append(rest)
+
+    emitter = NopeEventEmitter()
+    emitter.subscribe(callback)
+    sub = emitter.subscribe(lambda data, rest: received.append(rest))
+
+    emitter.emit(1, {"custom": True})
+
+    # Every subscriber receives the same immutable options.
+    assert len(received) == 2
+    assert received[0] is received[1]
+    assert received[0].custom is True
+    assert received[0].sender == emitter.id
+    assert "value" not in received[0]
+    with pytest.raises(TypeError):
+        received[0].custom = False
+
+    # The cached subscribers are updated.
+    sub.unsubscribe()
+    received.clear()
+    emitter.emit(2)
+    assert len(received) == 1
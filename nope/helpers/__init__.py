@@ -11,7 +11,7 @@ from . import (asyncHelpers, dictMethods, dispatcherPathes, dottedDict,
 
                pathMatchingMethods, prints, runtime, stringMethods, timers,
 
-               timestamp, hashable, listMethods, jsonMethods, files)
+               timestamp, timingWheel, hashable, listMethods, jsonMethods, files, frozen)
 
 from .asyncHelpers import (
 
@@ -25,7 +25,7 @@ from .asyncHelpers import (
 
     EXECUTOR)
 
-from .dictMethods import (extractUniqueValues, extractValues,
+from .dictMethods import (extractItems, extractUniqueValues, extractValues,
 
                           keysToCamel, keysToCamelNested, keysToSnake,
 
@@ -37,22 +37,23 @@ from .dispatcherPathes import (getEmitterPath, getMethodPath,
                                isMethodPathCorrect,
 
                                isPropertyPathCorrect)
-from .dottedDict import DottedDict, convertToDottedDict, ensureDottedAccess
+from .dottedDict import DottedDict, LazyDottedDict, LazyNoneDottedDict, convertToDottedDict, ensureDottedAccess
 from .emitter import Emitter
 from .files import createFile
+from .frozen import FrozenDict, FrozenList, copyTree, freeze, isFrozen, registerTreeType, thaw
 from .hashable import hlist, hset, hdict
-from .idMethods import generateId
+from .idMethods import IdGenerator, generateId
 from .importing import dynamicImport
 from .jsonMethods import dumps, loads
 from .listMethods import (avgOfArray, extractListElements, isIterable, isList, flattenDeep,
                           maxOfArray, minOfArray)
-from .objectMethods import (convertData, copy, deepAssign, deflattenObject,
+from .objectMethods import (CompiledPath, compilePath, convertData, copy, deepAssign, deflattenObject,
 
-                            flattenObject, getKeys, isFloat, isInt,
+                            flattenObject, getKeys, getLeafDiff, isFloat, isInt, iterFlatten, iterQueryAttr,
 
                             isNumber, isDictLike,
 
-                            keepProperties, objectToDict,
+                            keepProperties, objectToDict, prunePattern,
 
                             recursiveForEach, rgetattr, rqueryAttr, rsetattr)
 from .path import (
@@ -67,10 +68,11 @@ from .path import (
     patternIsValid,
     toPythonPath,
     varifyPath)
-from .pathMatchingMethods import comparePatternAndPath
+from .pathMatchingMethods import comparePatternAndPath, compilePattern, CompiledPattern, MatchResult, PatternMatchCache, MATCH_CACHE
 from .prints import formatException
 from .runtime import offload_function_to_thread
 from .setMethods import determineDifference, difference, union
 from .stringMethods import camelToSnake, insertNewLines, insert, limitString, padString, replaceAll, snakeToCamel, toCamelCase, toSnakeCase, toVariableName
 from .timers import setInterval, setTimeout
 from .timestamp import getTimestamp
+from .timingWheel import TimerHandle, TimingWheel
@@ -1,8 +1,11 @@
 import asyncio
+import os
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from functools import partial
 
+from .idMethods import IdGenerator
 from .prints import formatException
+from .timingWheel import TimerHandle, TimingWheel
 
 
 def isAsyncFunction(func) -> bool:
@@ -49,6 +52,18 @@ class NopeExecutor:
         self.logger = None
         self._todos = set()
         self._running = False
+        self._timers: TimingWheel = None
+
+        # Generator of the task- and message-ids (see `useIdGenerator`)
+        self.idGenerator = IdGenerator()
+
+    def useIdGenerator(self, generator=None):
+        """ Assigns the generator of the task- and message-ids.
+
+        Args:
+            generator (callable, optional): Function returning a unique id (str). Defaults to a new `IdGenerator`.
+        """
+        self.idGenerator = generator if generator is not None else IdGenerator()
 
     def assignLoop(self, loop, forceDefaultToBeDefaultLoop=False):
         """ Helper to assign a event loop.
@@ -243,6 +258,32 @@ class NopeExecutor:
 
         return self.ensureExecution(task)
 
+    @property
+    def timers(self) -> TimingWheel:
+        """ The timing wheel of the loop (see `callLater`).
+        """
+        if self._timers is None or self._timers.loop is not self._loop:
+            self._timers = TimingWheel(self._loop)
+        return self._timers
+
+    def callLater(self, func, timeout_ms: float, *args) -> TimerHandle:
+        """ Calls the function after the delay. In contrast to `setTimeout` no task is created
+            until the timer expires, so the timer is cheap to create and to cancel. Meant for
+            timeouts, which are usually canceled (rpc-calls, `waitFor`). The function is
+            executed at most 10 ms (the resolution of the wheel) after the delay. Sync
+            functions are called directly in the loop.
+
+        Args:
+            func (function): The function to call.
+            timeout_ms (float): Delay in ms.
+
+        Returns:
+            TimerHandle: The timer. Use `cancel` to stop it.
+        """
+        if isAsyncFunction(func):
+            return self.timers.schedule(timeout_ms, self.callParallel, func, *args)
+        return self.timers.schedule(timeout_ms, func, *args)
+
     def setInterval(self, func, interval_ms: int, *args,
                     **kwargs) -> asyncio.Task:
         """ Creates an interval which will be called
@@ -349,6 +390,11 @@ class NopeExecutor:
 EXECUTOR = NopeExecutor()
 EXECUTOR.useThreadPool()
 
+if hasattr(os, "register_at_fork"):
+    # A forked process must not reuse the ids of its parent.
+    os.register_at_fork(after_in_child=lambda: EXECUTOR.idGenerator.reset()
+                        if isinstance(EXECUTOR.idGenerator, IdGenerator) else None)
+
 
 def Promise(callback):
     """ Creates a NodeJS like Promise
@@ -430,7 +476,7 @@ async def waitFor(callback, initalWaitInMs: int | None = None, testFirst: bool =
 
                         reject(TimeoutError("Timed out!"))
 
-                    timeout = EXECUTOR.setTimeout(onTimeout, maxTimeout)
+                    timeout = EXECUTOR.callLater(onTimeout, maxTimeout)
 
                 # Define a Testfunction, which will periodically test whether the condition is
                 # fullfield or not. Internally it counts the number of retries, if the max allowed
@@ -1,7 +1,7 @@
 from collections.abc import Iterable
 
 from .dottedDict import DottedDict, ensureDottedAccess
-from .objectMethods import convertData, rgetattr, rqueryAttr, flattenObject, rsetattr
+from .objectMethods import convertData, iterFlatten, rgetattr, rqueryAttr, rsetattr
 from .path import SPLITCHAR, getLeastCommonPathSegment, pathToCamelCase, pathToSnakeCase
 from .prints import formatException
 from .stringMethods import camelToSnake, snakeToCamel
@@ -28,11 +28,9 @@ def keysToSnakeNested(d: dict, adaptStrValues=False):
         snake case. this will work with nested dicts as well
     """
 
-    flatten = flattenObject(d, onlyPathToBaseValue=True)
-
     ret = ensureDottedAccess({})
 
-    for k, v in flatten.items():
+    for k, v in iterFlatten(d, onlyPathToBaseValue=True):
         if adaptStrValues and isinstance(v, str):
             rsetattr(ret, pathToSnakeCase(k), camelToSnake(v))
         else:
@@ -60,11 +58,9 @@ def keysToCamelNested(d: dict, adaptStrValues=False):
         camel case. this will work with nested dicts as well
         (expecting every key contains a dict again.)
     """
-    flatten = flattenObject(d, onlyPathToBaseValue=True)
-
     ret = ensureDottedAccess({})
 
-    for k, v in flatten.items():
+    for k, v in iterFlatten(d, onlyPathToBaseValue=True):
         if adaptStrValues and isinstance(v, str):
             rsetattr(ret, pathToCamelCase(k), snakeToCamel(v))
         else:
@@ -148,6 +144,64 @@ def extractValues(d, path='', unique=False):
     return s
 
 
+def _extractionProps(pathExtractedValue: str, pathExtractedKey: str):
+    """ Helper to create the props used by `convertData`. Returns `None`, if
+        one of the paths isnt valid.
+    """
+    if isinstance(pathExtractedKey, str) and len(pathExtractedKey) > 0 and \
+            isinstance(pathExtractedValue, str) and len(pathExtractedValue) > 0:
+        return [
+            DottedDict({'key': 'key', 'query': pathExtractedKey}),
+            DottedDict({'key': 'value', 'query': pathExtractedValue})
+        ]
+    return None
+
+
+def extractItems(k, v, pathExtractedValue: str, pathExtractedKey: str, _props=__SENTINENTAL):
+    """ Extracts the new keys and values of a single item of a dict. (Uses the same
+        rules like `transformDict`).
+
+    Args:
+        k (any): The original key.
+        v (any): The original value.
+        pathExtractedValue (str): The path of the value.
+        pathExtractedKey (str): The path of the key.
+
+    Returns:
+        list: List containing tuples with the new key and the new value.
+    """
+    props = _extractionProps(pathExtractedValue, pathExtractedKey) \
+        if _props is __SENTINENTAL else _props
+
+    if props is not None:
+        return [(element.get('key'), element.get('value'))
+                for element in convertData(v, props)]
+
+    keys = []
+    values = []
+
+    # We migt adapt the key and the Value. Therefore we will use
+    # the next if statements
+
+    if isinstance(pathExtractedKey, str):
+        if len(pathExtractedKey) > 0:
+            keys = rqueryAttr(v, pathExtractedKey)
+        else:
+            keys = [v]
+    else:
+        keys = [k]
+
+    if isinstance(pathExtractedValue, str):
+        if len(pathExtractedValue) > 0:
+            values = rqueryAttr(v, pathExtractedValue)
+        else:
+            values = [v]
+    else:
+        values = [v]
+
+    return [(key, value) for key in keys for value in values]
+
+
 def transformDict(d, pathExtractedValue: str,
                   pathExtractedKey: str, logger=None):
     """_summary_
@@ -168,21 +222,7 @@ def transformDict(d, pathExtractedValue: str,
     extractedDict = dict()
     orgKeyToExtractedValue = dict()
     amountOf = dict()
-    props = []
-    onlyValidProps = True
-
-    if isinstance(pathExtractedKey, str):
-        props.append(DottedDict({'key': 'key', 'query': pathExtractedKey}))
-        onlyValidProps = onlyValidProps and (len(pathExtractedKey) > 0)
-    else:
-        onlyValidProps = False
-
-    if isinstance(pathExtractedValue, str):
-        props.append(DottedDict(
-            {'key': 'value', 'query': pathExtractedValue}))
-        onlyValidProps = onlyValidProps and (len(pathExtractedValue) > 0)
-    else:
-        onlyValidProps = False
+    props = _extractionProps(pathExtractedValue, pathExtractedKey)
 
     keyIsHashable = True
     valueIsHashable = True
@@ -194,74 +234,29 @@ def transformDict(d, pathExtractedValue: str,
     for k, v in d.items():
         extracted = []
 
-        if onlyValidProps:
-            extracted = convertData(v, props)
-
-            for element in extracted:
-                # Try to convert the data:
-                try:
-                    hash(element.key)
-                    element.keyIsHashable = True
-                except BaseException:
-                    element.keyIsHashable = False
-                    keyIsHashable = False
-
-                # Try to convert the data:
-                try:
-                    hash(element.value)
-                    element.valueIsHashable = True
-                except BaseException:
-                    element.valueIsHashable = False
-                    valueIsHashable = False
-
-        else:
-
-            keys = []
-            values = []
-
-            # We migt adapt the key and the Value. Therefore we will use
-            # the next if statements
-
-            if isinstance(pathExtractedKey, str):
-                if len(pathExtractedKey) > 0:
-                    keys = rqueryAttr(v, pathExtractedKey)
-                else:
-                    keys = [v]
-            else:
-                keys = [k]
-
-            if isinstance(pathExtractedValue, str):
-                if len(pathExtractedValue) > 0:
-                    values = rqueryAttr(v, pathExtractedValue)
-                else:
-                    values = [v]
-            else:
-                values = [v]
-
-            for key in keys:
-                for value in values:
-                    data = DottedDict({
-                        'key': key,
-                        'value': value,
-                        'keyIsHashable': True,
-                        'valueIsHashable': True
-                    })
-
-                    # Try to convert the data:
-                    try:
-                        hash(data.key)
-                    except BaseException:
-                        data.keyIsHashable = False
-                        keyIsHashable = False
-
-                    # Try to convert the data:
-                    try:
-                        hash(data.value)
-                    except BaseException:
-                        data.valueIsHashable = False
-                        valueIsHashable = False
-
-                    extracted.append(data)
+        for key, value in extractItems(k, v, pathExtractedValue, pathExtractedKey, props):
+            data = DottedDict({
+                'key': key,
+                'value': value,
+                'keyIsHashable': True,
+                'valueIsHashable': True
+            })
+
+            # Try to convert the data:
+            try:
+                hash(data.key)
+            except BaseException:
+                data.keyIsHashable = False
+                keyIsHashable = False
+
+            # Try to convert the data:
+            try:
+                hash(data.value)
+            except BaseException:
+                data.valueIsHashable = False
+                valueIsHashable = False
+
+            extracted.append(data)
 
         # Create the entries for the following dicts.
         keyMapping[k] = set()
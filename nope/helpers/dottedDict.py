@@ -1,69 +1,182 @@
-from copy import deepcopy
-
+from .frozen import copyTree, registerTreeType
 from .hashable import hdict
 from dataclasses import is_dataclass, asdict
 
-DEFAULT_METHODS = dir(hdict)
+DEFAULT_METHODS = frozenset(dir(hdict))
+""" The attributes of `hdict`, which cant be used as dotted keys. """
+
+_ATTRIBUTES = set(DEFAULT_METHODS)
+""" The attributes of all dotted dict classes (see `DottedDict.__init_subclass__`). """
+
+_HASH = hdict.__hash__.HASH
+_HASH_SLOT = hdict._hash
+_getAttribute = dict.__getattribute__
 
 
 class DottedDict(hdict):
-    """dot.notation access to dictionary attributes. it is although hashable. but than it can not be edited."""
+    """dot.notation access to dictionary attributes. it is although hashable. but than it can not be edited.
 
-    def __getattr__(self, key):
-        if key in DEFAULT_METHODS:
-            return getattr(self, key)
-        elif key == "__hash":
-            return hdict.__getattr__(self, key, value)
-        else:
-            return self.get(key)
+    Until the dict is hashed, the methods of `dict` are used to edit it (no check, whether it
+    is mutable). Hashing the dict switches its class to a hashed version (see `_hashedClassOf`),
+    which raises a `ValueError` on every edit. `unhash` restores the class.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = dict.__setitem__
+    __delitem__ = dict.__delitem__
+    clear = dict.clear
+    pop = dict.pop
+    popitem = dict.popitem
+    setdefault = dict.setdefault
+    update = dict.update
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _ATTRIBUTES.update(dir(cls))
+
+    def __getattribute__(self, key):
+        # Using `__getattr__` would require a failed lookup (which is expensive) for
+        # every key. Therefore only the attributes of the classes are looked up.
+        if key in _ATTRIBUTES:
+            try:
+                return _getAttribute(self, key)
+            except AttributeError:
+                pass
+        elif key.startswith("__"):
+            # Special attributes (i.e. `__deepcopy__` used by `copy`) are never keys.
+            return _getAttribute(self, key)
+        return type(self).get(self, key)
 
     def __setattr__(self, key, value):
         if key in DEFAULT_METHODS:
             raise Exception("This would overwrite the default behavior")
-        elif key == "__hash":
-            return hdict.__setattr__(self, key, value)
-        hdict.__setitem__(self, key, value)
+        dict.__setitem__(self, key, value)
 
     def __delattr__(self, key):
         if key in DEFAULT_METHODS:
             raise Exception("This would overwrite the default behavior")
-        elif key == "__hash":
-            return hdict.__delattr__(self, key, value)
-        hdict.__delitem__(self, key)
+        dict.__delitem__(self, key)
+
+    def __hash__(self):
+        value = _HASH(self)
+        _HASH_SLOT.__set__(self, value)
+        object.__setattr__(self, "__class__", _hashedClassOf(type(self)))
+        return value
+
+    def __mutable__(self):
+        pass
+
+    def hashed(self):
+        return False
+
+    def mutable(self):
+        return True
 
     def copy(self):
         # Manually copy the contained Dict.
         cp = {}
         for k, v in self.items():
             if hasattr(v, "copy") and callable(v.copy):
-                cp[deepcopy(k)] = v.copy()
+                cp[k] = v.copy()
             else:
-                cp[deepcopy(k)] = deepcopy(v)
+                cp[k] = copyTree(v)
         # use that to create a copy.
         return DottedDict(cp)
 
     def __repr__(self):
         return dict.__repr__(self)
 
+    def __reduce__(self):
+        # Used by `copy` and `pickle`. The items are passed to the constructor, because the
+        # attributes are the keys of the dict.
+        return (type(self), (dict(self),))
+
+
+_ATTRIBUTES.update(dir(DottedDict))
+
+
+class _HashedDottedDict:
+    """ Mixin of the hashed dotted dicts. Every edit raises a `ValueError`. """
+
+    __slots__ = ()
+
+    _unhashedClass = None
 
-# DottedDict = hashable(DottedDict)
+    def __hash__(self):
+        return _HASH_SLOT.__get__(self)
+
+    def __mutable__(self):
+        raise ValueError(
+            "hashed '%s' object is not mutable" % self._unhashedClass.__name__)
+
+    def hashed(self):
+        return True
+
+    def mutable(self):
+        return False
+
+    def __setitem__(self, key, value):
+        self.__mutable__()
+
+    def __delitem__(self, key):
+        self.__mutable__()
+
+    def clear(self):
+        self.__mutable__()
+
+    def pop(self, *args):
+        self.__mutable__()
+
+    def popitem(self):
+        self.__mutable__()
+
+    def setdefault(self, key, item=None):
+        self.__mutable__()
+
+    def update(self, *args, **kwargs):
+        self.__mutable__()
+
+    def __setattr__(self, key, value):
+        self.__mutable__()
+
+    def __delattr__(self, key):
+        if key != "_hash":
+            self.__mutable__()
+        # Used by `unhash`.
+        _HASH_SLOT.__delete__(self)
+        object.__setattr__(self, "__class__", self._unhashedClass)
+
+    def __reduce__(self):
+        return (self._unhashedClass, (dict(self),))
+
+
+_HASHED_CLASSES = dict()
+""" The hashed versions of the dotted dicts (class -> hashed class). """
+
+
+def _hashedClassOf(cls):
+    """ Returns the hashed version of a dotted dict class.
+    """
+    hashed = _HASHED_CLASSES.get(cls)
+    if hashed is None:
+        hashed = _HASHED_CLASSES[cls] = type(f"Hashed{cls.__name__}", (_HashedDottedDict, cls), {
+            "__slots__": (),
+            "__module__": cls.__module__,
+            "_unhashedClass": cls
+        })
+        _DOTTED_TYPES[hashed] = cls
+    return hashed
 
 
 class NoneDottedDict(DottedDict):
     """dot.notation access to dictionary attributes"""
 
-    def __getattr__(self, key):
-        if key in DEFAULT_METHODS:
-            return getattr(self, key)
-        else:
-            try:
-                return self.get(key)
-            except KeyError:
-                return None
+    __slots__ = ()
 
     def __getitem__(self, item):
         try:
-            return hdict.__getitem__(self, item)
+            return dict.__getitem__(self, item)
         except KeyError:
             return None
 
@@ -72,14 +185,105 @@ class NoneDottedDict(DottedDict):
         cp = {}
         for k, v in self.items():
             if hasattr(v, "copy") and callable(v.copy):
-                cp[deepcopy(k)] = v.copy()
+                cp[k] = v.copy()
             else:
-                cp[deepcopy(k)] = deepcopy(v)
+                cp[k] = copyTree(v)
         # use that to create a copy.
         return NoneDottedDict(cp)
 
 
-# NoneDottedDict = hashable(NoneDottedDict)
+registerTreeType(DottedDict)
+registerTreeType(NoneDottedDict)
+
+_DOTTED_TYPES = {dict: dict, DottedDict: DottedDict, NoneDottedDict: NoneDottedDict}
+""" The types, which are converted to dotted dicts (hashed classes are mapped to their unhashed class). """
+
+
+@registerTreeType
+class _DottedList(list):
+    """ A list, whose items have already been converted by a lazy dotted dict. """
+    __slots__ = ()
+
+
+def _convertLazy(value, useNoneAsDefaultValue: bool):
+    """ Helper to wrap a value of a lazy dotted dict. Dicts are wrapped (only the first
+        level is copied), lists are copied and their items are wrapped.
+    """
+    _type = type(value)
+    if _type in _DOTTED_TYPES:
+        return LazyNoneDottedDict(value) if useNoneAsDefaultValue else LazyDottedDict(value)
+    elif _type in (list, set):
+        return _DottedList(_convertLazy(item, useNoneAsDefaultValue) for item in value)
+    elif is_dataclass(value) and not isinstance(value, type):
+        return _convertLazy(asdict(value), useNoneAsDefaultValue)
+    return value
+
+
+class _LazyConversion:
+    """ Mixin for the lazy dotted dicts. Nested dicts and lists are converted, once they are
+        accessed. The converted value replaces the original one, so the following accesses
+        return the same object.
+    """
+
+    __slots__ = ()
+
+    _useNoneAsDefaultValue = False
+
+    def __getitem__(self, key):
+        try:
+            value = dict.__getitem__(self, key)
+        except KeyError:
+            if self._useNoneAsDefaultValue:
+                return None
+            raise
+        converted = _convertLazy(value, self._useNoneAsDefaultValue)
+        if converted is not value:
+            dict.__setitem__(self, key, converted)
+        return converted
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        return default
+
+    def pop(self, *args):
+        return _convertLazy(super().pop(*args), self._useNoneAsDefaultValue)
+
+    def _convertAll(self):
+        for key in dict.keys(self):
+            self[key]
+
+    def values(self):
+        self._convertAll()
+        return dict.values(self)
+
+    def items(self):
+        self._convertAll()
+        return dict.items(self)
+
+
+@registerTreeType
+class LazyDottedDict(_LazyConversion, DottedDict):
+    """ A `DottedDict`, which converts its nested dicts and lists only if they are accessed.
+        Therefore receiving a large payload doesnt require to copy the entire payload.
+
+        Nested items, which have not been accessed yet, are shared with the original dict.
+        Functions using the internals of the dict (i.e. `json.dumps` or `dict(...)`) receive
+        the original items.
+    """
+
+    __slots__ = ()
+
+
+@registerTreeType
+class LazyNoneDottedDict(_LazyConversion, NoneDottedDict):
+    """ The lazy version of the `NoneDottedDict` (see `LazyDottedDict`).
+    """
+
+    __slots__ = ()
+
+    _useNoneAsDefaultValue = True
+
 
 def _convertItem(item, useNoneAsDefaultValue: bool):
     """ Helper that converts the items to the corresponding type
@@ -90,7 +294,7 @@ def _convertItem(item, useNoneAsDefaultValue: bool):
     Returns:
         any: the adapted item
     """
-    if type(item) in (dict, DottedDict, NoneDottedDict):
+    if type(item) in _DOTTED_TYPES:
         return convertToDottedDict(item, useNoneAsDefaultValue)
     elif is_dataclass(item):
         return convertToDottedDict(asdict(item))
@@ -104,18 +308,24 @@ def _convertItem(item, useNoneAsDefaultValue: bool):
 
 
 def convertToDottedDict(d: dict | DottedDict |
-                        NoneDottedDict, useNoneAsDefaultValue=True):
+                        NoneDottedDict, useNoneAsDefaultValue=True, lazy=False):
     """ Converts a dict to a dotted dict. Although, ensures,
 
     Args:
         d (dict): The dictionary.
         useNoneAsDefaultValue (bool): Flag to enable the default value 'none' instead of an KeyError
+        lazy (bool): Flag to convert the nested items, once they are accessed (see `LazyDottedDict`).
     """
-    ret = NoneDottedDict() if useNoneAsDefaultValue else DottedDict()
-
     if is_dataclass(d):
         d = asdict(d)
 
+    if lazy:
+        if not isinstance(d, dict):
+            d = {}
+        return LazyNoneDottedDict(d) if useNoneAsDefaultValue else LazyDottedDict(d)
+
+    ret = NoneDottedDict() if useNoneAsDefaultValue else DottedDict()
+
     if isinstance(d, (dict, DottedDict, NoneDottedDict)):
         for k, v in d.items():
             ret[k] = _convertItem(v, useNoneAsDefaultValue)
@@ -123,12 +333,13 @@ def convertToDottedDict(d: dict | DottedDict |
     return ret
 
 
-def ensureDottedAccess(d, useNoneAsDefaultValue=True):
+def ensureDottedAccess(d, useNoneAsDefaultValue=True, lazy=False):
     """ Ensure the given item is a dotted dict.
 
     Args:
         d (any): Item to convert
         useNoneAsDefaultValue (bool): A flag to enable default-nones.
+        lazy (bool): Flag to convert the nested items, once they are accessed (see `LazyDottedDict`).
     Returns:
         DottedDict: _description_
     """
@@ -136,6 +347,6 @@ def ensureDottedAccess(d, useNoneAsDefaultValue=True):
         return DottedDict()
 
     elif not isinstance(d, DottedDict):
-        return convertToDottedDict(d, useNoneAsDefaultValue)
+        return convertToDottedDict(d, useNoneAsDefaultValue, lazy)
 
     return d
@@ -1,4 +1,4 @@
-from typing import Dict, Set, Callable, Any
+from typing import Dict, Set, Callable, Any, Tuple
 
 from .dottedDict import ensureDottedAccess
 
@@ -14,6 +14,8 @@ class Emitter:
         """ Creates the Emitter.
         """
         self._subscribers: Dict[str, Set[Callable]] = dict()
+        # Tuple of the subscribers of an event. Created on demand, until the subscribers change.
+        self._snapshots: Dict[str, Tuple[Callable, ...]] = dict()
         self._paused = set()
 
     def on(self, event: str | None = None, callback: Callable | None = None):
@@ -33,6 +35,7 @@ class Emitter:
             raise TypeError("The parameter 'callback', must be callable!")
 
         self._subscribers[event].add(callback)
+        self._snapshots.pop(event, None)
 
         ret = ensureDottedAccess({
             'pause': lambda: self._pause(callback),
@@ -62,6 +65,7 @@ class Emitter:
         if event in self._subscribers:
             try:
                 self._subscribers[event].remove(callback)
+                self._snapshots.pop(event, None)
                 return True
             except BaseException:
                 return False
@@ -84,16 +88,22 @@ class Emitter:
             event (str, optional): _description_. Defaults to None.
             data (optional): _description_. Defaults to None.
         """
-        if event in self._subscribers:
-            items = list(self._subscribers[event])
-            for sub in items:
-                if sub not in self._paused:
-                    sub(data, *args, **kwargs)
+        items = self._snapshots.get(event)
+        if items is None:
+            if event not in self._subscribers:
+                return
+            items = self._snapshots[event] = tuple(self._subscribers[event])
+
+        paused = self._paused
+        for sub in items:
+            if not paused or sub not in paused:
+                sub(data, *args, **kwargs)
 
     def close(self):
         """ Deletes all Subscribers.
         """
         self._subscribers = dict()
+        self._snapshots = dict()
         self._paused = set()
 
     def amountOfSubscriptions(self, event=None) -> int:
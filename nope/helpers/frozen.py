@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Immutable versions of `dict` and `list`. These are used to share data
+    (for instance the content of the `DataPubSubSystem`) without copying it.
+    Every method, which would change the object, raises a `TypeError`.
+
+    Additionally the module contains `copyTree`, a fast copier for JSON-like
+    trees, which shares the frozen subtrees.
+
+>>> d = freeze({"a": [1, 2]})
+>>> d.a
+FrozenList([1, 2])
+>>> d["b"] = 1
+Traceback (most recent call last):
+...
+TypeError: 'FrozenDict' object is immutable
+"""
+
+from copy import deepcopy
+
+_SCALARS = (str, int, float, bool, type(None), bytes)
+_SCALAR_TYPES = frozenset(_SCALARS)
+
+_MAX_DEPTH = 1000
+""" Trees deeper than this are copied using `deepcopy` (i.e. cyclic data). """
+
+_TREE_DICTS = {dict}
+_TREE_LISTS = {list}
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+
+class FrozenDict(dict):
+    """ An immutable dict. Allows dotted (read) access to its items, like the `DottedDict`.
+        Accessing a missing item using the dotted notation returns `None`.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return self.get(key)
+
+    def copy(self):
+        # There is no need to copy an immutable object.
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self):
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """ An immutable list.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    append = _immutable
+    extend = _immutable
+    insert = _immutable
+    pop = _immutable
+    remove = _immutable
+    reverse = _immutable
+    sort = _immutable
+    clear = _immutable
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def copy(self):
+        # There is no need to copy an immutable object.
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __repr__(self):
+        return f"FrozenList({list.__repr__(self)})"
+
+
+def isFrozen(data) -> bool:
+    """ Checks whether the data is immutable (a frozen container or a scalar).
+
+    Args:
+        data (any): The data to check.
+
+    Returns:
+        bool: The result.
+    """
+    return isinstance(data, (FrozenDict, FrozenList, _SCALARS))
+
+
+def _copyObject(data):
+    try:
+        return deepcopy(data)
+    except BaseException:
+        return data
+
+
+def freeze(data):
+    """ Converts the data to an immutable tree. Dicts are converted to `FrozenDict`s, lists,
+        tuples and sets to `FrozenList`s. Already frozen subtrees are reused (not copied).
+        Other objects are copied once, because they can not be frozen. The tree is converted
+        iteratively; a container, which is contained multiple times, is converted once.
+
+    >>> shared = [1]
+    >>> frozen = freeze({"a": shared, "b": (shared,)})
+    >>> frozen.a is frozen.b[0]
+    True
+
+    Args:
+        data (any): The data to freeze.
+
+    Returns:
+        any: The frozen data.
+    """
+    if isinstance(data, (FrozenDict, FrozenList, _SCALARS)):
+        return data
+    if not isinstance(data, (dict, list, tuple, set)):
+        return _copyObject(data)
+
+    # The converted containers (by id) and the containers, which have to be filled.
+    converted = dict()
+    stack = []
+
+    def convert(value):
+        if isinstance(value, (FrozenDict, FrozenList, _SCALARS)):
+            return value
+        if isinstance(value, (dict, list, tuple, set)):
+            result = converted.get(id(value))
+            if result is None:
+                result = converted[id(value)] = FrozenDict() if isinstance(value, dict) else FrozenList()
+                stack.append((value, result))
+            return result
+        return _copyObject(value)
+
+    root = convert(data)
+
+    while stack:
+        src, dst = stack.pop()
+        # The containers are filled bypassing the immutable methods.
+        if isinstance(src, dict):
+            # `dict.items` skips the conversion of lazy dotted dicts.
+            for key, value in dict.items(src):
+                dict.__setitem__(dst, key, convert(value))
+        else:
+            for value in src:
+                list.append(dst, convert(value))
+
+    return root
+
+
+def thaw(data):
+    """ Converts the frozen data to a mutable tree containing `dict`s and `list`s.
+
+    Args:
+        data (any): The data to convert.
+
+    Returns:
+        any: The mutable copy.
+    """
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [thaw(value) for value in data]
+    return data
+
+
+def registerTreeType(cls):
+    """ Registers a subclass of `dict` or `list`, which can be copied by `copyTree`. The
+        class must be creatable without arguments and mustnt store additional state.
+
+    Args:
+        cls (type): The class to register.
+
+    Returns:
+        type: The class.
+    """
+    if issubclass(cls, dict):
+        _TREE_DICTS.add(cls)
+    elif issubclass(cls, list):
+        _TREE_LISTS.add(cls)
+    else:
+        raise TypeError(f"Can not register '{cls.__name__}' as tree type")
+    return cls
+
+
+def copyTree(data):
+    """ Creates a deep copy of a JSON-like tree (dicts, lists and scalars). The tree is
+        copied iteratively and without a memo, so shared subtrees are copied multiple
+        times. Frozen subtrees and scalars are not copied at all. Other objects are copied
+        using `deepcopy`; if the tree is deeper than 1000 levels (for instance, because it
+        contains a cycle), the entire tree is copied using `deepcopy`.
+
+    >>> data = {"a": [1, {"b": 2}], "c": freeze({"d": 3})}
+    >>> copied = copyTree(data)
+    >>> copied == data, copied["a"] is data["a"], copied["c"] is data["c"]
+    (True, False, True)
+
+    Args:
+        data (any): The data to copy.
+
+    Returns:
+        any: The copy.
+    """
+    _type = type(data)
+    if _type in _SCALAR_TYPES or _type is FrozenDict or _type is FrozenList:
+        return data
+    if _type not in _TREE_DICTS and _type not in _TREE_LISTS:
+        return deepcopy(data)
+
+    scalars = _SCALAR_TYPES
+    dicts = _TREE_DICTS
+    lists = _TREE_LISTS
+
+    root = _type()
+    stack = [(data, root, 0)]
+
+    while stack:
+        src, dst, depth = stack.pop()
+
+        if depth > _MAX_DEPTH:
+            return deepcopy(data)
+
+        # Copy the first level, afterwards replace the containers.
+        if type(src) in dicts:
+            dict.update(dst, src)
+            items = dict.items(src)
+            assign = dict.__setitem__
+        else:
+            list.extend(dst, src)
+            items = enumerate(src)
+            assign = list.__setitem__
+
+        for key, value in items:
+            _type = type(value)
+            if _type in scalars or _type is FrozenDict or _type is FrozenList:
+                continue
+            if _type in dicts or _type in lists:
+                child = _type()
+                stack.append((value, child, depth + 1))
+            else:
+                child = deepcopy(value)
+            assign(dst, key, child)
+
+    return root
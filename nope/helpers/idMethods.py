@@ -1,3 +1,5 @@
+import os
+from itertools import count
 from uuid import uuid4
 
 from .stringMethods import replaceAll
@@ -24,3 +26,50 @@ def generateId(use_as_var: bool = False, pre_string: str = None) -> str:
     if pre_string:
         _id = pre_string + _id
     return _id
+
+
+class IdGenerator:
+    """ Fast generator of unique ids (i.e. task- and message-ids). An id consists of a random
+        prefix (per process) and a counter:
+
+        >>> generator = IdGenerator("a1b2")
+        >>> generator()
+        'a1b2-1'
+        >>> generator.binary()
+        b'\\xa1\\xb2\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x02'
+
+        Incrementing the counter is atomic (`itertools.count`), so the generator could be
+        shared by threads. The prefix of the default generator (see `EXECUTOR.idGenerator`)
+        is renewed in a forked process.
+    """
+
+    __slots__ = ("prefix", "_prefixBytes", "_counter")
+
+    def __init__(self, prefix: str = None):
+        self.reset(prefix)
+
+    def reset(self, prefix: str = None):
+        """ Renews the prefix (random, if no prefix is provided) and restarts the counter.
+
+        Args:
+            prefix (str, optional): The prefix as hex string. Defaults to None.
+        """
+        self._prefixBytes = os.urandom(8) if prefix is None else bytes.fromhex(prefix)
+        self.prefix = self._prefixBytes.hex()
+        self._counter = count(1)
+
+    def __call__(self) -> str:
+        """ Returns the next id.
+
+        Returns:
+            str: The id, containing the prefix and the counter (hex).
+        """
+        return f"{self.prefix}-{next(self._counter):x}"
+
+    def binary(self) -> bytes:
+        """ Returns the next id in its compact binary form (prefix followed by 8 bytes of the counter).
+
+        Returns:
+            bytes: The id.
+        """
+        return self._prefixBytes + next(self._counter).to_bytes(8, "big")
@@ -2,17 +2,176 @@
 # @author Martin Karkowski
 # @email m.karkowski@zema.de
 
-from copy import deepcopy
+from functools import lru_cache
 
 from .dottedDict import DottedDict, ensureDottedAccess
-from .path import (MULTI_LEVEL_WILDCARD, SPLITCHAR, containsWildcards,
-                   getLeastCommonPathSegment)
-from .pathMatchingMethods import comparePatternAndPath
+from .frozen import copyTree
+from .path import (MULTI_LEVEL_WILDCARD, SINGLE_LEVEL_WILDCARD, SPLITCHAR,
+                   containsWildcards, getLeastCommonPathSegment)
+from .pathMatchingMethods import compilePattern
 
 SENTINEL_1 = object()
 SENTINEL_2 = object()
 
 
+class CompiledPath:
+    """ A path, which has been split once into typed accessors. Every segment is used as key of
+        dicts; segments containing only digits are used as index of lists as well. Use
+        `compilePath` to create it.
+    """
+
+    __slots__ = ("path", "keys", "indices", "length")
+
+    def __init__(self, path: str, splitchar=SPLITCHAR):
+        self.path = path
+        self.keys = tuple(path.split(splitchar))
+        self.indices = tuple(
+            int(key) if key.isdigit() else None
+            for key in self.keys
+        )
+        self.length = len(self.keys)
+
+    def get(self, data, default=None):
+        """ Returns the value stored at the path.
+
+        Args:
+            data (any): The data to extract the value from.
+            default (any, optional): The value to return, if nothing has been found. Defaults to None.
+
+        Returns:
+            any: The found data.
+        """
+        return _resolve(data, self.keys, self.indices, default)
+
+    def set(self, data, value):
+        """ Stores the value at the path. Missing parents are created; if the next segment is an
+            index, a list is created, otherwise a `DottedDict`.
+
+        Args:
+            data (any): The object, where the data should be stored.
+            value (any): The value to store.
+        """
+        obj = data
+        last = self.length - 1
+        keys = self.keys
+        indices = self.indices
+
+        for pos in range(last):
+            key = keys[pos]
+            idx = indices[pos]
+
+            if isinstance(obj, dict):
+                sub = obj.get(key)
+            elif isinstance(obj, list) and idx is not None:
+                if idx >= len(obj):
+                    obj.extend([None] * (idx + 1 - len(obj)))
+                sub = obj[idx]
+            else:
+                sub = _get(obj, key, return_none=True)
+
+            if sub is None:
+                nextIdx = indices[pos + 1]
+                sub = [None] * (nextIdx + 1) if nextIdx is not None else DottedDict({})
+                _setChild(obj, key, idx, sub)
+
+            obj = sub
+
+        _setChild(obj, keys[last], indices[last], value)
+
+    def delete(self, data) -> bool:
+        """ Removes the value stored at the path.
+
+        Args:
+            data (any): The object, containing the value.
+
+        Returns:
+            bool: True, if a value has been removed.
+        """
+        parent = _resolve(data, self.keys[:-1], self.indices[:-1], SENTINEL_1)
+        key = self.keys[-1]
+        idx = self.indices[-1]
+
+        if isinstance(parent, dict):
+            if key not in parent:
+                return False
+            del parent[key]
+            return True
+        if isinstance(parent, list):
+            if idx is None or idx >= len(parent):
+                return False
+            del parent[idx]
+            return True
+        if parent is SENTINEL_1 or parent is None or not hasattr(parent, key):
+            return False
+        delattr(parent, key)
+        return True
+
+    def __repr__(self):
+        return f"CompiledPath({self.path!r})"
+
+
+def _resolve(data, keys, indices, default):
+    """ Helper to follow the accessors of a compiled path.
+    """
+    obj = data
+    for key, idx in zip(keys, indices):
+        if isinstance(obj, dict):
+            obj = obj.get(key, SENTINEL_1)
+        elif isinstance(obj, (list, tuple)):
+            if idx is None or idx >= len(obj):
+                return default
+            obj = obj[idx]
+        else:
+            obj = _getChild(obj, key)
+        if obj is SENTINEL_1:
+            return default
+    return obj
+
+
+def _getChild(obj, key):
+    """ Helper to get the child of an object, which is neither a dict nor a list.
+        Returns `SENTINEL_1` if the child doesnt exist.
+    """
+    if obj is None or type(obj) is str:
+        return SENTINEL_1
+    if hasattr(type(obj), "__getitem__"):
+        try:
+            return obj[key]
+        except BaseException:
+            return SENTINEL_1
+    return getattr(obj, key, SENTINEL_1)
+
+
+def _setChild(obj, key, idx, value):
+    """ Helper to assign the child of an object.
+    """
+    if isinstance(obj, list) and idx is not None:
+        if idx >= len(obj):
+            obj.extend([None] * (idx + 1 - len(obj)))
+        obj[idx] = value
+    elif isinstance(obj, dict) or hasattr(type(obj), "__setitem__"):
+        obj[key] = value
+    else:
+        setattr(obj, key, value)
+
+
+@lru_cache(maxsize=4096)
+def compilePath(path: str, splitchar=SPLITCHAR) -> CompiledPath:
+    """ Splits the path once into accessors. The compiled paths are cached.
+
+    >>> compilePath("a/0").get({"a": [1, 2]})
+    1
+
+    Args:
+        path (str): The path to compile.
+        splitchar (str, optional): The char used to split the path. Defaults to SPLITCHAR.
+
+    Returns:
+        CompiledPath: The compiled path.
+    """
+    return CompiledPath(path, splitchar)
+
+
 def rgetattr(data, path, default=SENTINEL_1, splitchar=SPLITCHAR):
     """ Helper to recursively get an value.
 
@@ -25,29 +184,11 @@ def rgetattr(data, path, default=SENTINEL_1, splitchar=SPLITCHAR):
     Returns:
         any: The found data.
     """
-    obj = data
-    if len(path) > 0:
-        if splitchar in path:
-            for attr in path.split(splitchar):
-                if type(obj) in (dict, DottedDict):
-                    obj = obj.get(attr)
-                else:
-                    try:
-                        obj = obj[attr]
-                    except BaseException:
-                        if default == SENTINEL_1:
-                            return None
-                        return default
-        else:
-            try:
-                data = obj[path]
-                return data
-            except KeyError:
-                if default == SENTINEL_1:
-                    return None
-                return default
-
-    return obj
+    if default is SENTINEL_1:
+        default = None
+    if not path:
+        return data
+    return compilePath(path, splitchar).get(data, default)
 
 
 def rqueryAttr(data, query):
@@ -63,34 +204,96 @@ def rqueryAttr(data, query):
             })
         ]
 
-    ret = []
-    multi_level = MULTI_LEVEL_WILDCARD in query
-    # Determine the max depth
-    max_depth = None if multi_level else len(query.split(SPLITCHAR))
+    return [
+        DottedDict({
+            'path': path,
+            'data': value
+        })
+        for path, value in iterQueryAttr(data, query)
+    ]
 
-    # get the flatten object
-    _dict = flattenObject(
-        data,
-        max_depth=max_depth,
-        onlyPathToBaseValue=False
-    )
 
-    # Iterate over the items and use our path matcher to extract the matching
-    # items.
-    for iter_item in _dict.items():
-        path = iter_item[0]
-        value = iter_item[1]
-        r = comparePatternAndPath(query, path)
-
-        if r.affectedOnSameLevel or (multi_level and r.affectedByChild):
-            ret.append(
-                DottedDict({
-                    'path': path,
-                    'data': value
-                })
-            )
+def _iterChildren(obj, prefix, splitchar):
+    """ Helper to iterate over the children of an object. Uses the same rules like `iterFlatten`.
+    """
+    for key, value in _childItemsOf(obj) or ():
+        if value is None:
+            continue
+        if hasattr(value, "to_json") and callable(value.to_json):
+            value = value.to_json()
+        yield (str(key) if '' == prefix else prefix + splitchar + str(key)), value
 
-    return ret
+
+def _getChildOf(obj, segment):
+    """ Helper to get a child of an object. Returns `SENTINEL_2` if the child doesnt exist.
+    """
+    if isinstance(obj, dict):
+        value = obj.get(segment, SENTINEL_2)
+    elif isinstance(obj, (list, tuple)):
+        if not segment.isdigit() or int(segment) >= len(obj):
+            return SENTINEL_2
+        value = obj[int(segment)]
+    elif type(obj) is str or not allowsSubscripton(obj):
+        return SENTINEL_2
+    else:
+        try:
+            value = obj[segment]
+        except BaseException:
+            return SENTINEL_2
+
+    if value is None:
+        return SENTINEL_2
+    if hasattr(value, "to_json") and callable(value.to_json):
+        return value.to_json()
+    return value
+
+
+def iterQueryAttr(data, query, splitchar=SPLITCHAR):
+    """ Iterates over the items of the data, matching the query (pattern). In contrast to
+        flattening the data, only the subtrees selected by the query are visited. `+` matches
+        exactly one level, `#` matches all children (of any depth).
+
+    >>> list(iterQueryAttr({"a": {"b": 1, "c": 2}, "d": 3}, "a/+"))
+    [('a/b', 1), ('a/c', 2)]
+
+    Args:
+        data (any): The data to query.
+        query (str): The query. May contain wildcards.
+        splitchar (str, optional): The char used to split the path. Defaults to SPLITCHAR.
+
+    Yields:
+        (str, any): The path and the value.
+    """
+    segments = query.split(splitchar) if query else []
+    length = len(segments)
+    stack = [('', data, 0)]
+
+    while stack:
+        path, obj, depth = stack.pop()
+
+        if depth == length:
+            yield path, obj
+            continue
+
+        segment = segments[depth]
+
+        if segment == MULTI_LEVEL_WILDCARD:
+            # Every child (of any depth) matches.
+            nodes = _walk(obj, path, splitchar, False, None, None)
+            # Skip the object itself.
+            next(nodes)
+            for childPath, child, _, _ in nodes:
+                yield childPath, child
+        elif segment == SINGLE_LEVEL_WILDCARD:
+            children = [(childPath, child, depth + 1)
+                        for childPath, child in _iterChildren(obj, path, splitchar)]
+            children.reverse()
+            stack.extend(children)
+        else:
+            child = _getChildOf(obj, segment)
+            if child is not SENTINEL_2:
+                stack.append(
+                    (segment if '' == path else path + splitchar + segment, child, depth + 1))
 
 
 def convertData(data, props):
@@ -165,14 +368,16 @@ def convertData(data, props):
         ret[prop.get("key")] = rqueryAttr(data, prop.get("query"))
 
     helper = DottedDict({})
+    matcher = compilePattern(commonPattern) if isinstance(
+        commonPattern, str) else None
 
     for prop in props:
         items = ret[prop.get("key")]
 
         for idx, item in enumerate(items):
 
-            if isinstance(commonPattern, str):
-                result = comparePatternAndPath(commonPattern, item["path"])
+            if matcher is not None:
+                result = matcher.match(item["path"])
                 if result.pathToExtractData:
                     if not (result.pathToExtractData in helper):
                         helper[result.pathToExtractData] = DottedDict()
@@ -219,46 +424,7 @@ def rsetattr(data, path: str, value, splitchar: str = SPLITCHAR):
         splitchar (str, optional): The Splitchar to use. Defaults to "/". Defaults to SPLITCHAR.
     """
 
-    obj = data
-
-    ptrs = path.split(splitchar)
-
-    for idx, attr in enumerate(ptrs[0:-1]):
-        # Adapt the Object by going through a loop
-
-        accessor = int(attr) if isInt(attr) else attr
-
-        sub = _get(obj, accessor, return_none=True)
-
-        if isinstance(obj, list):
-            length = len(obj)
-            while length <= accessor:
-                obj.append(None)
-                length = len(obj)
-
-        if sub is None:
-            # _obj is an Array and it doesnt contain the index
-            # Extract the Next Element:
-            nextAccessor = ptrs[idx + 1]
-
-            nextIsInt = isInt(nextAccessor)
-
-            if nextIsInt:
-                _set(obj, accessor, [None] * (int(nextAccessor) + 1))
-            else:
-                _set(obj, accessor, DottedDict({}))
-
-            sub = _get(obj, accessor)
-
-        obj = sub
-
-    try:
-        obj[ptrs[len(ptrs) - 1]] = value
-    except BaseException as E:
-        try:
-            sub = setattr(obj, ptrs[len(ptrs) - 1], value)
-        except BaseException as E:
-            raise E
+    compilePath(path, splitchar).set(data, value)
 
 
 def isInt(value) -> bool:
@@ -352,21 +518,137 @@ def flattenObject(data, prefix="", splitchar=SPLITCHAR,
 
     # Check if we are ae to access the items using an subscription.
     if allowsSubscripton(data):
-        def callback(path, data, *args):
-            ret[path] = data
-
-        recursiveForEach(
-            data,
-            callback,
-            prefix,
-            splitchar,
-            onlyPathToBaseValue,
-            max_depth
-        )
+        for path, value in iterFlatten(data, prefix, splitchar, onlyPathToBaseValue, max_depth):
+            ret[path] = value
 
     return ret
 
 
+def _childItemsOf(obj):
+    """ Helper to get the (key, value) pairs of an object. Uses the same rules like `getKeys`.
+        Returns `None` if the object has no children.
+    """
+    if type(obj) is str or callable(obj):
+        return None
+    if isinstance(obj, (list, set)):
+        return enumerate(obj) if len(obj) > 0 else None
+    if isinstance(obj, dict):
+        return obj.items() if len(obj) > 0 else None
+    if hasattr(obj, "keys"):
+        keys = list(obj.keys())
+        return ((key, obj[key]) for key in keys) if keys else None
+    try:
+        # For all other items, we will use the vars.
+        items = vars(obj)
+    except BaseException:
+        return None
+    return list(items.items()) if items else None
+
+
+def _walk(data, prefix, splitchar, onlyPathToBaseValue, max_depth, prune, parent='', level=0):
+    """ Helper to iterate over the nodes of an object (depth first, in the order of the keys). Uses
+        a stack instead of recursion. Yields the path, the value, the path of the parent and the level.
+    """
+    maxLevel = int(max_depth) if isInt(max_depth) else None
+
+    if maxLevel is not None and level > maxLevel:
+        return
+    if prune is not None and prune(prefix, data):
+        return
+
+    items = _childItemsOf(data)
+
+    if not onlyPathToBaseValue or items is None:
+        yield prefix, data, parent, level
+    if items is None or (maxLevel is not None and level >= maxLevel):
+        return
+
+    stack = [(iter(items), prefix, level + 1)]
+
+    while stack:
+        children, parent, level = stack[-1]
+        item = next(children, SENTINEL_2)
+
+        if item is SENTINEL_2:
+            stack.pop()
+            continue
+
+        key, value = item
+
+        if value is None:
+            continue
+        if hasattr(value, "to_json") and callable(value.to_json):
+            value = value.to_json()
+
+        path = str(key) if '' == parent else parent + splitchar + str(key)
+
+        if prune is not None and prune(path, value):
+            continue
+
+        items = _childItemsOf(value)
+
+        if not onlyPathToBaseValue or items is None:
+            yield path, value, parent, level
+        if items is not None and (maxLevel is None or level < maxLevel):
+            stack.append((iter(items), path, level + 1))
+
+
+def iterFlatten(data, prefix="", splitchar=SPLITCHAR, onlyPathToBaseValue=False, max_depth=None, prune=None):
+    """ Iterates over the flattened object. In contrast to `flattenObject`, the pairs are created
+        lazily, so the iteration can be stopped early. The object is traversed without recursion,
+        therefore deep objects are supported as well.
+
+    >>> list(iterFlatten({"a": {"b": 1, "c": [2]}}, onlyPathToBaseValue=True))
+    [('a/b', 1), ('a/c/0', 2)]
+
+    Args:
+        data (any): The object to flatten.
+        prefix (str, optional): A prefix for the paths. Defaults to "".
+        splitchar (str, optional): The char used to join the path. Defaults to SPLITCHAR.
+        onlyPathToBaseValue (bool, optional): If set, only the base values (leafs) are returned. Defaults to False.
+        max_depth (int, optional): The max depth, after which the iteration will be stopped. Defaults to None.
+        prune (callable, optional): Receives the path and the value of a node. If it returns `True`, the node and its subtree are skipped. Defaults to None.
+
+    Yields:
+        (str, any): The path and the value.
+    """
+    for path, value, _, _ in _walk(data, prefix, splitchar, onlyPathToBaseValue, max_depth, prune):
+        yield path, value
+
+
+def prunePattern(pattern: str, splitchar=SPLITCHAR):
+    """ Creates a `prune` callback for `iterFlatten`, which skips the subtrees that can not
+        contain a path matching the pattern.
+
+    >>> list(iterFlatten({"a": {"b": 1}, "c": {"b": 2}}, onlyPathToBaseValue=True, prune=prunePattern("a/#")))
+    [('a/b', 1)]
+
+    Args:
+        pattern (str): The pattern. May contain wildcards.
+        splitchar (str, optional): The char used to split the path. Defaults to SPLITCHAR.
+
+    Returns:
+        callable: The callback.
+    """
+    segments = pattern.split(splitchar)
+    length = len(segments)
+
+    def prune(path, value):
+        if path == '':
+            return False
+        for idx, segment in enumerate(path.split(splitchar)):
+            if idx >= length:
+                return True
+            expected = segments[idx]
+            if expected == MULTI_LEVEL_WILDCARD:
+                return False
+            if expected != SINGLE_LEVEL_WILDCARD and expected != segment:
+                return True
+        return False
+
+    return prune
+
+
 def deflattenObject(flattenObject, options=None):
     _options = ensureDottedAccess({'prefix': '', 'splitchar': SPLITCHAR})
     _options.update(ensureDottedAccess(options))
@@ -393,7 +675,7 @@ def getKeys(obj):
     keys = list()
     t_obj = type(obj)
     if not (t_obj is str) and not (callable(obj)):
-        if t_obj in (list, set):
+        if isinstance(obj, (list, set)):
             # For list, we will use the index
             keys = range(0, len(obj))
         elif hasattr(obj, "keys"):
@@ -409,6 +691,83 @@ def getKeys(obj):
     return keys
 
 
+def _joinPath(prefix, key, splitchar):
+    return str(key) if '' == prefix else prefix + splitchar + str(key)
+
+
+_DIFF, _ADD, _REMOVED = range(3)
+""" The actions used by `_diffLeafs`. """
+
+
+def _addLeafs(value, path, ret, splitchar):
+    # Uses a stack instead of recursion (see `_walk`).
+    stack = [(path, value)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict) and len(value) > 0:
+            # Reversed, so the leafs are added in the order of the keys.
+            stack.extend((_joinPath(path, key, splitchar), child)
+                         for key, child in reversed(value.items()))
+        else:
+            ret.added[path] = value
+
+
+def _diffLeafs(old, new, path, ret, splitchar):
+    # Uses a stack instead of recursion (see `_walk`). The removed keys of a dict are added
+    # after its children have been compared (like the former recursive implementation).
+    stack = [(_DIFF, old, new, path)]
+    while stack:
+        action, old, new, path = stack.pop()
+        if action == _ADD:
+            _addLeafs(new, path, ret, splitchar)
+        elif action == _REMOVED:
+            ret.removed.extend(_joinPath(path, key, splitchar)
+                               for key in old if key not in new)
+        elif old is new:
+            # Shared subtree (see `freeze`) => nothing has changed.
+            continue
+        elif isinstance(old, dict) and isinstance(new, dict):
+            stack.append((_REMOVED, old, new, path))
+            for key, child in reversed(new.items()):
+                childPath = _joinPath(path, key, splitchar)
+                if key in old:
+                    stack.append((_DIFF, old[key], child, childPath))
+                else:
+                    stack.append((_ADD, None, child, childPath))
+        elif type(old) is not type(new) or old != new:
+            ret.changed[path] = new
+
+
+def getLeafDiff(old, new, prefix="", splitchar=SPLITCHAR):
+    """ Determines the leaf-level difference between two versions of an object. Dicts are
+        compared recursively, every other value (including lists) is treated as leaf. Identical
+        subtrees (`is`) are skipped, so comparing two versions of a frozen tree (see `freeze`)
+        only visits the changed parts.
+
+    >>> getLeafDiff({"a": 1, "b": {"c": 2}}, {"a": 1, "b": {"d": 3}})
+    {'added': {'b/d': 3}, 'changed': {}, 'removed': ['b/c']}
+
+    Args:
+        old (any): The previous version. `None` if the object didnt exist.
+        new (any): The current version.
+        prefix (str, optional): A prefix for the paths. Defaults to "".
+        splitchar (str, optional): The char used to join the path. Defaults to SPLITCHAR.
+
+    Returns:
+        DottedDict: `added` and `changed` map the paths of the leafs to their new values, `removed` contains the paths which doesnt exist anymore.
+    """
+    ret = DottedDict({
+        'added': {},
+        'changed': {},
+        'removed': []
+    })
+    if old is None:
+        _addLeafs(new, prefix, ret, splitchar)
+    else:
+        _diffLeafs(old, new, prefix, ret, splitchar)
+    return ret
+
+
 def deepAssign(target, source):
     """ Deeply assigns the items given in the dict, whereas the
         keys of the source will be used as path, its value as value
@@ -421,10 +780,7 @@ def deepAssign(target, source):
     Returns:
         any: the manipulated target
     """
-    flattend = flattenObject(source)
-    for iter_item in flattend.entries():
-        path = iter_item[0]
-        value = iter_item[1]
+    for path, value in iterFlatten(source, onlyPathToBaseValue=True):
         rsetattr(target, path, value)
     return target
 
@@ -443,53 +799,12 @@ def recursiveForEach(obj, callback=None, prefix="", splitchar=SPLITCHAR, callOnl
         parent (str, optional): For Recursive call only. Defaults to ''.
         level (int, optional): For Recursive call only. Defaults to 0.
     """
-    if isInt(max_depth) and level > max_depth:
-        # Break the Loop
+    if not callable(callback):
         return
 
-    # No try to extrac the Keys.
-    keys = getKeys(obj)
-
-    called = False
-    if not callOnlyOnBaseValues and callable(callback):
-        callback(prefix, obj, parent, level)
-        called = True
-
-    # If there exits some keys:
-    if len(keys) > 0:
-        # We will iterate over the and
-        for key in keys:
-            # Define the variable, containing the path
-            path = str(key) if '' == prefix else prefix + splitchar + str(key)
-
-            if obj[key] is not None:
-                if hasattr(obj[key], "to_json") and callable(obj[key].to_json):
-                    data = obj[key].to_json()
-                    recursiveForEach(
-                        data,
-                        callback,
-                        path,
-                        splitchar,
-                        callOnlyOnBaseValues,
-                        max_depth,
-                        prefix,
-                        level + 1
-                    )
-
-                else:
-
-                    recursiveForEach(
-                        obj[key],
-                        callback,
-                        path,
-                        splitchar,
-                        callOnlyOnBaseValues,
-                        max_depth,
-                        prefix,
-                        level + 1
-                    )
-    elif not called:
-        callback(prefix, obj, prefix, level)
+    for path, value, _parent, _level in _walk(obj, prefix, splitchar, callOnlyOnBaseValues, max_depth, None, parent, level):
+        # Base values receive their own path as parent.
+        callback(path, value, path if callOnlyOnBaseValues else _parent, _level)
 
 
 def keepProperties(obj, properties):
@@ -514,7 +829,8 @@ WARNED = False
 
 
 def copy(obj):
-    """ A Helper, which can be used to receive a copy.
+    """ A Helper, which can be used to receive a copy. JSON-like trees are copied using
+        `copyTree` (frozen subtrees arent copied), other objects using `deepcopy`.
 
     Args:
         obj (any): The Object to copy
@@ -523,7 +839,7 @@ def copy(obj):
         bool, any: A flag, to show whether it succeeded or failed; the copy (or if failed the object) itself.
     """
     try:
-        return deepcopy(obj)
+        return copyTree(obj)
     except BaseException:
         try:
             return obj.copy()
@@ -1,4 +1,7 @@
-from .dottedDict import ensureDottedAccess, DottedDict
+from collections import OrderedDict
+from functools import lru_cache
+
+from .dottedDict import DottedDict
 from .path import (MULTI_LEVEL_WILDCARD, SINGLE_LEVEL_WILDCARD, SPLITCHAR,
                    containsWildcards, patternIsValid)
 
@@ -29,8 +32,252 @@ def generateResult(res=DottedDict({})):
     return defaultResult
 
 
+class MatchResult:
+    """ The result of matching a path against a compiled pattern (see `CompiledPattern.match`).
+        The fields can be accessed using the dotted notation or like the items of a dict.
+        A result compares equal to a dict with the same items. Must not be modified.
+    """
+
+    __slots__ = ("affected", "affectedByChild", "affectedByParent", "affectedOnSameLevel",
+                 "containsWildcards", "patternToExtractData", "patternLengthComparedToPathLength",
+                 "pathToExtractData")
+
+    def __init__(self, affectedByChild=False, affectedByParent=False, affectedOnSameLevel=False,
+                 containsWildcards=False, patternToExtractData=False,
+                 patternLengthComparedToPathLength='=', pathToExtractData=False):
+        self.affected = affectedByChild or affectedByParent or affectedOnSameLevel
+        self.affectedByChild = affectedByChild
+        self.affectedByParent = affectedByParent
+        self.affectedOnSameLevel = affectedOnSameLevel
+        self.containsWildcards = containsWildcards
+        self.patternToExtractData = patternToExtractData
+        self.patternLengthComparedToPathLength = patternLengthComparedToPathLength
+        self.pathToExtractData = pathToExtractData
+
+    def keys(self):
+        return self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def toDict(self) -> DottedDict:
+        """ Converts the result to a (mutable) `DottedDict`.
+
+        Returns:
+            DottedDict: The Result
+        """
+        return DottedDict({key: getattr(self, key) for key in self.__slots__})
+
+    def _astuple(self):
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, MatchResult):
+            return self._astuple() == other._astuple()
+        if isinstance(other, dict):
+            return dict(self.toDict()) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __repr__(self):
+        items = ", ".join(
+            f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"MatchResult({items})"
+
+
+class CompiledPattern:
+    """ A pattern, which has been validated and split once. Use `compilePattern` to create it.
+        Afterwards paths can be matched using `match`, without parsing the pattern again.
+    """
+
+    __slots__ = ("pattern", "segments", "length", "containsWildcards", "wildcards")
+
+    def __init__(self, pattern: str):
+        if not patternIsValid(pattern):
+            raise Exception('The Pattern is invalid.')
+
+        self.pattern = pattern
+        self.segments = tuple(pattern.split(SPLITCHAR))
+        self.length = len(self.segments)
+        self.containsWildcards = containsWildcards(pattern)
+        # The wildcard of every segment (or None). Like in the original implementation,
+        # the first char of the segment determines the wildcard.
+        self.wildcards = tuple(
+            segment[0] if segment[:1] in (SINGLE_LEVEL_WILDCARD, MULTI_LEVEL_WILDCARD) else None
+            for segment in self.segments
+        )
+
+    def match(self, contentPath: str, matchTopicsWithoutWildcards: bool = False) -> MatchResult:
+        """ Matches the given path, with the pattern and determines, if the path might affect the pattern.
+
+            example: path = "a/b/c"; pattern = "a/#"; => totalPath = "a/b/c"; diffPath = "b/c"
+
+        Args:
+            contentPath (str): The path to use as basis
+            matchTopicsWithoutWildcards (bool, optional): Treat parents and children of the pattern as affected. Defaults to False.
+
+        Returns:
+            MatchResult: The Result
+        """
+        if SINGLE_LEVEL_WILDCARD in contentPath or MULTI_LEVEL_WILDCARD in contentPath:
+            raise Exception(
+                "The Path is invalid. The path should not contain pattern-related chars '#' or '+'.")
+
+        pathPattern = self.pattern
+        _containsWildcards = self.containsWildcards
+        _contentPathSegments = contentPath.split(SPLITCHAR)
+
+        if contentPath and '' in _contentPathSegments:
+            raise Exception('The Path is invalid.')
+
+        _patternLength = self.length
+        _contentPathLength = len(_contentPathSegments)
+
+        # Define the Char for the comparer
+        patternLengthComparedToPathLength = '='
+        if _patternLength > _contentPathLength:
+            patternLengthComparedToPathLength = '>'
+        elif _patternLength < _contentPathLength:
+            patternLengthComparedToPathLength = '<'
+
+        # If both, the pattern and the path are equal => return the result.
+        if pathPattern == contentPath:
+            return MatchResult(
+                affectedOnSameLevel=True,
+                pathToExtractData=contentPath,
+                patternLengthComparedToPathLength=patternLengthComparedToPathLength
+            )
+
+        # If the Path is not realy defined.
+        if contentPath == '':
+            return MatchResult(
+                affectedByParent=True,
+                patternToExtractData=pathPattern if _containsWildcards else False,
+                pathToExtractData=False if _containsWildcards else pathPattern,
+                patternLengthComparedToPathLength='>',
+                containsWildcards=_containsWildcards
+            )
+        if pathPattern == '':
+            return MatchResult(
+                affectedByChild=True,
+                pathToExtractData='',
+                patternLengthComparedToPathLength='<'
+            )
+        if matchTopicsWithoutWildcards:
+            if contentPath.startswith(pathPattern):
+                # Path is longer then the Pattern;
+                # => A Change is performed by "Child",
+                return MatchResult(
+                    affectedByChild=True,
+                    pathToExtractData=contentPath if _containsWildcards else pathPattern,
+                    patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                    containsWildcards=_containsWildcards
+                )
+            elif pathPattern.startswith(contentPath):
+                # Pattern is longer then the path;
+                # => A Change might be initated by
+                # the super element
+                return MatchResult(
+                    affectedByParent=True,
+                    patternToExtractData=pathPattern if _containsWildcards else False,
+                    pathToExtractData=False if _containsWildcards else pathPattern,
+                    patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                    containsWildcards=_containsWildcards
+                )
+
+        segments = self.segments
+        wildcards = self.wildcards
+
+        # Iterate over the Segments.
+        for i in range(_patternLength):
+            if i >= _contentPathLength:
+                # Our Pattern is larger then our contentPath.
+                # So we dont know, whether we will get some
+                # data. Therefore we have to perform a query
+                # later ==> Set The Path / Pattern.
+                return MatchResult(
+                    affectedByParent=True,
+                    patternToExtractData=pathPattern,
+                    patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                    containsWildcards=_containsWildcards
+                )
+
+            wildcard = wildcards[i]
+
+            if wildcard == MULTI_LEVEL_WILDCARD:
+                # MULTI_LEVEL_WILDCARDs are only at the end of the pattern.
+                # So the pattern has either the same length as the path or is
+                # shorter.
+                if patternLengthComparedToPathLength == '=':
+                    return MatchResult(
+                        affectedOnSameLevel=True,
+                        pathToExtractData=contentPath,
+                        patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                        containsWildcards=_containsWildcards
+                    )
+                elif patternLengthComparedToPathLength == '<':
+                    return MatchResult(
+                        affectedByChild=True,
+                        pathToExtractData=contentPath,
+                        patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                        containsWildcards=_containsWildcards
+                    )
+                raise Exception('Implementation Error!')
+            elif wildcard is None and segments[i] != _contentPathSegments[i]:
+                return MatchResult(
+                    patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                    containsWildcards=_containsWildcards
+                )
+
+        # All segments of the pattern are matching.
+        if _patternLength == _contentPathLength:
+            return MatchResult(
+                affectedOnSameLevel=True,
+                pathToExtractData=contentPath,
+                patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+                containsWildcards=_containsWildcards
+            )
+        return MatchResult(
+            affectedByChild=True,
+            pathToExtractData=SPLITCHAR.join(
+                _contentPathSegments[:_patternLength]),
+            patternLengthComparedToPathLength=patternLengthComparedToPathLength,
+            containsWildcards=_containsWildcards
+        )
+
+    def __repr__(self):
+        return f"CompiledPattern({self.pattern!r})"
+
+
+@lru_cache(maxsize=4096)
+def compilePattern(pattern: str) -> CompiledPattern:
+    """ Validates and splits the pattern once. The compiled patterns are cached.
+
+    >>> compilePattern("a/+").match("a/b").affectedOnSameLevel
+    True
+
+    Args:
+        pattern (str): The pattern to compile.
+
+    Returns:
+        CompiledPattern: The compiled pattern.
+    """
+    return CompiledPattern(pattern)
+
+
 def comparePatternAndPath(pathPattern: str, contentPath: str, _options=None):
     """ Matches the given path, with the pattern and determines, if the path might affect the given pattern.
+        Shortcut for `compilePattern(pathPattern).match(contentPath)`.
 
         example: path = "a/b/c"; pattern = "a/#"; => totalPath = "a/b/c"; diffPath = "b/c"
 
@@ -40,212 +287,123 @@ def comparePatternAndPath(pathPattern: str, contentPath: str, _options=None):
         options (dotted_dict, optional): _description_. Defaults to dotted_dict({'matchTopicsWithoutWildcards': False}).
 
     Returns:
-        dotted_dict: The Result
+        MatchResult: The Result
     """
-    options = ensureDottedAccess({'matchTopicsWithoutWildcards': False})
-    options.update(ensureDottedAccess(_options))
-
-    if containsWildcards(contentPath):
-        raise Exception(
-            "The Path is invalid. The path should not contain pattern-related chars '#' or '+'.")
-    if not patternIsValid(pathPattern):
-        raise Exception('The Pattern is invalid.')
-    if not patternIsValid(contentPath):
-        raise Exception('The Path is invalid.')
-
-    _containsWildcards = containsWildcards(pathPattern)
-    _patternSegments = pathPattern.split(SPLITCHAR)
-    _contentPathSegments = contentPath.split(SPLITCHAR)
-    _patternLength = len(_patternSegments)
-    _contentPathLength = len(_contentPathSegments)
-
-    # Define the Char for the comparer
-    patternLengthComparedToPathLength = '='
-    if _patternLength > _contentPathLength:
-        patternLengthComparedToPathLength = '>'
-    elif _patternLength < _contentPathLength:
-        patternLengthComparedToPathLength = '<'
-
-    # If both, the pattern and the path are equal => return the result.
-    if pathPattern == contentPath:
-        return generateResult(
-            DottedDict(
-                {
-                    'affectedOnSameLevel': True,
-                    'pathToExtractData': contentPath,
-                    'patternLengthComparedToPathLength': patternLengthComparedToPathLength
-                }
-            )
-        )
+    matchTopicsWithoutWildcards = bool(_options.get(
+        'matchTopicsWithoutWildcards', False)) if _options else False
+    return compilePattern(pathPattern).match(contentPath, matchTopicsWithoutWildcards)
 
-    # If the Path is not realy defined.
-    if contentPath == '':
-        return generateResult(
-            DottedDict({
-                'affectedByParent': True,
-                'patternToExtractData': pathPattern if _containsWildcards else False,
-                'pathToExtractData': False if _containsWildcards else pathPattern,
-                'patternLengthComparedToPathLength': '>',
-                'containsWildcards': _containsWildcards
-            })
-        )
-    if pathPattern == '':
-        return generateResult(
-            DottedDict({
-                'affectedByChild': True,
-                'pathToExtractData': '',
-                'patternLengthComparedToPathLength': '<'
-            })
-        )
-    if options.matchTopicsWithoutWildcards:
-        if contentPath.startswith(pathPattern):
-            # Path is longer then the Pattern;
-            # => A Change is performed by "Child",
-            if _containsWildcards:
-                return generateResult(
-                    DottedDict({
-                        'affectedByChild': True,
-                        'pathToExtractData': contentPath,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    })
-                )
-            else:
-                return generateResult(
-                    DottedDict({
-                        'affectedByChild': True,
-                        'pathToExtractData': pathPattern,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    })
-                )
-        elif pathPattern.startswith(contentPath):
-            # Pattern is longer then the path;
-            # => A Change might be initated by
-            # the super element
-
-            # The PathToExtractData is allways false, if the path is smaller then the
-            # pattern
-
-            if _containsWildcards:
-                return generateResult(
-                    DottedDict({
-                        'affectedByParent': True,
-                        'patternToExtractData': pathPattern,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    })
-                )
-            else:
-                return generateResult(
-                    DottedDict({
-                        'affectedByParent': True,
-                        'pathToExtractData': pathPattern,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    })
-                )
 
-    partialPath = ''
-    i = 0
-
-    # Iterate over the Segments.
-    while i < _patternLength:
-        # Store the current Pattern Segment
-        currentPattern = _patternSegments[i]
-
-        # We need to know, if there is SINGLE_LEVEL_WILDCARD or MULTI_LEVEL_WILDCARD
-        # there fore we will extract the Wildlevels.
-        patternChar = currentPattern[0]
-        currentPath = _contentPathSegments[i] if i < _contentPathLength else None
-        i = i + 1
-        if currentPath is None:
-            # Our Pattern is larger then our contentPath.
-            # So we dont know, whether we will get some
-            # data. Therefore we have to perform a query
-            # later ==> Set The Path / Pattern.
-
-            if _containsWildcards:
-                # But we contain Patterns.
-                # So we are not allowed to build a
-                # diff object.
-                return generateResult(
-                    DottedDict({
-                        'affectedByParent': True,
-                        'patternToExtractData': pathPattern,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    })
-                )
-            elif patternLengthComparedToPathLength == ">":
-                return generateResult(
-                    DottedDict({
-                        'affectedByParent': True,
-                        'patternToExtractData': pathPattern,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    })
-                )
-            else:
-                raise Exception('Implementation Error! This should not happen')
-        elif currentPath == currentPattern:
-            # The Patterns Match
-            # We now store the correct path of our segment.
-            partialPath = f'{partialPath}{SPLITCHAR}{currentPath}' if len(
-                partialPath) > 0 else currentPath
-        elif patternChar == MULTI_LEVEL_WILDCARD:
-
-            # We know, that MULTI_LEVEL_WILDCARDs are only at the end of the
-            # pattern. So it might happen, that:
-            # a)   our length of the pattern is the same length as the content path
-            # b)   our length of the pattern is smaller then length as the content path
-            #
-            # Our statement before alread tested, that either case a) or b) fits. Otherwise
-            # another ifstatement is valid and we wont enter this statement
-            # here.
-
-            # # We add the segment to testedCorrectPath
-            # testedCorrectPath = testedCorrectPath.length > 0 ?
-            # `{testedCorrectPath}{SPLITCHAR}{currentPath}` : currentPath;
-
-            if patternLengthComparedToPathLength == '=':
-                # Case a)
-                return generateResult(
-                    DottedDict(
-                        {
-                            'affectedOnSameLevel': True,
-                            'pathToExtractData': contentPath,
-                            'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                            'containsWildcards': _containsWildcards
-                        }
-                    )
-                )
-            elif patternLengthComparedToPathLength == '<':
-                # Case b)
-                return generateResult(DottedDict(
-                    {
-                        'affectedByChild': True,
-                        'pathToExtractData': contentPath,
-                        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                        'containsWildcards': _containsWildcards
-                    }
-                ))
-            else:
-                raise Exception('Implementation Error!')
-        elif patternChar == SINGLE_LEVEL_WILDCARD:
-            # Store the correct path.
-            partialPath = f'{partialPath}{SPLITCHAR}{currentPath}' if len(
-                partialPath) > 0 else currentPath
-        elif patternChar != SINGLE_LEVEL_WILDCARD and currentPattern != currentPath:
-            return generateResult(DottedDict({
-                'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-                'containsWildcards': _containsWildcards
-            }))
-    diff = contentPath[len(partialPath):]
-    return generateResult(DottedDict({
-        'affectedOnSameLevel': len(diff) == 0,
-        'affectedByChild': len(diff) >= 1,
-        'pathToExtractData': partialPath,
-        'patternLengthComparedToPathLength': patternLengthComparedToPathLength,
-        'containsWildcards': _containsWildcards
-    }))
+class PatternMatchCache:
+    """ A bounded LRU-Cache for the results of `comparePatternAndPath`. The entries are
+        stored using the tuple `(pattern, path)` as key (and the option
+        `matchTopicsWithoutWildcards`, if it differs from the default of the cache). If the
+        capacity is reached, the least recently used entry is evicted. Therefore the memory stays flat, even if
+        the topics contain task or instance ids.
+
+        The cache counts its hits, misses and evictions (see `statistics`).
+    """
+
+    def __init__(self, capacity: int = 10000,
+                 matchTopicsWithoutWildcards: bool = True):
+        """ Creates the cache.
+
+        Args:
+            capacity (int, optional): The max amount of stored results. Defaults to 10000.
+            matchTopicsWithoutWildcards (bool, optional): Default of the option forwarded to `comparePatternAndPath`. Defaults to True.
+        """
+        self._cache = OrderedDict()
+        self._capacity = capacity
+        self._matchTopicsWithoutWildcards = matchTopicsWithoutWildcards
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def matchTopicsWithoutWildcards(self) -> bool:
+        return self._matchTopicsWithoutWildcards
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: int):
+        self._capacity = value
+        self._evict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _evict(self):
+        while len(self._cache) > self._capacity:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def compare(self, pathPattern: str, contentPath: str, matchTopicsWithoutWildcards: bool = None):
+        """ Returns the (cached) result of `comparePatternAndPath`.
+
+        >>> cache = PatternMatchCache()
+        >>> cache.compare("svc/a", "svc/ab").affected, cache.compare("svc/a", "svc/ab", False).affected
+        (True, False)
+
+        Args:
+            pathPattern (str): The pattern to test
+            contentPath (str): The path to use as basis
+            matchTopicsWithoutWildcards (bool, optional): The option to use instead of the default of the cache. Defaults to None.
+
+        Returns:
+            MatchResult: The Result.
+        """
+        if matchTopicsWithoutWildcards is None or matchTopicsWithoutWildcards == self._matchTopicsWithoutWildcards:
+            matchTopicsWithoutWildcards = self._matchTopicsWithoutWildcards
+            key = (pathPattern, contentPath)
+        else:
+            key = (pathPattern, contentPath, matchTopicsWithoutWildcards)
+        result = self._cache.get(key)
+
+        if result is None:
+            self.misses += 1
+            result = compilePattern(pathPattern).match(
+                contentPath, matchTopicsWithoutWildcards)
+            self._cache[key] = result
+            self._evict()
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+
+        return result
+
+    __call__ = compare
+
+    def clear(self, resetStatistics: bool = False):
+        """ Removes all stored results.
+
+        Args:
+            resetStatistics (bool, optional): Flag to reset the counters as well. Defaults to False.
+        """
+        self._cache.clear()
+        if resetStatistics:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    @property
+    def statistics(self) -> DottedDict:
+        """ The statistics of the cache.
+
+        Returns:
+            DottedDict: containing `hits`, `misses`, `evictions`, `size` and `capacity`
+        """
+        return DottedDict({
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._cache),
+            'capacity': self._capacity
+        })
+
+
+MATCH_CACHE = PatternMatchCache()
+""" The default cache, shared by the pub-sub-systems and `NopeDispatcher.query` (which uses
+    `matchTopicsWithoutWildcards=False`). """
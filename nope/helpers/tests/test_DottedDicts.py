@@ -1,8 +1,11 @@
 import asyncio
+import copy
+import pickle
 
 import pytest
 
-from ..dottedDict import convertToDottedDict
+from ..dottedDict import DottedDict, LazyNoneDottedDict, convertToDottedDict, ensureDottedAccess
+from ..hashable import unhash
 from ...helpers import EXECUTOR
 
 
@@ -24,3 +27,75 @@ def test_convertToDottedDict():
 
     assert item.hello_world == d["hello_world"]
     assert item.nested_data.hello == d["nested_data"]["hello"]
+
+
+def test_lazy_conversion():
+    d = {"hello_world": 1, "nested_data": {"hello": "world", "entries": [{"a": 1}]}}
+    item = ensureDottedAccess(d, lazy=True)
+
+    assert isinstance(item, LazyNoneDottedDict)
+    assert item == d
+    assert item.hello_world == 1
+    assert item.missing is None
+    assert item["missing"] is None
+
+    # Nested items are converted, once they are accessed.
+    assert dict.__getitem__(item, "nested_data") is d["nested_data"]
+    assert item.nested_data.hello == "world"
+    assert item.nested_data is item.nested_data
+    assert item.nested_data.entries[0].a == 1
+
+    # The original dict stays untouched.
+    item.nested_data.hello = "nope"
+    assert d["nested_data"]["hello"] == "world"
+
+    strict = ensureDottedAccess(d, False, lazy=True)
+    with pytest.raises(KeyError):
+        strict["missing"]
+
+
+def test_hashed_dotted_dict():
+    item = DottedDict({"a": 1, "nested": DottedDict({"b": 2})})
+    item.c = 3
+    assert item.c == 3 and item.missing is None
+    assert "__dict__" not in dir(DottedDict), "DottedDict should use slots"
+
+    with pytest.raises(Exception):
+        item.items = 1
+
+    value = hash(item)
+    assert hash(item) == value
+    assert item.hashed() and isinstance(item, DottedDict)
+    assert item.nested.b == 2
+
+    with pytest.raises(ValueError):
+        item.d = 4
+    with pytest.raises(ValueError):
+        item["d"] = 4
+    with pytest.raises(ValueError):
+        item.nested.b = 3
+
+    unhash(item)
+    assert type(item) is DottedDict and not item.hashed()
+    item.d = 4
+    assert item.d == 4
+
+
+def test_copy_and_pickle_dotted_dict():
+    item = ensureDottedAccess({"a": 1, "nested": {"b": [1, 2]}})
+    hashed = DottedDict({"a": 1, "nested": DottedDict({"b": 2})})
+    hash(hashed)
+
+    with pytest.raises(AttributeError):
+        item.__setstate__
+
+    for original, cls in ((item, type(item)), (hashed, DottedDict)):
+        for duplicate in (copy.copy(original), copy.deepcopy(original),
+                          pickle.loads(pickle.dumps(original))):
+            assert duplicate == original
+            assert type(duplicate) is cls and not duplicate.hashed()
+            assert duplicate.nested.b == original.nested.b
+
+    duplicate = copy.deepcopy(item)
+    duplicate.nested.b.append(3)
+    assert item.nested.b == [1, 2]
@@ -3,6 +3,7 @@ import asyncio
 import pytest
 
 from ..asyncHelpers import EXECUTOR, waitFor
+from ..timingWheel import TimingWheel
 
 
 @pytest.fixture
@@ -24,3 +25,82 @@ async def test_waitFor():
         return counter > 5
 
     await waitFor(test, maxTimeout=1000)
+
+
+async def test_callLater():
+    loop = asyncio.get_running_loop()
+    fired = []
+
+    async def asyncCallback(value):
+        fired.append((value, loop.time()))
+
+    begin = loop.time()
+    EXECUTOR.callLater(lambda value: fired.append((value, loop.time())), 30, "sync")
+    EXECUTOR.callLater(asyncCallback, 10, "async")
+    canceled = EXECUTOR.callLater(fired.append, 20, "canceled")
+
+    assert canceled.cancel()
+    assert not canceled.cancel()
+
+    await asyncio.sleep(0.1)
+
+    assert [value for value, _ in fired] == ["async", "sync"]
+    # A timer is never executed early.
+    assert fired[0][1] - begin >= 0.01 and fired[1][1] - begin >= 0.03
+    assert len(EXECUTOR.timers) == 0
+
+
+async def test_timing_wheel_rounds():
+    loop = asyncio.get_running_loop()
+    # A turn of the wheel takes 4 ms, so the timers wait multiple turns.
+    wheel = TimingWheel(loop, resolution=1, slots=4)
+    fired = []
+
+    begin = loop.time()
+    for delay in (25, 5, 14, 2):
+        wheel.schedule(delay, lambda delay: fired.append((delay, loop.time() - begin)), delay)
+
+    # Cancel a timer from the callback of an earlier timer.
+    other = wheel.schedule(30, fired.append, "canceled")
+    wheel.schedule(28, other.cancel)
+
+    await asyncio.sleep(0.06)
+
+    assert [delay for delay, _ in fired] == [2, 5, 14, 25]
+    assert all(elapsed >= delay / 1000 for delay, elapsed in fired)
+    assert len(wheel) == 0
+
+
+async def test_timing_wheel_wakeups():
+    loop = asyncio.get_running_loop()
+    wheel = TimingWheel(loop, resolution=1, slots=4)
+    fired = []
+    ticks = 0
+    onTick = wheel._onTick
+
+    def countTicks():
+        nonlocal ticks
+        ticks += 1
+        onTick()
+
+    wheel._onTick = countTicks
+
+    # A long pending timer doesnt wake up the loop on every tick.
+    longTimer = wheel.schedule(60000, fired.append, "long")
+    wheel.schedule(30, fired.append, "short")
+    assert wheel._handle.when() == pytest.approx(loop.time() + 0.03, abs=0.002)
+
+    await asyncio.sleep(0.05)
+
+    assert fired == ["short"]
+    assert ticks == 1
+    assert wheel._handle.when() == pytest.approx(longTimer.deadline, abs=0.002)
+
+    # An earlier timer rearms the handle.
+    wheel.schedule(5, fired.append, "early")
+    await asyncio.sleep(0.02)
+
+    assert fired == ["short", "early"]
+    assert ticks == 2
+    assert longTimer.cancel()
+    assert len(wheel) == 0
@@ -0,0 +1,80 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from ..dottedDict import DottedDict, ensureDottedAccess
+from ..frozen import FrozenDict, FrozenList, copyTree, freeze, isFrozen, thaw
+from ..objectMethods import copy as copyHelper
+
+
+def test_freeze():
+    data = {"a": [1, {"b": 2}], "c": (1, 2)}
+    frozen = freeze(data)
+
+    assert frozen == {"a": [1, {"b": 2}], "c": [1, 2]}
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen["a"], FrozenList)
+    assert isinstance(frozen["a"][1], FrozenDict)
+    assert isFrozen(frozen)
+    assert freeze(frozen) is frozen, "Freezing a frozen tree must not copy it"
+    assert frozen.a[1].b == 2
+    assert frozen.missing is None
+
+
+def test_immutable():
+    frozen = freeze({"a": [1, 2]})
+
+    with pytest.raises(TypeError):
+        frozen["b"] = 1
+    with pytest.raises(TypeError):
+        frozen.update({"b": 1})
+    with pytest.raises(TypeError):
+        frozen.a.append(3)
+    with pytest.raises(TypeError):
+        frozen.a[0] = 3
+
+
+def test_copy_and_serialize():
+    frozen = freeze({"a": [1, {"b": 2}]})
+
+    assert copy.deepcopy(frozen) is frozen
+    assert frozen.copy() is frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert json.loads(json.dumps(frozen)) == frozen
+
+    mutable = thaw(frozen)
+    mutable["a"][1]["b"] = 3
+    assert type(mutable) is dict
+    assert frozen.a[1].b == 2
+
+
+class Foreign:
+    def __init__(self, value):
+        self.value = value
+
+
+def test_copy_tree():
+    shared = freeze({"x": 1})
+    data = {"a": [1, {"b": 2}], "frozen": shared,
+            "dotted": DottedDict({"c": {"d": 1}}), "foreign": Foreign(1)}
+
+    copied = copyTree(data)
+    assert copied["a"] == data["a"] and copied["a"] is not data["a"]
+    assert copied["a"][1] is not data["a"][1]
+    assert copied["frozen"] is shared, "Frozen trees must not be copied"
+    assert type(copied["dotted"]) is DottedDict
+    assert copied["dotted"].c == {"d": 1}
+    assert copied["dotted"]["c"] is not data["dotted"]["c"]
+    assert copied["foreign"] is not data["foreign"]
+    assert copied["foreign"].value == 1
+
+    # Cyclic data is copied using deepcopy.
+    cyclic = {"a": []}
+    cyclic["a"].append(cyclic)
+    copied = copyHelper(cyclic)
+    assert copied["a"][0] is copied
+
+    lazy = ensureDottedAccess({"a": {"b": 1}}, lazy=True)
+    assert copyTree(lazy).a.b == 1
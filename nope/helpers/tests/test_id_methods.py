@@ -0,0 +1,37 @@
+from threading import Thread
+
+from ..asyncHelpers import EXECUTOR
+from ..idMethods import IdGenerator, generateId
+
+
+def test_id_generator():
+    generator = IdGenerator()
+    first, second = generator(), generator()
+
+    assert first != second
+    assert first.startswith(generator.prefix + "-")
+    assert IdGenerator().prefix != generator.prefix, "The prefix should be random"
+    assert len(generator.binary()) == 16
+
+    ids = set()
+
+    def generate():
+        for _ in range(1000):
+            ids.add(generator())
+
+    threads = [Thread(target=generate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(ids) == 4000, "The ids must be unique across threads"
+
+
+def test_use_id_generator():
+    default = EXECUTOR.idGenerator
+    try:
+        EXECUTOR.useIdGenerator(generateId)
+        assert len(EXECUTOR.idGenerator()) == 36
+    finally:
+        EXECUTOR.useIdGenerator(default)
@@ -2,7 +2,10 @@ import asyncio
 
 import pytest
 
-from ..objectMethods import (convertData, flattenObject, rgetattr, rqueryAttr)
+from ..objectMethods import (compilePath, convertData, deepAssign, flattenObject, getLeafDiff, iterFlatten, iterQueryAttr,
+                             prunePattern, rgetattr, rqueryAttr, rsetattr)
+from ..pathMatchingMethods import comparePatternAndPath
+from ..frozen import freeze
 from ...helpers import EXECUTOR
 
 
@@ -42,6 +45,30 @@ def test_rgetattr():
     assert result is None
 
 
+def test_compile_path():
+    compiled = compilePath("a/0/b")
+    assert compiled is compilePath("a/0/b")
+    assert compiled.keys == ("a", "0", "b")
+    assert compiled.indices == (None, 0, None)
+
+    data = {}
+    compiled.set(data, 1)
+    assert data == {"a": [{"b": 1}]}
+    assert compiled.get(data) == 1
+    assert compilePath("a/1/b").get(data, "default") == "default"
+    assert compilePath("a/0/b/c").get(data, "default") == "default"
+
+    assert compiled.delete(data)
+    assert not compiled.delete(data)
+    assert data == {"a": [{}]}
+
+    # Digits are used as keys of dicts.
+    data = {"a": {"0": 1}}
+    assert rgetattr(data, "a/0") == 1
+    rsetattr(data, "a/1", 2)
+    assert data == {"a": {"0": 1, "1": 2}}
+
+
 def test_flattenObject():
     data = {"deep": {"nested": "test"}}
     result = flattenObject(data)
@@ -61,6 +88,36 @@ def test_flattenObject():
     assert "test/deep/nested" in result
 
 
+def test_iterFlatten():
+    data = {"a": {"b": 1, "c": [2, 3]}, "d": {"b": 4}}
+
+    assert list(iterFlatten(data, onlyPathToBaseValue=True)) == [
+        ("a/b", 1), ("a/c/0", 2), ("a/c/1", 3), ("d/b", 4)]
+    assert dict(iterFlatten(data)) == dict(flattenObject(data))
+
+    # Stop early.
+    items = iterFlatten(data, onlyPathToBaseValue=True)
+    assert next(items) == ("a/b", 1)
+
+    # Prune subtrees.
+    assert list(iterFlatten(data, onlyPathToBaseValue=True, prune=prunePattern("+/b"))) == [
+        ("a/b", 1), ("d/b", 4)]
+    assert list(iterFlatten(data, onlyPathToBaseValue=True, prune=lambda path, value: path == "a")) == [
+        ("d/b", 4)]
+
+    # Deep objects doesnt reach the recursion limit.
+    deep = current = {}
+    for _ in range(5000):
+        current["n"] = {}
+        current = current["n"]
+    current["value"] = 1
+    path, value = next(iterFlatten(deep, onlyPathToBaseValue=True))
+    assert value == 1
+    assert path.count("/") == 5000
+
+    assert deepAssign({"a": {"x": 1}}, {"a": {"b": 2}}) == {"a": {"x": 1, "b": 2}}
+
+
 def test_convert():
     data = {}
     result = convertData(data, [
@@ -183,3 +240,57 @@ def test_query():
     pathes = map(lambda item: item.path, result)
     assert (
         "deep/nested_01" in pathes and "deep/nested_01/nested_02" in pathes and "deep/nested_03" in pathes), 'we expected the "deep/nested_01", "deep/nested_01/nested_02" and "deep/nested_03" have been found'
+
+
+def test_iter_query_attr():
+    data = {
+        "a": {"b": {"c": 1, "d": [1, 2]}, "e": 2},
+        "f": [{"b": 3}, {"g": 4}],
+        "h": None
+    }
+
+    for item in (data, freeze(data)):
+        flatten = flattenObject(item)
+        for query in ["+", "#", "a/+", "a/#", "+/b", "+/+/c", "a/b/d/+", "f/+/b", "f/#", "x/+", "h/#"]:
+            multi_level = "#" in query
+            expected = []
+            for path, value in flatten.items():
+                r = comparePatternAndPath(query, path)
+                if r.affectedOnSameLevel or (multi_level and r.affectedByChild):
+                    expected.append((path, value))
+
+            result = list(iterQueryAttr(item, query))
+            assert sorted(result, key=str) == sorted(expected, key=str), f"Failed for query '{query}'"
+
+
+def test_get_leaf_diff():
+    old = freeze({"a": {"b": 1, "c": [1, 2]}, "d": {"e": 1}, "f": 1})
+    new = freeze({"a": {"b": 2, "c": [1, 2]}, "d": old["d"], "g": {"h": 1}})
+
+    diff = getLeafDiff(old, new)
+    assert diff.added == {"g/h": 1}
+    assert diff.changed == {"a/b": 2}
+    assert diff.removed == ["f"]
+
+    diff = getLeafDiff(None, {"a": {"b": 1}, "c": {}})
+    assert diff.added == {"a/b": 1, "c": {}}
+
+    diff = getLeafDiff(1, {"a": 1})
+    assert diff.changed == {"": {"a": 1}}
+
+
+def test_get_leaf_diff_deep_trees():
+    def deep(depth, leaf):
+        ret = leaf
+        for _ in range(depth):
+            ret = {"k": ret, "l": depth}
+        return ret
+
+    # Deeper than the recursion limit.
+    path = "/".join(["k"] * 3000)
+    diff = getLeafDiff(deep(3000, {"x": 1}), deep(3000, {"x": 2, "y": 3}))
+    assert diff.added == {path + "/y": 3} and diff.changed == {path + "/x": 2}
+
+    diff = getLeafDiff(deep(3000, {"x": 2, "y": 3}), deep(3000, {"x": 1}))
+    assert diff.changed == {path + "/x": 1} and diff.removed == [path + "/y"]
+    assert len(getLeafDiff(None, deep(3000, 1)).added) == 3001
@@ -2,7 +2,7 @@ import asyncio
 
 import pytest
 
-from ..pathMatchingMethods import comparePatternAndPath, generateResult
+from ..pathMatchingMethods import comparePatternAndPath, compilePattern, generateResult, PatternMatchCache
 from ...helpers import EXECUTOR
 
 
@@ -356,3 +356,72 @@ def test_comparePatternAndPath():
         expected = test["expected_result"]
         assert result == test[
             "expected_result"], f"2.{idx} went wrong: '{desc}'\nresult:\t{result}\nexpected:\t{expected}\n\n{test}"
+
+
+def test_pattern_match_cache():
+    cache = PatternMatchCache(capacity=2)
+
+    assert cache.compare("a/+", "a/b").affected
+    assert cache.compare("a/+", "a/b").affected
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+    assert cache.compare("a/+", "a/c") == comparePatternAndPath("a/+", "a/c", {
+        "matchTopicsWithoutWildcards": True,
+    })
+    assert not cache.compare("b", "a").affected
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    # The least recently used entry has been evicted.
+    cache.compare("a/+", "a/b")
+    assert cache.misses == 4
+
+    cache.capacity = 1
+    assert len(cache) == 1
+    assert cache.statistics.evictions == 3
+
+    cache.clear(resetStatistics=True)
+    assert len(cache) == 0
+    assert cache.statistics.hits == 0
+
+
+def test_compile_pattern():
+    matcher = compilePattern("a/+/c")
+    assert compilePattern("a/+/c") is matcher
+    assert matcher.segments == ("a", "+", "c")
+    assert matcher.containsWildcards
+
+    result = matcher.match("a/b/c")
+    assert result.affectedOnSameLevel
+    assert result["pathToExtractData"] == "a/b/c"
+    assert result == comparePatternAndPath("a/+/c", "a/b/c")
+    assert result.toDict() == generateResult({
+        "pathToExtractData": "a/b/c",
+        "affectedOnSameLevel": True,
+        "containsWildcards": True,
+    })
+
+    assert not matcher.match("a/b/d").affected
+    assert matcher.match("a/b/c/d").affectedByChild
+    assert matcher.match("a", True).patternToExtractData == "a/+/c"
+
+    for pattern in ("a//b", "a/#/b"):
+        with pytest.raises(Exception):
+            compilePattern(pattern)
+
+    for path in ("a/+", "a//b"):
+        with pytest.raises(Exception):
+            matcher.match(path)
+
+
+def test_pattern_match_cache_options():
+    cache = PatternMatchCache()
+
+    # The results of both options are stored separately.
+    assert cache.compare("svc/a", "svc/ab").affected
+    assert not cache.compare("svc/a", "svc/ab", False).affected
+    assert cache.compare("svc/a", "svc/ab", True).affected
+    assert cache.compare("svc/a", "svc/ab", False) == comparePatternAndPath("svc/a", "svc/ab")
+    assert len(cache) == 2
+    assert cache.hits == 2
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Hashed timing wheel for many short living timeouts (i.e. the timeouts of rpc-calls).
+
+    The timers are stored in `slots` buckets; a timer due at the tick `n` is stored in the
+    bucket `n % slots`. Scheduling and canceling a timer are O(1). The wheel uses a single
+    `loop.call_at` handle, which is armed for the earliest due tick, so the loop only wakes
+    up, if a timer expires. A timer is executed at the first tick after its deadline,
+    therefore it is delayed by at most `resolution` ms, but never executed early. Canceling
+    the last timer keeps the handle armed (it expires without work), so a sequence of short
+    calls doesnt reschedule the handle every time.
+"""
+
+import asyncio
+import math
+from operator import attrgetter
+
+_dueOf = attrgetter("_due")
+
+
+class TimerHandle:
+    """ A timer of a `TimingWheel`. Compatible to the tasks returned by `setTimeout`,
+        i.e. it can be stopped using `cancel`.
+    """
+
+    __slots__ = ("callback", "args", "deadline", "_due", "_slot", "_wheel")
+
+    def __init__(self, wheel, callback, args, deadline: float):
+        self.callback = callback
+        self.args = args
+        self.deadline = deadline
+        self._due = 0
+        self._slot = None
+        self._wheel = wheel
+
+    def cancel(self) -> bool:
+        """ Stops the timer.
+
+        Returns:
+            bool: False, if the timer has already been executed or canceled.
+        """
+        wheel = self._wheel
+        return wheel._remove(self) if wheel is not None else False
+
+    def cancelled(self) -> bool:
+        return self._slot is None and self._wheel is None
+
+    def done(self) -> bool:
+        return self._slot is None
+
+
+class TimingWheel:
+    """ Executes callbacks after a delay (see `schedule`).
+
+        >>> loop = asyncio.new_event_loop()
+        >>> wheel = TimingWheel(loop)
+        >>> fired = []
+        >>> handle = wheel.schedule(20, fired.append, "first")
+        >>> wheel.schedule(10, fired.append, "second").cancel()
+        True
+        >>> loop.run_until_complete(asyncio.sleep(0.05))
+        >>> fired, len(wheel)
+        (['first'], 0)
+        >>> loop.close()
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, resolution: float = 10, slots: int = 512):
+        """ Creates the wheel.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The loop executing the callbacks.
+            resolution (float, optional): Duration of a tick in ms. Defaults to 10.
+            slots (int, optional): Amount of buckets. Defaults to 512.
+        """
+        self.loop = loop
+        self.resolution = resolution / 1000.0
+        self._slots = [dict() for _ in range(slots)]
+        self._count = 0
+        # The last processed tick.
+        self._tick = 0
+        self._handle = None
+        # The tick, the handle is armed for.
+        self._armedTick = None
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay_ms: float, callback, *args) -> TimerHandle:
+        """ Calls the (sync) callback after the delay.
+
+        Args:
+            delay_ms (float): Delay in ms.
+            callback (callable): The function to call.
+
+        Returns:
+            TimerHandle: The timer.
+        """
+        now = self.loop.time()
+        if self._count == 0:
+            self._tick = max(self._tick, int(now / self.resolution))
+
+        timer = TimerHandle(self, callback, args, now + delay_ms / 1000.0)
+        timer._due = max(self._tick + 1, math.ceil(timer.deadline / self.resolution))
+        timer._slot = self._slots[timer._due % len(self._slots)]
+        timer._slot[timer] = None
+
+        self._count += 1
+        self._arm(timer._due)
+
+        return timer
+
+    def _remove(self, timer: TimerHandle) -> bool:
+        slot = timer._slot
+        if slot is None:
+            return False
+
+        del slot[timer]
+        timer._slot = None
+        timer._wheel = None
+        self._count -= 1
+        return True
+
+    def _arm(self, tick: int):
+        """ Arms the handle for the tick, if it isnt armed for an earlier tick.
+        """
+        if self._handle is not None:
+            if self._armedTick <= tick:
+                return
+            self._handle.cancel()
+        self._armedTick = tick
+        self._handle = self.loop.call_at(tick * self.resolution, self._onTick)
+
+    def _nextTick(self):
+        """ Returns the earliest due tick of the pending timers.
+        """
+        slots = self._slots
+        amount = len(slots)
+        earliest = None
+        for tick in range(self._tick + 1, self._tick + amount + 1):
+            for timer in slots[tick % amount]:
+                due = timer._due
+                if due == tick:
+                    # No timer is due earlier (the previous slots have been checked).
+                    return tick
+                if earliest is None or due < earliest:
+                    earliest = due
+        return earliest
+
+    def _onTick(self):
+        self._handle = None
+        if self._count == 0:
+            return
+
+        # The loop may wake up slightly early.
+        target = max(self._armedTick, int(self.loop.time() / self.resolution))
+        slots = self._slots
+        amount = len(slots)
+
+        # Collect the due timers of the elapsed ticks (every slot is visited at most once).
+        due = []
+        for tick in range(self._tick + 1, min(target, self._tick + amount) + 1):
+            slot = slots[tick % amount]
+            if slot:
+                due.extend(timer for timer in slot if timer._due <= target)
+        self._tick = target
+
+        if len(due) > 1:
+            due.sort(key=_dueOf)
+
+        for timer in due:
+            slot = timer._slot
+            if slot is None:
+                # Canceled by a previous callback.
+                continue
+            del slot[timer]
+            timer._slot = None
+            self._count -= 1
+            try:
+                timer.callback(*timer.args)
+            except Exception as error:
+                self.loop.call_exception_handler({
+                    "message": "Exception raised during executing a timer",
+                    "exception": error,
+                })
+
+        if self._count > 0:
+            self._arm(self._nextTick())
+
+    def clear(self):
+        """ Cancels all timers.
+        """
+        for slot in self._slots:
+            for timer in slot:
+                timer._slot = None
+                timer._wheel = None
+            slot.clear()
+        self._count = 0
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
@@ -1,5 +1,7 @@
+from itertools import count
+
 from ..eventEmitter import NopeEventEmitter
-from ..helpers import DottedDict, extractUniqueValues, transformDict, determineDifference
+from ..helpers import DottedDict, determineDifference, extractItems, extractUniqueValues, rqueryAttr
 from ..observable import NopeObservable
 
 
@@ -30,7 +32,56 @@ class MergeData:
         self.onChange.dispose()
 
 
+_MISSING = object()
+
+
+class _ByValue:
+    """ Helper to use an unhashable value as key of a dict. All of these keys share the
+        same hash, therefore they are compared by value (like in a list).
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 0
+
+    def __eq__(self, other):
+        return isinstance(other, _ByValue) and self.value == other.value
+
+
+def _uniqueKeyOf(value):
+    if isinstance(value, (dict, list, set)):
+        return _ByValue(value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return _ByValue(value)
+
+
+def _collect(values):
+    """ Helper to store the values in a set. If the values arent hashable, a list is used.
+    """
+    try:
+        return set(values)
+    except TypeError:
+        ret = []
+        for value in values:
+            if value not in ret:
+                ret.append(value)
+        return ret
+
+
 class DictBasedMergeData(MergeData):
+    """ Merges the items of a dict (i.e. the services of every dispatcher). The new keys and
+        values are extracted using the paths (see `transformDict`).
+
+        Use `updateKey` and `removeKey` to change a single item of the original data. Only the
+        entries affected by this item are adapted. `update` considers the entire original data.
+    """
 
     def __init__(self, originalData, _path='', _pathKey=None):
         def callback(m):
@@ -38,29 +89,213 @@ class DictBasedMergeData(MergeData):
 
         self._path = _path
         self._pathKey = _pathKey
+        # If no key is used, the unique values are stored in `data`.
+        # Otherwise the first value of every (unique) key.
+        self._byValue = _pathKey is None or _pathKey == _path
         self.amountOf = dict()
         self.simplified = dict()
         self.keyMapping = dict()
         self.keyMappingreverse = dict()
         self.conflicts = dict()
         self.orgKeyToExtractedValue = dict()
-        self.extracted_key = []
-        self.extracted_value = []
+
+        # Extracted items of every original key.
+        self._items = dict()
+        # The order of the original keys. Used to determine the first value
+        # of a new key, like iterating over the original data.
+        self._positions = dict()
+        self._counter = count()
+        # The values of every new key, sorted by the original key.
+        self._providers = dict()
+        # The unique keys of the values of every original key (only used, if `_byValue`).
+        self._uniqueKeys = dict()
+        self._amountOfValue = dict()
+        # The content of `data` (unique key -> value).
+        self._data = dict()
 
         super().__init__(originalData, callback)
 
+    @property
+    def extracted_key(self):
+        return list(self.simplified.keys())
+
+    @property
+    def extracted_value(self):
+        return list(self.simplified.values())
+
     def update(self, data=None, force=False):
+        """ Considers the entire original data.
+
+        Args:
+            data (dict, optional): New original data. Defaults to None.
+            force (bool, optional): Emit the change, even if nothing changed. Defaults to False.
+        """
         if data is not None:
             self.originalData = data
-        result = transformDict(self.originalData, self._path, self._pathKey)
-
-        self.simplified = result.extracted_map
-        self.amountOf = result.amountOf
-        self.keyMapping = result.keyMapping
-        self.keyMappingreverse = result.keyMappingreverse
-        self.conflicts = result.conflicts
-        self.orgKeyToExtractedValue = result.orgKeyToExtractedValue
-        self.extracted_key = [*self.simplified.keys()]
-        self.extracted_value = [*self.simplified.values()]
-
-        super().update(data, force)
+
+        before = dict()
+
+        for key in [key for key in self._items if key not in self.originalData]:
+            self._remove(key, before)
+        for key, value in self.originalData.items():
+            self._set(key, value, before)
+
+        self._publish(before, force)
+
+    def updateKey(self, key, value):
+        """ Stores the value in the original data and adapts only the
+            entries affected by this item.
+
+        Args:
+            key (any): The original key (i.e. the id of a dispatcher).
+            value (any): The original value.
+        """
+        self.originalData[key] = value
+        before = dict()
+        self._set(key, value, before)
+        self._publish(before)
+
+    def removeKey(self, key):
+        """ Removes the item from the original data and adapts only the
+            entries affected by this item.
+
+        Args:
+            key (any): The original key (i.e. the id of a dispatcher).
+        """
+        self.originalData.pop(key, None)
+        before = dict()
+        self._remove(key, before)
+        self._publish(before)
+
+    def _set(self, key, value, before):
+        items = extractItems(key, value, self._path, self._pathKey)
+        if self._items.get(key, _MISSING) == items:
+            # Nothing has changed.
+            return
+
+        oldKeys = {newKey for newKey, _ in self._items.get(key, ())}
+        self._items[key] = items
+        if key not in self._positions:
+            self._positions[key] = next(self._counter)
+
+        values = dict()
+        for newKey, newValue in items:
+            values.setdefault(newKey, []).append(newValue)
+
+        for newKey, newValues in values.items():
+            # The position of the original key is kept.
+            self._providers.setdefault(newKey, dict())[key] = newValues
+        for newKey in oldKeys - values.keys():
+            self._providers[newKey].pop(key, None)
+
+        self.keyMapping[key] = set(values)
+        self.orgKeyToExtractedValue[key] = _collect(
+            newValue for _, newValue in items)
+
+        if self._byValue:
+            path = self._path
+            uniqueKeys = [
+                (_uniqueKeyOf(item.data), item.data) for item in rqueryAttr(value, path)
+            ] if path else [(_uniqueKeyOf(value), value)]
+
+            # Add the new values, before the old ones are removed.
+            # So the unchanged values keep their position.
+            for uniqueKey, data in uniqueKeys:
+                self._addValue(uniqueKey, data, before)
+            for uniqueKey in self._uniqueKeys.get(key, ()):
+                self._removeValue(uniqueKey, before)
+            self._uniqueKeys[key] = [uniqueKey for uniqueKey, _ in uniqueKeys]
+
+        for newKey in oldKeys | values.keys():
+            self._updateEntry(newKey, before)
+
+    def _remove(self, key, before):
+        items = self._items.pop(key, None)
+        if items is None:
+            return
+
+        self._positions.pop(key, None)
+        self.keyMapping.pop(key, None)
+        self.orgKeyToExtractedValue.pop(key, None)
+
+        for uniqueKey in self._uniqueKeys.pop(key, ()):
+            self._removeValue(uniqueKey, before)
+
+        for newKey in {newKey for newKey, _ in items}:
+            self._providers[newKey].pop(key, None)
+            self._updateEntry(newKey, before)
+
+    def _addValue(self, uniqueKey, data, before):
+        amount = self._amountOfValue.get(uniqueKey, 0)
+        if amount == 0:
+            before.setdefault(uniqueKey, _MISSING)
+            self._data[uniqueKey] = data
+        self._amountOfValue[uniqueKey] = amount + 1
+
+    def _removeValue(self, uniqueKey, before):
+        amount = self._amountOfValue[uniqueKey] - 1
+        if amount == 0:
+            before.setdefault(uniqueKey, self._data.pop(uniqueKey))
+            del self._amountOfValue[uniqueKey]
+        else:
+            self._amountOfValue[uniqueKey] = amount
+
+    def _updateEntry(self, newKey, before):
+        """ Determines the value, the amount, the conflicts and the original keys of the new key.
+        """
+        providers = self._providers.get(newKey)
+
+        if not providers:
+            self._providers.pop(newKey, None)
+            self.simplified.pop(newKey, None)
+            self.amountOf.pop(newKey, None)
+            self.keyMappingreverse.pop(newKey, None)
+            self.conflicts.pop(newKey, None)
+            if not self._byValue and newKey in self._data:
+                before.setdefault(newKey, self._data.pop(newKey))
+            return
+
+        if len(providers) > 1:
+            positions = self._positions
+            ordered = sorted(providers.items(),
+                             key=lambda item: positions[item[0]])
+        else:
+            ordered = providers.items()
+
+        values = [value for _, items in ordered for value in items]
+        first = values[0]
+        differing = [value for value in values if not (first == value)]
+
+        self.simplified[newKey] = first
+        self.amountOf[newKey] = len(values) - len(differing)
+        self.keyMappingreverse[newKey] = set(providers)
+        if differing:
+            self.conflicts[newKey] = _collect([*differing, first])
+        else:
+            self.conflicts.pop(newKey, None)
+
+        if not self._byValue:
+            before.setdefault(newKey, self._data.get(newKey, _MISSING))
+            self._data[newKey] = first
+
+    def _publish(self, before, force=False):
+        """ Updates `data` and emits the difference (`onChange`).
+        """
+        added = []
+        removed = []
+
+        for uniqueKey, previous in before.items():
+            current = self._data.get(uniqueKey, _MISSING)
+            if previous is current:
+                continue
+            if previous is not _MISSING and current is not _MISSING and previous == current:
+                continue
+            if previous is not _MISSING:
+                removed.append(previous)
+            if current is not _MISSING:
+                added.append(current)
+
+        if force or added or removed:
+            self.data.setContent(list(self._data.values()))
+            self.onChange.emit(DottedDict(
+                {'added': added, 'removed': removed}))
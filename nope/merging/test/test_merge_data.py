@@ -91,3 +91,48 @@ def test_dict_based_merge_data():
     assert "a" in merge.keyMapping
     assert "dataA" in merge.data.getContent()
     assert "keyA" in merge.simplified
+
+
+def test_dict_based_merge_data_update_key():
+    d = dict()
+    merge = DictBasedMergeData(d, "services/+", "services/+/id")
+
+    changes = []
+
+    def callback(data, *args, **kwargs):
+        changes.append((len(data.added), len(data.removed)))
+
+    merge.onChange.subscribe(callback)
+    changes.clear()
+
+    merge.updateKey("a", {"services": [{"id": "s1"}, {"id": "s2"}]})
+    assert d["a"]["services"][0]["id"] == "s1"
+    assert merge.amountOf == {"s1": 1, "s2": 1}
+    assert merge.keyMapping == {"a": {"s1", "s2"}}
+    assert changes == [(2, 0)]
+
+    merge.updateKey("b", {"services": [{"id": "s2"}]})
+    assert merge.amountOf == {"s1": 1, "s2": 2}
+    assert merge.keyMappingreverse["s2"] == {"a", "b"}
+    # Nothing has been added.
+    assert changes == [(2, 0)]
+
+    # Providing the same message again doesnt change anything.
+    merge.updateKey("b", {"services": [{"id": "s2"}]})
+    assert changes == [(2, 0)]
+
+    merge.updateKey("b", {"services": [{"id": "s2", "other": True}]})
+    assert merge.conflicts == {"s2": [{"id": "s2", "other": True}, {"id": "s2"}]}
+    assert merge.amountOf["s2"] == 1
+
+    merge.removeKey("a")
+    assert "a" not in d
+    assert merge.simplified == {"s2": {"id": "s2", "other": True}}
+    assert merge.conflicts == {}
+    assert merge.data.getContent() == [{"id": "s2", "other": True}]
+    assert changes[-1] == (1, 2)
+
+    # The result matches the full update.
+    merge.update()
+    assert merge.simplified == {"s2": {"id": "s2", "other": True}}
+    assert merge.extracted_key == ["s2"]
@@ -3,7 +3,7 @@
 # @email m.karkowski@zema.de
 
 from ..eventEmitter import NopeEventEmitter
-from ..helpers import DottedDict, ensureDottedAccess, generateId
+from ..helpers import DottedDict, FrozenDict, ensureDottedAccess, EXECUTOR
 
 
 class NopeObservable(NopeEventEmitter):
@@ -17,7 +17,7 @@ class NopeObservable(NopeEventEmitter):
 
         options.update({'showCurrent': True})
         super().__init__(options)
-        self.id = generateId()
+        self.id = EXECUTOR.idGenerator()
         self._value = None
         self._lastValue = None
         self._lastRest = None
@@ -50,17 +50,16 @@ class NopeObservable(NopeEventEmitter):
     def _informSpecificObserver(self, observer):
         if self._lastRest is not None:
             # Call the last rest
-            observer(ensureDottedAccess(
-                {"value": self._lastValue, **self._lastRest}))
+            observer(self._lastValue, self._lastRest)
 
     def _publish(self, value, options=None):
         options = ensureDottedAccess(options)
         if options.forced or not self.disablePublishing:
             options = self._updateSenderAndTimestamp(options)
-            self._lastRest = options
+            # All subscribers receive the same (immutable) options.
+            self._lastRest = FrozenDict(options)
             self._lastValue = value
-            self._emitter.emit(data=ensureDottedAccess(
-                {'value': value, **options}))
+            self._emitter.emit(None, value, self._lastRest)
             return self.hasSubscriptions
         return False
 
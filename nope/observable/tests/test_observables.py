@@ -138,3 +138,16 @@ async def test_waitFor():
         await obs.waitFor()
     except Exception as e:
         print(formatException(e))
+
+
+async def test_waitFor_timeout():
+    obs = NopeObservable()
+    obs.setContent(False)
+
+    with pytest.raises(TimeoutError):
+        await obs.waitFor(options={"timeout": 30})
+
+    # The timer of a fulfilled condition is canceled.
+    obs.setContent(True)
+    await obs.waitFor(options={"timeout": 30})
+    assert len(EXECUTOR.timers) == 0
@@ -5,7 +5,7 @@
 """
 
 from nope.eventEmitter import NopeEventEmitter
-from nope.helpers import generateId, EXECUTOR, ensureDottedAccess, formatException
+from nope.helpers import EXECUTOR, ensureDottedAccess, formatException
 from nope.plugins import plugin
 
 
@@ -71,7 +71,7 @@ def extend(bridgeMod, conManagerMod):
                 # Only if we expect a target,
                 # we will wait for the message.
                 if len(target) > 0:
-                    messageId = generateId()
+                    messageId = EXECUTOR.idGenerator()
                     data["messageId"] = messageId
 
                     def callback(msg, *args):
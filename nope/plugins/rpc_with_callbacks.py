@@ -8,9 +8,9 @@ import asyncio
 
 from nope.eventEmitter import NopeEventEmitter
 from nope.helpers import generateId, EXECUTOR, ensureDottedAccess, formatException, isAsyncFunction
+from nope.dispatcher.rpcManager.streaming import DEFAULT_WINDOW, RpcStream
 from nope.plugins import plugin
-
-_DEFAULT_RESULT = object()
+from nope.types.messages import RpcRequest, RpcResponse
 
 
 @plugin([
@@ -27,7 +27,9 @@ def extend(rpcMod, conManagerMod):
             self.defaultKeepAlive = kwargs.get(
                 "defaultKeepAlive", 60 * 60 * 1000)
 
-        async def _handleExternalRequest(self, data, func=None):
+        async def _handleExternalRequest(self, data, func=None, respond=None):
+            # Function used to send the result (see `rpcRequestBatch`).
+            respond = respond if respond is not None else self._emitResponse
             try:
                 if not callable(func):
                     if data.functionId not in self._registeredServices:
@@ -97,10 +99,7 @@ def extend(rpcMod, conManagerMod):
 
                         args[optionsOfCallback.idx] = callback
 
-                    # Perform the Task it self.
-                    _result = _DEFAULT_RESULT
-
-                    if not func.isAsync and not self.__warned and self._logger:
+                    if not (func.isAsync or func.isStream) and not self.__warned and self._logger:
                         self._logger.warn(
                             "!!! You have provided synchronous functions. They may break NoPE. Use them with care !!!")
                         self._logger.warn(
@@ -108,40 +107,8 @@ def extend(rpcMod, conManagerMod):
                         # We only want to warn the user once.
                         self.__warned = True
 
-                    resultPromise = func(*args)
-
-                    try:
-                        if resultPromise is not None and getattr(
-                                resultPromise, 'cancelCallback', False):
-                            def _cancel_main(reason):
-                                resultPromise.cancelCallback(reason)
-
-                            cbs.append(_cancel_main)
-
-                    except Exception as error:
-                        # The Cancel Function isn't available in
-                        # the provided promise.
-                        pass
-
-                    self._runningExternalRequestedTasks[data.taskId] = data.requestedBy
-
-                    # Wait for the Result to finish.
-                    _result = await resultPromise
-
-                    # Define the Result message
-                    result = {
-                        'result': _result if _result is not _DEFAULT_RESULT else None,
-                        'taskId': data.taskId,
-                        'type': 'response'
-                    }
-
-                    if self._logger:
-                        self._logger.debug(
-                            'Internally executed requested Function for Task: ' + str(data['taskId']) + " - Function \"" +
-                            data['functionId'] + '\". Sending result on ' + data['resultSink'])
-
-                    # Use the communicator to publish the result.
-                    await self._communicator.emit("rpcResponse", result)
+                    # Perform the Task it self (considering the limits of the service).
+                    await self._executeRequest(data, func, args, cbs, respond)
 
             except Exception as error:
 
@@ -152,19 +119,18 @@ def extend(rpcMod, conManagerMod):
                 else:
                     print(formatException(error))
 
-                self._runningExternalRequestedTasks.pop(data.requestedBy, None)
+                self._runningExternalRequestedTasks.pop(data.taskId, None)
 
-                result = {
-                    'error': {
+                result = RpcResponse(
+                    error={
                         'error': str(error),
                         'msg': str(error)
                     },
-                    'taskId': data.taskId,
-                    'type': 'response'
-                }
+                    taskId=data.taskId
+                )
 
                 # Use the communicator to publish the result.
-                await self._communicator.emit("rpcResponse", result)
+                await respond(result)
 
         async def _performCall(self, serviceName, params, options=None):
             optionsToUse = ensureDottedAccess({
@@ -176,13 +142,20 @@ def extend(rpcMod, conManagerMod):
             })
             optionsToUse.update(ensureDottedAccess(options))
 
-            taskId = generateId()
+            taskId = self._generateTaskId()
 
             _registeredCallbacks = []
 
             # Create a Future of the Loop.
             future = EXECUTOR.generatePromise(taskId=taskId)
 
+            stream = None
+            if optionsToUse.stream:
+                # The chunks of the result are provided by the stream.
+                stream = RpcStream(self, taskId, future,
+                                   optionsToUse.window or DEFAULT_WINDOW)
+                self._openStreams[taskId] = stream
+
             def clear():
                 if taskId in self._runningInternalRequestedTasks:
 
@@ -211,15 +184,18 @@ def extend(rpcMod, conManagerMod):
                 self._runningInternalRequestedTasks[taskId] = tastRequest
 
                 # Define the packet to send:
-                packet = {
-                    'functionId': serviceName,
-                    'params': [],
-                    'taskId': taskId,
-                    'resultSink': optionsToUse['resultSink'],
-                    'requestedBy': self._id,
-                    'target': None,
-                    'callbacks': []
-                }
+                packet = RpcRequest(
+                    functionId=serviceName,
+                    params=[],
+                    taskId=taskId,
+                    resultSink=optionsToUse['resultSink'],
+                    requestedBy=self._id,
+                    target=None,
+                    extra={'callbacks': []}
+                )
+
+                if stream is not None:
+                    packet["streamWindow"] = stream.window
 
                 callbackOptions = {
                     item.idx: item for item in optionsToUse.callbackOptions}
@@ -324,28 +300,15 @@ def extend(rpcMod, conManagerMod):
 
                     raise error
 
-                if self.options.forceUsingSelectors or self.services.amountOf.get(
-                        serviceName, 0) > 1:
-
-                    optionsForSelector = ensureDottedAccess({
-                        "rpcManager": self,
-                        "serviceName": serviceName
-                    })
-
-                    if isinstance(optionsToUse.target, str):
-                        tastRequest.target = optionsToUse.target
-                    elif callable(optionsToUse.selector):
-                        tastRequest.target = await options.selector(optionsForSelector)
-                    elif isinstance(optionsToUse.selector, str):
-                        tastRequest.target = await self._defaultSelector(optionsForSelector)
-
-                else:
-                    tastRequest.target = list(
-                        self.services.keyMappingreverse[serviceName])[0]
+                tastRequest.target = await self._selectTarget(serviceName, optionsToUse)
+                self.statistics.track(tastRequest.target, future)
 
                 packet["target"] = tastRequest.target
 
-                await self._communicator.emit("rpcRequest", packet)
+                if self._requestBatcher is not None:
+                    await self._requestBatcher.add(packet.target, packet)
+                else:
+                    await self._communicator.emit("rpcRequest", packet)
 
                 if self._logger:
                     self._logger.debug(
@@ -360,7 +323,7 @@ def extend(rpcMod, conManagerMod):
                         )
 
                     # Create our timeout and store it.
-                    tastRequest.timeout = EXECUTOR.setTimeout(
+                    tastRequest.timeout = EXECUTOR.callLater(
                         onTimeout, optionsToUse.timeout)
 
             except Exception as err:
@@ -382,6 +345,9 @@ def extend(rpcMod, conManagerMod):
 
             future.cancelCallback = _cancelTask
 
+            if stream is not None:
+                return stream
+
             if not optionsToUse.waitForResult:
                 EXECUTOR.callParallel(future)
                 return future
@@ -1,2 +1,3 @@
 from .nopeDataPubSubSystem import DataPubSubSystem
 from .nopePubSubSystem import PubSubSystem
+from .topicIndex import TopicIndex
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+from ..helpers import FrozenDict, FrozenList, compilePath, freeze
+
+_MISSING = object()
+
+
+def _isIndex(segment: str) -> bool:
+    return segment.isdigit()
+
+
+def _getChild(node, segment: str, default=_MISSING):
+    """ Helper to get the child of a node.
+    """
+    if isinstance(node, dict):
+        return node.get(segment, default)
+    if isinstance(node, list):
+        if _isIndex(segment):
+            idx = int(segment)
+            if idx < len(node):
+                return node[idx]
+        return default
+    if node is None:
+        return default
+    try:
+        return node[segment]
+    except BaseException:
+        return default
+
+
+def _assoc(node, segment: str, value):
+    """ Helper to create a copy of the node, where the child is replaced by the given value.
+        Only the node itself is copied, the other children are shared.
+    """
+    if isinstance(node, dict):
+        ret = FrozenDict(node)
+        dict.__setitem__(ret, segment, value)
+        return ret
+    if isinstance(node, list):
+        if not _isIndex(segment):
+            raise Exception(
+                f"Can not use '{segment}' as index of a list.")
+        idx = int(segment)
+        items = list(node)
+        if idx >= len(items):
+            items.extend([None] * (idx + 1 - len(items)))
+        items[idx] = value
+        return FrozenList(items)
+    raise Exception(
+        f"Can not assign the item '{segment}' of an object of type {type(node)}")
+
+
+def _dissoc(node, segment: str):
+    """ Helper to create a copy of the node, without the given child.
+    """
+    if isinstance(node, dict):
+        ret = FrozenDict(node)
+        dict.__delitem__(ret, segment)
+        return ret
+    items = list(node)
+    del items[int(segment)]
+    return FrozenList(items)
+
+
+class DataStore:
+    """ A persistent and structurally shared tree, used to store the data of a pub-sub-system.
+
+        The stored data is immutable (see `freeze`). Therefore the data can be handed out without
+        copying it. If a value is changed, only the nodes from the root to the changed path are
+        rebuilt, every other subtree is shared with the previous version of the tree. The previous
+        versions stay untouched. So every value received from the store is a consistent snapshot.
+    """
+
+    def __init__(self, data=None):
+        self._root = freeze(data if data is not None else {})
+
+    @property
+    def root(self):
+        """ The current (immutable) version of the tree.
+        """
+        return self._root
+
+    @root.setter
+    def root(self, value):
+        # Replaces the tree, for instance by a previous version.
+        self._root = freeze(value)
+
+    def get(self, path: str, default=None):
+        """ Returns the value stored at the given path.
+
+        Args:
+            path (str): The path of the value, separated by the SPLITCHAR.
+            default (any, optional): The value to return, if nothing has been found. Defaults to None.
+
+        Returns:
+            any: The stored (immutable) value.
+        """
+        if not path:
+            return self._root
+        return compilePath(path).get(self._root, default)
+
+    def has(self, path: str) -> bool:
+        return self.get(path, _MISSING) is not _MISSING
+
+    def set(self, path: str, value):
+        """ Stores the value at the given path. Missing parents are created; if the next segment
+            is an index, a list is created, otherwise a dict.
+
+        Args:
+            path (str): The path of the value, separated by the SPLITCHAR.
+            value (any): The value to store. It will be frozen.
+
+        Returns:
+            any: The stored (immutable) value.
+        """
+        value = freeze(value)
+
+        if not path:
+            self._root = value
+            return value
+
+        segments = compilePath(path).keys
+
+        # Collect the nodes of the spine.
+        spine = []
+        node = self._root
+        for segment in segments:
+            spine.append(node)
+            node = _getChild(node, segment, None)
+
+        # Rebuild the spine from the bottom to the root.
+        current = value
+        for idx in range(len(segments) - 1, -1, -1):
+            parent = spine[idx]
+            if parent is None:
+                parent = FrozenList() if _isIndex(
+                    segments[idx]) else FrozenDict()
+            current = _assoc(parent, segments[idx], current)
+
+        self._root = current
+        return value
+
+    def delete(self, path: str) -> bool:
+        """ Removes the value stored at the given path.
+
+        Args:
+            path (str): The path of the value, separated by the SPLITCHAR.
+
+        Returns:
+            bool: True, if a value has been removed.
+        """
+        if not path:
+            self._root = FrozenDict()
+            return True
+
+        segments = compilePath(path).keys
+        spine = []
+        node = self._root
+        for segment in segments:
+            spine.append(node)
+            node = _getChild(node, segment)
+            if node is _MISSING:
+                return False
+
+        current = _dissoc(spine[-1], segments[-1])
+        for idx in range(len(segments) - 2, -1, -1):
+            current = _assoc(spine[idx], segments[idx], current)
+
+        self._root = current
+        return True
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+import asyncio
+
+from ..helpers import EXECUTOR, DottedDict, formatException
+
+SAMPLE_LATEST = "latest"
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class DeliveryLimiter:
+    """ Limits the notifications of a single subscriber. The limiter is configured by the options of the subscription:
+
+        - `throttleMs`: At most one notification per window. The first change is delivered directly, the other changes
+          of the window are dropped. If `sample` is set to "latest", the latest change is delivered at the end of the window.
+        - `debounceMs`: The latest change is delivered, once no change happened for the given time.
+        - `sample` = "latest": Only the latest change is delivered. Without `throttleMs` and `debounceMs`, the changes
+          of the current iteration of the loop are merged.
+
+        Changes of different topics (for instance of a pattern based subscription) are sampled individually. The timers
+        are executed by the loop of the `EXECUTOR`. Dropped changes are neither copied nor emitted.
+    """
+
+    __slots__ = ("_callback", "_throttle", "_debounce", "_latest", "_pending", "_timer",
+                 "_trackPrevious", "_delivered", "delivered", "dropped")
+
+    def __init__(self, callback, throttleMs=None, debounceMs=None, sample=None, trackPrevious=False):
+        """ Creates the limiter.
+
+        Args:
+            callback (callable): Callback, used to deliver a change. Receives `key`, `data`, `options` and `previous`.
+            throttleMs (int, optional): The size of the throttle window in ms. Defaults to None.
+            debounceMs (int, optional): The debounce time in ms. Defaults to None.
+            sample (str, optional): "latest" to deliver the latest change. Defaults to None.
+            trackPrevious (bool, optional): If set, `previous` contains the last delivered data of the topic. Defaults to False.
+        """
+        self._callback = callback
+        self._throttle = throttleMs / 1000.0 if throttleMs else None
+        self._debounce = debounceMs / 1000.0 if debounceMs else None
+        self._latest = sample == SAMPLE_LATEST
+        self._pending = dict()
+        self._timer = None
+        self._trackPrevious = trackPrevious
+        self._delivered = dict()
+
+        self.delivered = 0
+        self.dropped = 0
+
+    @staticmethod
+    def isRequired(options) -> bool:
+        """ Checks whether the subscription options require a limiter.
+
+        Args:
+            options (DottedDict): The options of the subscription.
+
+        Returns:
+            bool: The result.
+        """
+        return bool(options.throttleMs or options.debounceMs or options.sample == SAMPLE_LATEST)
+
+    @property
+    def statistics(self) -> DottedDict:
+        return DottedDict({
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'pending': len(self._pending)
+        })
+
+    def push(self, key: str, data, options, previous=None):
+        """ Adds a change.
+
+        Args:
+            key (str): The topic of the change.
+            data (any): The data.
+            options (dict-like): The options of the notification.
+            previous (any, optional): The data before the change. Defaults to None.
+        """
+        pending = self._pending.get(key)
+        if pending is not None:
+            # The pending change is replaced. The delta
+            # must be related to its previous data.
+            self.dropped += 1
+            previous = pending[2]
+
+        loop = EXECUTOR.loop
+
+        if self._debounce is not None:
+            self._pending[key] = (data, options, previous)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = loop.call_later(self._debounce, self.flush)
+
+        elif self._throttle is not None:
+            if self._timer is None:
+                # No window is active => deliver the change.
+                self._deliver(key, data, options, previous)
+                self._timer = loop.call_later(
+                    self._throttle, self._onEndOfWindow)
+            elif self._latest:
+                self._pending[key] = (data, options, previous)
+            else:
+                self.dropped += 1
+
+        else:
+            self._pending[key] = (data, options, previous)
+            if self._timer is None:
+                self._timer = loop.call_soon(self.flush)
+
+    def flush(self):
+        """ Delivers all pending changes.
+        """
+        self._timer = None
+        pending = self._pending
+        self._pending = dict()
+        for key, (data, options, previous) in pending.items():
+            self._deliver(key, data, options, previous)
+
+    def dispose(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.dropped += len(self._pending)
+        self._pending.clear()
+        self._delivered.clear()
+
+    def _onEndOfWindow(self):
+        self._timer = None
+        if self._pending:
+            self.flush()
+            # The delivery at the end of the window starts a new one.
+            self._timer = EXECUTOR.loop.call_later(
+                self._throttle, self._onEndOfWindow)
+
+    def _deliver(self, key, data, options, previous):
+        if self._trackPrevious:
+            previous = self._delivered.get(key, previous)
+            self._delivered[key] = data
+        self.delivered += 1
+        self._callback(key, data, options, previous)
+
+
+class QueuedDelivery:
+    """ Delivers the notifications of a single subscriber asynchronously. The notifications are stored
+        in a bounded `asyncio.Queue`, which is drained by a dedicated task on the loop of the `EXECUTOR`
+        (the task only exists while notifications are pending).
+        Therefore a slow subscriber neither blocks the publisher nor the other subscribers. The queue is
+        configured by the options of the subscription:
+
+        - `bufferSize`: The size of the queue.
+        - `overflow`: The policy, if the queue is full:
+            - "drop-oldest": The oldest notification is dropped (default).
+            - "drop-newest": The new notification is dropped.
+            - "block": The publisher delivers the oldest notification itself, before the new one is added.
+              Nothing is dropped, but the publisher is slowed down by the subscriber.
+    """
+
+    __slots__ = ("_callback", "_queue", "_overflow", "_task", "delivered", "dropped",
+                 "blocked", "maxDepth", "lagMs", "maxLagMs")
+
+    def __init__(self, callback, bufferSize=100, overflow=DROP_OLDEST):
+        """ Creates the queue.
+
+        Args:
+            callback (callable): Callback, used to deliver a notification. Receives `data` and `options`.
+            bufferSize (int, optional): The size of the queue. Defaults to 100.
+            overflow (str, optional): The overflow policy. Defaults to "drop-oldest".
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise Exception(
+                f"Invalid overflow policy '{overflow}'. Valid values are: {', '.join(OVERFLOW_POLICIES)}")
+
+        self._callback = callback
+        self._queue = asyncio.Queue(maxsize=max(int(bufferSize), 1))
+        self._overflow = overflow
+        self._task = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.maxDepth = 0
+        self.lagMs = 0
+        self.maxLagMs = 0
+
+    @staticmethod
+    def isRequired(options) -> bool:
+        """ Checks whether the subscription options require a queue.
+
+        Args:
+            options (DottedDict): The options of the subscription.
+
+        Returns:
+            bool: The result.
+        """
+        return options.bufferSize is not None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def statistics(self) -> DottedDict:
+        return DottedDict({
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'blocked': self.blocked,
+            'depth': self.depth,
+            'maxDepth': self.maxDepth,
+            'lagMs': self.lagMs,
+            'maxLagMs': self.maxLagMs
+        })
+
+    def push(self, data, options):
+        """ Adds a notification to the queue.
+
+        Args:
+            data (any): The data.
+            options (dict-like): The options of the notification.
+        """
+        loop = EXECUTOR.loop
+        queue = self._queue
+
+        if queue.full():
+            if self._overflow == DROP_NEWEST:
+                self.dropped += 1
+                return
+            item = queue.get_nowait()
+            queue.task_done()
+            if self._overflow == DROP_OLDEST:
+                self.dropped += 1
+            else:
+                self.blocked += 1
+                self._deliver(loop, *item)
+
+        queue.put_nowait((data, options, loop.time()))
+
+        if queue.qsize() > self.maxDepth:
+            self.maxDepth = queue.qsize()
+
+        if self._task is None:
+            self._task = loop.create_task(self._drain())
+
+    async def join(self):
+        """ Waits until all notifications have been delivered.
+        """
+        await self._queue.join()
+
+    def dispose(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+
+    async def _drain(self):
+        # The task ends, if the queue is empty. It will
+        # be restarted by the next notification.
+        loop = EXECUTOR.loop
+        queue = self._queue
+        try:
+            while not queue.empty():
+                item = queue.get_nowait()
+                try:
+                    self._deliver(loop, *item)
+                finally:
+                    queue.task_done()
+                # Give the other tasks the chance to run.
+                await asyncio.sleep(0)
+        finally:
+            self._task = None
+
+    def _deliver(self, loop, data, options, enqueued):
+        self.lagMs = (loop.time() - enqueued) * 1000.0
+        if self.lagMs > self.maxLagMs:
+            self.maxLagMs = self.lagMs
+        self.delivered += 1
+        try:
+            self._callback(data, options)
+        except Exception as error:
+            print(formatException(error))
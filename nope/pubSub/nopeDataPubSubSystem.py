@@ -1,19 +1,22 @@
-from .nopePubSubSystem import PubSubSystem
-from ..helpers import copy, containsWildcards, ensureDottedAccess, MULTI_LEVEL_WILDCARD, flattenObject, \
-    comparePatternAndPath
+from contextlib import contextmanager
+
+from .dataStore import DataStore
+from .nopePubSubSystem import PubSubSystem, _mergeChildPaths
+from ..helpers import containsWildcards, ensureDottedAccess, MULTI_LEVEL_WILDCARD, iterQueryAttr
 
 
 class DataPubSubSystem(PubSubSystem):
 
-    def __init__(self, options={}):
-        super().__init__(options)
+    def __init__(self, options=None):
+        super().__init__(**ensureDottedAccess(options))
         self._sendCurrentDataOnSubscription = True
 
     @property
     def data(self):
-        # A Getter to return a COPY of the item. Outside of the system,
-        # you'll never receive the original object.
-        return copy(self._data)
+        # A Getter to return the current snapshot of the data. The data
+        # is immutable, so there is no need to copy it. Use `thaw` to
+        # receive a mutable copy.
+        return self._data.root
 
     def pushData(self, path: str, content, options=None):
         """ Function, to push data. Every subscriber will be informed, if pushing the data on the
@@ -27,8 +30,140 @@ class DataPubSubSystem(PubSubSystem):
         options = ensureDottedAccess(options)
         return self._pushData(path, path, content, options)
 
+    def pushMany(self, changes: dict, options=None):
+        """ Pushes multiple values at once. All values are stored, afterwards every subscriber is
+            informed once (see `transaction`).
+
+        Args:
+            changes (dict): The values to push. The keys are the paths, the values the content.
+            options (dict-like, optional): The Options, that will be forwarded to subscribers. Defaults to None.
+        """
+        options = ensureDottedAccess(options)
+        with self.transaction():
+            for path, content in changes.items():
+                self._pushData(path, path, content, options)
+
+    @contextmanager
+    def transaction(self):
+        """ Context manager to group multiple pushes. The data is changed directly, but the subscribers
+            are informed once the block has been left: every affected subscription is evaluated once,
+            each subscriber receives a single (merged) notification and only one `onIncrementalDataChange`
+            event (containing the list `changes`) is emitted. Nested transactions are merged into the
+            outer one. If an exception is raised, all changes of the transaction are discarded.
+
+            >>> with dataDistributor.transaction():
+            ...     dataDistributor.pushData("plc/temperature", 20)
+            ...     dataDistributor.pushData("plc/pressure", 1.2)
+        """
+        if self._transaction is not None:
+            yield self
+            return
+
+        snapshot = self._data.root
+        self._transaction = changes = []
+
+        try:
+            yield self
+        except BaseException:
+            # Restore the previous version of the data.
+            self._data.root = snapshot
+            raise
+        finally:
+            self._transaction = None
+
+        self._commitTransaction(changes, snapshot)
+
+    def _commitTransaction(self, changes: list, previousRoot=None):
+        """ Informs the subscribers about the changes of a transaction.
+
+        Args:
+            changes (list): The changes as tuple of `pathOfContent`, `pathOfChange`, `data`, `options`, `quiet`, `emitter`.
+            previousRoot (any, optional): The data before the transaction. Defaults to None.
+        """
+        if not changes:
+            return
+
+        self._notifyMany([
+            (pathOfContent, pathOfChange, options, emitter)
+            for pathOfContent, pathOfChange, _, options, _, emitter in changes
+        ], previousRoot)
+
+        if self._options.delivery == "delta":
+            # The delta of a path already contains the changes of its childs.
+            paths = dict()
+            latest = None
+            for idx, (pathOfContent, _, _, options, quiet, _) in enumerate(changes):
+                if not quiet:
+                    paths.setdefault(pathOfContent, []).append((idx, options))
+                    latest = options
+
+            deltas = [
+                {'path': path, 'delta': self._deltaOf(
+                    previousRoot, path, self._data.get(path))}
+                for path in _mergeChildPaths(paths)
+            ]
+
+            if len(deltas) == 1:
+                self.onIncrementalDataChange.emit(ensureDottedAccess({
+                    **deltas[0],
+                    **latest
+                }))
+            elif deltas:
+                self.onIncrementalDataChange.emit(ensureDottedAccess({
+                    **latest,
+                    'changes': deltas
+                }))
+            return
+
+        # Only the latest value of a path is relevant. Because the
+        # order of the changes matters, a value which is pushed again
+        # is moved to the end.
+        incremental = dict()
+        for pathOfContent, _, data, options, quiet, _ in changes:
+            if not quiet:
+                incremental.pop(pathOfContent, None)
+                incremental[pathOfContent] = (data, options)
+
+        if len(incremental) == 1:
+            path, (data, options) = incremental.popitem()
+            self.onIncrementalDataChange.emit(ensureDottedAccess({
+                'path': path,
+                'data': data,
+                **options
+            }))
+        elif incremental:
+            options = next(reversed(incremental.values()))[1]
+            self.onIncrementalDataChange.emit(ensureDottedAccess({
+                **options,
+                'changes': [
+                    {'path': path, 'data': data} for path, (data, _) in incremental.items()
+                ]
+            }))
+
+    def applyDelta(self, path: str, delta, options=None):
+        """ Applies a leaf-level difference (see `getLeafDiff`) to the data stored at the given path.
+            Afterwards the subscribers are informed like using `pushData`.
+
+        Args:
+            path (str): The path, the delta is related to.
+            delta (dict-like): The delta, containing `added`, `changed` and `removed`.
+            options (dict-like, optional): The Options, that will be forwarded to subscribers. Defaults to None.
+        """
+        options = ensureDottedAccess(options)
+        delta = ensureDottedAccess(delta)
+
+        # Only the changed parts of the data are rebuilt.
+        store = DataStore(self._pullData(path, None))
+        for removed in delta.removed or []:
+            store.delete(removed)
+        for changes in (delta.added, delta.changed):
+            for key, value in (changes or {}).items():
+                store.set(key, value)
+
+        return self._pushData(path, path, store.root, options)
+
     def pullData(self, path: str, default=None):
-        """ Pull some Data of System. You will allways receive a just a copy. This method prevents you
+        """ Pull some Data of System. You will allways receive an immutable snapshot. This method prevents you
             to use a pattern like path. If you want to use patterns please use the "patternbasedPullData"
 
         Args:
@@ -55,19 +190,18 @@ class DataPubSubSystem(PubSubSystem):
         return self._patternbasedPullData(pattern, default)
 
     def patternBasedPush(self, pattern: str, data, options=None, fast=False):
-        """
+        """ Pushes the data to every existing path, which matches the pattern. Only
+            single-level wildcards (`+`) are allowed. The subscribers are informed
+            once (see `transaction`).
 
         Args:
-            pattern (str): The P
-            data (any): _description_
+            pattern (str): The pattern, selecting the paths.
+            data (any): The data to push.
             options (dict-like, optional): Additional Event-Date like `timestamp`, `sender`, ... . Defaults to None.
-            fast (bool, optional):  Flag to emit single changes or all changes. Defaults to False.
+            fast (bool, optional): If set, only a single `onIncrementalDataChange`, containing the pattern, is emitted. Defaults to False.
 
         Raises:
-            Exception: _description_
-
-        Returns:
-            _type_: _description_
+            Exception: If the pattern contains multi-level wildcards.
         """
 
         options = ensureDottedAccess(options)
@@ -75,15 +209,18 @@ class DataPubSubSystem(PubSubSystem):
         # To extract the data based on a Pattern,
         # we firstly, we check if we would affect the data.
         if not containsWildcards(pattern):
-            return self.pushData(pattern, pattern, data, options)
+            return self.pushData(pattern, data, options)
         if MULTI_LEVEL_WILDCARD in pattern:
             raise Exception(
                 'You can only use single-level wildcards in self action')
-        flatten_data = flattenObject(self.data)
-        options = self.updateOptions(options)
-        for path in flatten_data.keys():
-            if comparePatternAndPath(pattern, path).affectedOnSameLevel:
-                self.pushData(path, pattern, data, options, fast)
+
+        options = self._updateOptions(options)
+
+        # The root is immutable. So we can push the data,
+        # while iterating over the matching paths.
+        with self.transaction():
+            for path, _ in iterQueryAttr(self._data.root, pattern):
+                self._pushData(path, pattern, data, options, fast)
 
         if fast:
             # Its better for us, to just store the incremental changes
@@ -1,39 +1,17 @@
+from functools import partial
+
 from ..eventEmitter import NopeEventEmitter
-from ..helpers import comparePatternAndPath, copy, generateId, DottedDict, ensureDottedAccess, rgetattr, \
-    containsWildcards, getTimestamp, isIterable, rsetattr, flattenObject
+from ..helpers import generateId, DottedDict, ensureDottedAccess, containsWildcards, getTimestamp, isIterable, \
+    iterQueryAttr, getLeafDiff, PatternMatchCache, MATCH_CACHE, SPLITCHAR
 from ..merging import DictBasedMergeData
+from .dataStore import DataStore
+from .delivery import DeliveryLimiter, QueuedDelivery
+from .topicIndex import TopicIndex
 
 DEFAULT_OBJ = object()
 LAZY_UPDATE = True  # Way faster
 
 
-def _memoizedCompare(matchTopicsWithoutWildcards: bool):
-    """ Helper to memoize the
-
-    Args:
-        options (bool): Flag to match topics with or without a wildcard
-
-    Returns:
-        callable: a Function that stores the results.
-    """
-    cache = {}
-
-    def ret(pattern, path):
-        nonlocal cache
-        nonlocal matchTopicsWithoutWildcards
-
-        key = f'{pattern}-{path}'
-
-        if key not in cache:
-            cache[key] = comparePatternAndPath(pattern, path, {
-                'matchTopicsWithoutWildcards': matchTopicsWithoutWildcards
-            })
-
-        return cache[key]
-
-    return ret
-
-
 def _extractPubAndSubTopic(options: DottedDict):
     """ Helper to extract the pub and sub topic based on the provided options
 
@@ -58,17 +36,81 @@ def _extractPubAndSubTopic(options: DottedDict):
     return subTopic, pubTopic
 
 
+def _isEmptyDelta(delta) -> bool:
+    return not (delta.added or delta.changed or delta.removed)
+
+
+def _mergeChildPaths(paths: dict) -> dict:
+    """ Helper to merge the changes of paths into the changes of their parents (if present).
+
+    Args:
+        paths (dict): path -> list of (index, change)
+
+    Returns:
+        dict: path -> list of (index, change), without the child paths.
+    """
+    if len(paths) == 1:
+        return paths
+
+    ret = dict()
+    for path in sorted(paths, key=len):
+        parent = None
+        if path:
+            if '' in ret:
+                parent = ''
+            else:
+                segments = path.split(SPLITCHAR)
+                for idx in range(1, len(segments)):
+                    candidate = SPLITCHAR.join(segments[:idx])
+                    if candidate in ret:
+                        parent = candidate
+                        break
+        if parent is None:
+            ret[path] = list(paths[path])
+        else:
+            ret[parent].extend(paths[path])
+    return ret
+
+
+def _mergedOptions(changes: list, topicOfSubscription: str) -> DottedDict:
+    """ Helper to create the options of a merged notification. The latest change is used.
+
+    Args:
+        changes (list): The merged changes as (index, change). A change is a tuple of `topicOfContent`, `topicOfChange`, `options` and `emitter`.
+        topicOfSubscription (str): The topic of the subscriber.
+
+    Returns:
+        DottedDict: The options.
+    """
+    changes = [change for _, change in sorted(changes, key=lambda item: item[0])]
+    topicOfContent, topicOfChange, options, _ = changes[-1]
+    topicsOfChange = []
+    for change in changes:
+        if change[1] not in topicsOfChange:
+            topicsOfChange.append(change[1])
+    return ensureDottedAccess({
+        **options,
+        'topicOfChange': topicOfChange,
+        'topicOfContent': topicOfContent,
+        'topicOfSubscription': topicOfSubscription,
+        'topicsOfChange': topicsOfChange
+    })
+
+
 class PubSubSystem:
 
     def __init__(self, mqttPatternBasedSubscriptions=True, forwardChildData=True,
-                 forwardParentData=True, matchTopicsWithoutWildcards=True, **kwargs):
+                 forwardParentData=True, matchTopicsWithoutWildcards=True, matchCache: PatternMatchCache = None,
+                 delivery="full", **kwargs):
 
         # Adapt the Options
         self._options = ensureDottedAccess({
             'mqttPatternBasedSubscriptions': mqttPatternBasedSubscriptions,
             'forwardChildData': forwardChildData,
             'forwardParentData': forwardParentData,
-            'matchTopicsWithoutWildcards': matchTopicsWithoutWildcards
+            'matchTopicsWithoutWildcards': matchTopicsWithoutWildcards,
+            # "full" or "delta". Determines the content of `onIncrementalDataChange`
+            'delivery': delivery
         })
 
         self._sendCurrentDataOnSubscription = False
@@ -77,21 +119,71 @@ class PubSubSystem:
         self._emitters = dict()
         self._emittersToObservers = dict()
 
+        # Subscribers, which want to receive the difference
+        # instead of the data (option `delivery` = "delta").
+        self._deltaEmitters = set()
+
+        # Limiters of the subscribers, using the options
+        # `throttleMs`, `debounceMs` or `sample`.
+        self._limiters = dict()
+        # Queues of the subscribers, using asynchronous delivery
+        # (options `bufferSize` and `overflow`)
+        self._queues = dict()
+        self._retiredDeliveryStatistics = DottedDict({
+            'delivered': 0,
+            'dropped': 0
+        })
+
         self._matched = dict()
         self._disposing = False
 
-        self._comparePatternAndPath = _memoizedCompare(self._options)
+        # Indices used to determine the matching of subscriptions and
+        # topics. These are used to maintain `_matched` incrementally.
+        self._subscriptionIndex = TopicIndex()
+        self._publishedTopics = TopicIndex()
+        self._matchedEntriesOfEmitter = dict()
+
+        # The cache for the results of the pattern matching. By default, we
+        # share the cache with the other systems and the dispatcher.
+        if matchCache is None:
+            if self._options.matchTopicsWithoutWildcards == MATCH_CACHE.matchTopicsWithoutWildcards:
+                matchCache = MATCH_CACHE
+            else:
+                matchCache = PatternMatchCache(
+                    matchTopicsWithoutWildcards=self._options.matchTopicsWithoutWildcards)
+
+        self.matchCache = matchCache
+        self._comparePatternAndPath = matchCache.compare
         self.subscriptions = DictBasedMergeData(self._emitters, 'subTopic')
         self.publishers = DictBasedMergeData(self._emitters, 'pubTopic')
         self.onIncrementalDataChange = NopeEventEmitter()
 
-        self._data = ensureDottedAccess({}, useNoneAsDefaultValue=False)
+        # The data is stored in a persistent tree. Therefore we are able
+        # to hand out the (immutable) data without copying it.
+        self._data = DataStore()
+
+        # If a transaction is active, this list contains the pending
+        # changes. The subscribers are informed once the transaction
+        # has been committed (see `DataPubSubSystem.transaction`).
+        self._transaction = None
 
     @property
     def options(self):
         return self._options.copy()
 
     def register(self, emitter, options):
+        """ Registers an emitter.
+
+        Args:
+            emitter (NopeEventEmitter): The emitter to register.
+            options (dict-like): The options. Contains the `topic` (str or dict with `publish` and `subscribe`), the `mode`
+                                 and the `schema`. If `delivery` is set to "delta", the subscriber receives the leaf-level
+                                 difference (see `getLeafDiff`) instead of the data. A subscriber of a pattern receives
+                                 the delta of every matching item on its own. The notifications can be limited by
+                                 `throttleMs`, `debounceMs` and `sample` (see `DeliveryLimiter`). If `bufferSize` is set,
+                                 the notifications are delivered asynchronously using a queue with the given size and the
+                                 `overflow` policy (see `QueuedDelivery`).
+        """
 
         options = ensureDottedAccess(options)
 
@@ -131,9 +223,10 @@ class PubSubSystem:
                     if opts.pubSubUpdate:
                         return
 
-                    # We use this callback to forward the data into the system:
+                    # We use this callback to forward the data into the system.
+                    # The received options are immutable, so we use a copy.
                     self._pushData(pubTopic, pubTopic,
-                                   content, opts, False, emitter)
+                                   content, ensureDottedAccess(opts), False, emitter)
 
                 callback = callbackToAssign
 
@@ -142,6 +235,11 @@ class PubSubSystem:
                 {'options': options, 'pubTopic': pubTopic, 'subTopic': subTopic, 'callback': callback,
                  'observer': observer})
 
+            if options.delivery == "delta":
+                self._deltaEmitters.add(emitter)
+
+            self._updateDelivery(emitter, options)
+
             # Update the Matching Rules.
             global LAZY_UPDATE
             if (LAZY_UPDATE):
@@ -162,8 +260,10 @@ class PubSubSystem:
                     for item in self._patternbasedPullData(subTopic, None):
                         # We check if the content is available
                         if item.get("data", False):
-                            emitter.emit(
-                                item.data,
+                            self._emit(
+                                emitter,
+                                self._deltaOf(None, item["path"], item.data)
+                                if emitter in self._deltaEmitters else item.data,
                                 ensureDottedAccess({
                                     'sender': self.id,
                                     'topicOfContent': item["path"],
@@ -174,8 +274,10 @@ class PubSubSystem:
                 else:
                     currentContent = self._pullData(subTopic, None)
                     if currentContent is not None:
-                        emitter.emit(
-                            currentContent,
+                        self._emit(
+                            emitter,
+                            self._deltaOf(None, subTopic, currentContent)
+                            if emitter in self._deltaEmitters else currentContent,
                             ensureDottedAccess({
                                 'sender': self.id,
                                 'topicOfContent': subTopic,
@@ -206,6 +308,13 @@ class PubSubSystem:
             data.subTopic = subTopic
             data.pubTopic = pubTopic
 
+            if options.delivery == "delta":
+                self._deltaEmitters.add(emitter)
+            else:
+                self._deltaEmitters.discard(emitter)
+
+            self._updateDelivery(emitter, options)
+
             self._emitters[emitter] = data
 
             if (LAZY_UPDATE):
@@ -219,13 +328,20 @@ class PubSubSystem:
 
     def unregister(self, emitter):
         if emitter in self._emitters:
-            options = self._emitters.pop(emitter)
-            subTopic, pubTopic = _extractPubAndSubTopic(options["options"])
+            data = self._emitters.pop(emitter)
+            self._deltaEmitters.discard(emitter)
+            self._removeDelivery(emitter)
+
+            # Remove our callback, otherwise the emitter
+            # would still push data into the system.
+            observer = self._emittersToObservers.pop(emitter, None)
+            if observer is not None:
+                observer.unsubscribe()
 
             if (LAZY_UPDATE):
                 # Update the Matching Rules.
                 self._updatePartialMatching(
-                    "remove", emitter, pubTopic, subTopic)
+                    "remove", emitter, data.pubTopic, data.subTopic)
             else:
                 # Update the Matching Rules.
                 self.updateMatching()
@@ -233,13 +349,46 @@ class PubSubSystem:
             return True
         return False
 
-    def registerSubscription(self, topic, subscription):
+    def registerSubscription(self, topic, subscription, options=None):
+        """ Helper to subscribe to a topic using a callback.
+
+        Args:
+            topic (str): The topic to subscribe.
+            subscription (callable): The callback.
+            options (dict-like, optional): Additional options of the subscription (see `register`). Defaults to None.
+
+        Returns:
+            Observer: The observer of the subscription.
+        """
         emitter = NopeEventEmitter()
         observer = emitter.subscribe(subscription)
-        self.register(emitter, {'mode': 'subscribe',
+        self.register(emitter, {**ensureDottedAccess(options), 'mode': 'subscribe',
                                 'schema': {}, 'topic': topic})
         return observer
 
+    @property
+    def deliveryStatistics(self) -> DottedDict:
+        """ The number of delivered and dropped notifications of the subscribers, using the options
+            `throttleMs`, `debounceMs`, `sample` or `bufferSize`. For subscribers using a queue, the
+            statistics contain the entry `queue` with the depth and the lag of the queue.
+
+        Returns:
+            DottedDict: Contains the totals `delivered` and `dropped` and the statistics of every subscriber.
+        """
+        ret = DottedDict({
+            **self._retiredDeliveryStatistics,
+            'subscribers': []
+        })
+        for emitter in dict.fromkeys([*self._limiters, *self._queues]):
+            statistics = self._deliveryStatisticsOf(emitter)
+            ret.delivered += statistics.delivered
+            ret.dropped += statistics.dropped
+            ret.subscribers.append(DottedDict({
+                'topic': self._emitters[emitter].subTopic,
+                **statistics
+            }))
+        return ret
+
     @property
     def emitters(self):
         # TODO:
@@ -248,6 +397,13 @@ class PubSubSystem:
     def updateMatching(self):
 
         self._matched.clear()
+        self._matchedEntriesOfEmitter.clear()
+        self._subscriptionIndex.clear()
+        self._publishedTopics.clear()
+
+        for emitter, item in self._emitters.items():
+            if item.subTopic is not False:
+                self._subscriptionIndex.add(item.subTopic, emitter)
 
         for item in self._emitters.values():
             # Extract the publisher topic
@@ -256,60 +412,28 @@ class PubSubSystem:
             if pubTopic is not False:
                 self._updateMatchingForTopic(pubTopic)
 
+            if item.subTopic is not False and not containsWildcards(
+                    item.subTopic):
+                self._updateMatchingForTopic(item.subTopic)
+
         self.subscriptions.update()
         self.publishers.update()
 
-    def _addMatchingEntryIfRequired(self, pubTopic, subTopic, emitter):
-        result = self._comparePatternAndPath(subTopic, pubTopic)
-        if result.affected:
-            if not result.containsWildcards and ((result.affectedByChild and not self.options.forwardChildData) or
-                                                 (
-                result.affectedByParent and not self.options.forwardParentData)
-            ):
-                return
-
-            # We now have match the topic as following described:
-            # 1) subscription contains a pattern
-            #    - dircet change (same-level) => content
-            #    - parent based change => content
-            #    - child based change => content
-            # 2) subscription doesnt contains a pattern:
-            #    We more or less want the data on the path.
-            #    - direct change (topic = path) => content
-            #    - parent based change => a super change
-            if result.containsWildcards:
-                if self.options.mqttPatternBasedSubscriptions:
-                    if result.patternToExtractData is not False:
-                        self._addToMatchingStructure(
-                            'dataQuery', pubTopic, result.patternToExtractData, emitter)
-                    elif result.pathToExtractData is not False:
-                        self._addToMatchingStructure(
-                            'dataPull', pubTopic, result.pathToExtractData, emitter)
-                    else:
-                        raise Exception(
-                            'Implementation Error. Either the patternToExtractData or the pathToExtractData must be provided')
-                else:
-                    self._addToMatchingStructure(
-                        'dataQuery', pubTopic, pubTopic, emitter)
-            else:
-                if result.affectedByChild and not self.options.forwardChildData or result.affectedByParent and not self.options.forwardParentData:
-                    return
-                if result.pathToExtractData is not False:
-                    self._addToMatchingStructure(
-                        'dataPull', pubTopic, result.pathToExtractData, emitter)
-                else:
-                    raise Exception(
-                        "Implementation Error. The 'pathToExtractData' must be provided")
-
-    def __deleteMatchingEntry(self, _pubTopic: str, _subTopic: str, _emitter):
-        if _pubTopic in self._matched:
-            data = self._matched[_pubTopic]
+    def __deleteMatchingEntries(self, _emitter):
+        """ Removes every entry of the emitter in the matching structure.
 
-            if _subTopic in data.dataPull:
-                data.dataPull[_subTopic].remove(_emitter)
-
-            if _subTopic in data.dataQuery:
-                data.dataQuery[_subTopic].remove(_emitter)
+        Args:
+            _emitter (NopeEventEmitter): The emitter to remove.
+        """
+        for topicOfChange, entry, path_or_pattern in self._matchedEntriesOfEmitter.pop(_emitter, ()):
+            data = self._matched.get(topicOfChange)
+            if data is None:
+                continue
+            emitters = data[entry].get(path_or_pattern)
+            if emitters is not None:
+                emitters.discard(_emitter)
+                if not emitters:
+                    data[entry].pop(path_or_pattern)
 
     def __addMatchingEntryIfRequired(self, pubTopic, subTopic, emitter):
         # Now lets determine the Path
@@ -379,61 +503,47 @@ class PubSubSystem:
 
     def _updatePartialMatching(
             self, mode: str, _emitter, _pubTopic: str | bool, _subTopic: str | bool):
-        consideredPublishedTopics = set()
-
-        if _subTopic is not False:
-            # Iterate through all Publishers and
-            for item in self._emitters.values():
-                # Extract the Pub-Topic
-                pubTopicOfOtherEmitter = item.pubTopic
-
-                if pubTopicOfOtherEmitter is not False and not (
-                        pubTopicOfOtherEmitter in consideredPublishedTopics):
-                    # Now, lets Update the Matching for the specific Topics.
-                    if (mode == "remove"):
-                        self.__deleteMatchingEntry(
-                            pubTopicOfOtherEmitter,
-                            _subTopic,
-                            _emitter
-                        )
-                    elif (mode == "add"):
-                        self.__addMatchingEntryIfRequired(
-                            pubTopicOfOtherEmitter,
-                            _subTopic,
-                            _emitter
-                        )
+        """ Updates the matching structure for the given emitter. Instead of comparing the topics
+            with every registered emitter, we use our topic indices. Therefore only the affected
+            topics and subscriptions are considered.
 
-                # Add this topic to the topics,
-                # that have already been checked.
-                consideredPublishedTopics.add(pubTopicOfOtherEmitter)
-
-            # Additionally, we test for the allready published events:
-            for topic in self._matched.keys():
-                # we only test already published topics:
-                if not topic in consideredPublishedTopics and not containsWildcards(
-                        topic):
-
-                    if (mode == "remove"):
-                        self.__deleteMatchingEntry(topic, _subTopic, _emitter)
-                    elif (mode == "add"):
-                        self.__addMatchingEntryIfRequired(
-                            topic, _subTopic, _emitter)
+        Args:
+            mode (str): Either "add" or "remove"
+            _emitter (NopeEventEmitter): The emitter
+            _pubTopic (str | bool): The topic used for publishing. False if not publishing.
+            _subTopic (str | bool): The topic used for subscribing. False if not subscribing.
+        """
+        if (mode == "remove"):
+            self.__deleteMatchingEntries(_emitter)
 
-                    consideredPublishedTopics.add(topic)
+            if _subTopic is not False:
+                self._subscriptionIndex.remove(_subTopic, _emitter)
 
-        if (mode == "add"):
-            if (_pubTopic is not False):
+        elif (mode == "add"):
+            if _pubTopic is not False:
                 self._updateMatchingForTopic(_pubTopic)
 
-        if (_subTopic is not False and not containsWildcards(_subTopic)):
-            self.__addMatchingEntryIfRequired(_subTopic, _subTopic, _emitter)
+            if _subTopic is not False:
+                self._subscriptionIndex.add(_subTopic, _emitter)
 
-        elif (mode == "remove"):
-            if (_subTopic is not False):
-                self.__deleteMatchingEntry(_subTopic, _subTopic, _emitter)
+                # A subscription without wildcards is a
+                # topic of content as well.
+                if not containsWildcards(_subTopic):
+                    self._updateMatchingForTopic(_subTopic)
 
-        self.publishers.update()
-        self.subscriptions.update()
+                # Test the already known topics, which
+                # might be affected by the subscription.
+                for topic, _ in self._publishedTopics.topicsMatching(_subTopic):
+                    self.__addMatchingEntryIfRequired(
+                        topic, _subTopic, _emitter)
+
+        # Only the entries of the emitter are adapted.
+        if _emitter in self._emitters:
+            self.publishers.updateKey(_emitter, self._emitters[_emitter])
+            self.subscriptions.updateKey(_emitter, self._emitters[_emitter])
+        else:
+            self.publishers.removeKey(_emitter)
+            self.subscriptions.removeKey(_emitter)
 
     def emit(self, eventName, data, options=None):
         return self._pushData(eventName, eventName, data,
@@ -442,7 +552,7 @@ class PubSubSystem:
     async def dispose(self):
         self._disposing = True
 
-        for emitter in self._emitters:
+        for emitter in list(self._emitters):
             self.unregister(emitter)
 
         self.onIncrementalDataChange.dispose()
@@ -460,23 +570,38 @@ class PubSubSystem:
         self._matched.get(topicOfChange)[entry].get(
             path_or_pattern).add(emitter)
 
+        # Store the entry, so that we are able to remove it later.
+        if emitter not in self._matchedEntriesOfEmitter:
+            self._matchedEntriesOfEmitter[emitter] = set()
+        self._matchedEntriesOfEmitter[emitter].add(
+            (topicOfChange, entry, path_or_pattern))
+
     def _updateMatchingForTopic(self, topicOfChange):
-        if topicOfChange not in self._matched:
-            self._matched[topicOfChange] = ensureDottedAccess(
-                {
-                    'dataPull': {},
-                    'dataQuery': {}
-                }
-            )
+        """ Ensures, that the matching of the topic is present. Afterwards the matching is
+            maintained incrementally, during registering and unregistering emitters.
+
+        Args:
+            topicOfChange (str): The topic.
+        """
+        if topicOfChange in self._matched:
+            return
+
+        self._matched[topicOfChange] = ensureDottedAccess(
+            {
+                'dataPull': {},
+                'dataQuery': {}
+            }
+        )
+        self._publishedTopics.add(topicOfChange)
 
         # Find all matches
-        for emitter, item in self._emitters.items():
-            if item.subTopic is not False:
-                self._addMatchingEntryIfRequired(
-                    topicOfChange, item.subTopic, emitter)
+        for pattern, emitters in self._subscriptionIndex.patternsMatching(topicOfChange):
+            for emitter in emitters:
+                self.__addMatchingEntryIfRequired(
+                    topicOfChange, pattern, emitter)
 
     def _notify(self, topicOfContent: str, topicOfChange: str,
-                options, emitterCausingUpdate=None):
+                options, emitterCausingUpdate=None, previousRoot=None):
         """ Internal Function to _notify all subscribers
 
         Args:
@@ -484,6 +609,7 @@ class PubSubSystem:
             topicOfChange (str): _description_
             options (dict-like): _description_
             _emitter (Emitter, optional): _description_. Defaults to None.
+            previousRoot (any, optional): The data before the change. Used to determine the delta. Defaults to None.
         """
         if self._disposing:
             return
@@ -497,16 +623,38 @@ class PubSubSystem:
 
         for path_to_pull, emitters in referenceToMatch.dataPull.items():
 
+            # The data is immutable, so every emitter
+            # is able to receive the same snapshot.
+            data = self._pullData(path_to_pull, None)
+            delta = None
+
             for emitter in emitters:
                 # Only if we want to _notify an exclusive emitter we
                 # have to continue, if our emitter isnt matched.
                 if emitterCausingUpdate is not None and emitterCausingUpdate == emitter:
                     continue
 
-                data = self._pullData(path_to_pull, None)
+                if self._limiters and emitter in self._limiters:
+                    self._pushToLimiter(emitter, path_to_pull, data, ensureDottedAccess({
+                        **options,
+                        'topicOfChange': topicOfChange,
+                        'topicOfContent': topicOfContent,
+                        'topicOfSubscription': self._emitters[emitter].subTopic
+                    }), previousRoot)
+                    continue
+
+                content = data
+                if emitter in self._deltaEmitters:
+                    if delta is None:
+                        delta = self._deltaOf(
+                            previousRoot, path_to_pull, data)
+                    if not options.forced and _isEmptyDelta(delta):
+                        continue
+                    content = delta
 
-                emitter.emit(
-                    data,
+                self._emit(
+                    emitter,
+                    content,
                     ensureDottedAccess({
                         **options,
                         'topicOfChange': topicOfChange,
@@ -517,30 +665,261 @@ class PubSubSystem:
 
         for pattern, emitters in referenceToMatch.dataQuery.items():
 
-            # Get a copy of the filtered items.
-            data = self._pullData(pattern, None)
+            # Get the items, which are affected by the change.
+            data = self._queryData(pattern, (topicOfChange,))
+            deltas = None
 
-            # Filter the items.
-            data = filter(
-                lambda item: self._comparePatternAndPath(
-                    topicOfChange, item.path).affected, data)
+            for emitter in emitters:
+                if emitter is not None and emitterCausingUpdate == emitter:
+                    continue
 
-            if len(data) > 0:
+                if emitter in self._deltaEmitters:
+                    # Like on subscribing, the delta of every item is emitted.
+                    if deltas is None:
+                        deltas = self._queryDeltas(
+                            pattern, data, (topicOfChange,), previousRoot)
+                    self._emitQueryDeltas(emitter, deltas, ensureDottedAccess({
+                        **options,
+                        'topicOfChange': topicOfChange,
+                        'topicOfSubscription': self._emitters.get(emitter).subTopic
+                    }), previousRoot)
+                    continue
+
+                if len(data) == 0:
+                    continue
+
+                notificationOptions = ensureDottedAccess({
+                    **options,
+                    'mode': 'direct',
+                    'topicOfChange': topicOfChange,
+                    'topicOfContent': topicOfContent,
+                    'topicOfSubscription': self._emitters.get(emitter).subTopic
+                })
+
+                if self._limiters and emitter in self._limiters:
+                    self._limiters[emitter].push(
+                        pattern, data, notificationOptions)
+                else:
+                    self._emit(emitter, data, notificationOptions)
+
+    def _notifyMany(self, changes, previousRoot=None):
+        """ Internal Function to _notify all subscribers about multiple changes at once. Every subscriber
+            is informed at most once per path (or pattern) it is interested in. If a subscriber would
+            receive the data of a path and of one of its parents, only the parent is emitted. The
+            options of the latest change are used; `topicsOfChange` contains all topics of the
+            changes, which are merged in the notification.
+
+        Args:
+            changes (list): A list containing tuples of `topicOfContent`, `topicOfChange`, `options` and `emitterCausingUpdate`.
+            previousRoot (any, optional): The data before the changes. Used to determine the delta. Defaults to None.
+        """
+        if self._disposing:
+            return
 
-                for emitter in emitters:
-                    if emitter is not None and emitterCausingUpdate == emitter:
+        # emitter -> path (or pattern) -> list of changes
+        pulls = dict()
+        queries = dict()
+
+        for idx, change in enumerate(changes):
+            topicOfContent, topicOfChange, options, emitterCausingUpdate = change
+
+            if topicOfContent not in self._matched:
+                self._updateMatchingForTopic(topicOfContent)
+
+            referenceToMatch = self._matched[topicOfContent]
+
+            for target, entries in ((pulls, referenceToMatch.dataPull), (queries, referenceToMatch.dataQuery)):
+                for key, emitters in entries.items():
+                    for emitter in emitters:
+                        if emitterCausingUpdate is not None and emitterCausingUpdate == emitter:
+                            continue
+                        target.setdefault(emitter, dict()).setdefault(
+                            key, []).append((idx, change))
+
+        # The data is immutable, so the pulled data can be shared.
+        pulled = dict()
+        deltas = dict()
+
+        for emitter, paths in pulls.items():
+            topicOfSubscription = self._emitters[emitter].subTopic
+            for path, merged in _mergeChildPaths(paths).items():
+                if path not in pulled:
+                    pulled[path] = self._pullData(path, None)
+                options = _mergedOptions(merged, topicOfSubscription)
+                content = pulled[path]
+                if self._limiters and emitter in self._limiters:
+                    self._pushToLimiter(
+                        emitter, path, content, options, previousRoot)
+                    continue
+                if emitter in self._deltaEmitters:
+                    if path not in deltas:
+                        deltas[path] = self._deltaOf(
+                            previousRoot, path, content)
+                    content = deltas[path]
+                    if not options.forced and _isEmptyDelta(content):
                         continue
+                self._emit(emitter, content, options)
+
+        for emitter, patterns in queries.items():
+            topicOfSubscription = self._emitters[emitter].subTopic
+            for pattern, merged in patterns.items():
+                topicsOfChange = set(change[1] for _, change in merged)
+                data = self._queryData(pattern, topicsOfChange)
+                if emitter in self._deltaEmitters:
+                    self._emitQueryDeltas(emitter, self._queryDeltas(
+                        pattern, data, topicsOfChange, previousRoot),
+                        _mergedOptions(merged, topicOfSubscription), previousRoot)
+                elif len(data) > 0:
+                    options = _mergedOptions(merged, topicOfSubscription)
+                    options.mode = 'direct'
+                    if self._limiters and emitter in self._limiters:
+                        self._limiters[emitter].push(pattern, data, options)
+                    else:
+                        self._emit(emitter, data, options)
 
-                    emitter.emit(
-                        data,
-                        ensureDottedAccess({
-                            **options,
-                            'mode': 'direct',
-                            'topicOfChange': topicOfChange,
-                            'topicOfContent': topicOfContent,
-                            'topicOfSubscription': self._emitters.get(emitter).subTopic
-                        })
-                    )
+    def _updateDelivery(self, emitter, options):
+        """ Helper to create (or remove) the limiter and the queue of the emitter, based on its options.
+        """
+        self._removeDelivery(emitter)
+        if QueuedDelivery.isRequired(options):
+            self._queues[emitter] = QueuedDelivery(
+                emitter.emit,
+                options.bufferSize,
+                options.overflow or "drop-oldest"
+            )
+        if DeliveryLimiter.isRequired(options):
+            self._limiters[emitter] = DeliveryLimiter(
+                partial(self._deliverLimited, emitter),
+                options.throttleMs,
+                options.debounceMs,
+                options.sample,
+                trackPrevious=options.delivery == "delta"
+            )
+
+    def _removeDelivery(self, emitter):
+        for items in (self._limiters, self._queues):
+            item = items.get(emitter)
+            if item is not None:
+                # Pending notifications are counted as dropped.
+                item.dispose()
+        statistics = self._deliveryStatisticsOf(emitter)
+        self._retiredDeliveryStatistics.delivered += statistics.delivered
+        self._retiredDeliveryStatistics.dropped += statistics.dropped
+        self._limiters.pop(emitter, None)
+        self._queues.pop(emitter, None)
+
+    def _deliveryStatisticsOf(self, emitter) -> DottedDict:
+        ret = DottedDict({'delivered': 0, 'dropped': 0})
+        limiter = self._limiters.get(emitter)
+        queue = self._queues.get(emitter)
+        if limiter is not None:
+            ret.update(limiter.statistics)
+        if queue is not None:
+            # The queue delivers the notifications of the limiter.
+            ret.queue = queue.statistics
+            ret.delivered = queue.delivered
+            ret.dropped += queue.dropped
+        return ret
+
+    def _pushToLimiter(self, emitter, path: str, data, options, previousRoot):
+        previous = None
+        if emitter in self._deltaEmitters and previousRoot is not None:
+            previous = DataStore(previousRoot).get(path, None)
+        self._limiters[emitter].push(path, data, options, previous)
+
+    def _deliverLimited(self, emitter, key, data, options, previous):
+        """ Callback of the limiters. Emits the (delayed) notification.
+        """
+        if emitter in self._deltaEmitters and options.mode != 'direct':
+            data = getLeafDiff(previous, data)
+            if not options.forced and _isEmptyDelta(data):
+                return
+        self._emit(emitter, data, options)
+
+    def _emit(self, emitter, data, options):
+        """ Emits the notification to the subscriber. If the subscriber uses a queue, the
+            notification is delivered asynchronously.
+        """
+        if self._queues:
+            queue = self._queues.get(emitter)
+            if queue is not None:
+                queue.push(data, options)
+                return
+        emitter.emit(data, options)
+
+    async def flushDeliveries(self):
+        """ Waits until the queues of all subscribers (see option `bufferSize`) are empty.
+        """
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    def _deltaOf(self, previousRoot, path: str, data):
+        """ Helper to determine the leaf-level difference of the data stored at the given path.
+
+        Args:
+            previousRoot (any): The root of the data before the change. If `None`, all leafs are added.
+            path (str): The path of the data.
+            data (any): The current data at the path.
+
+        Returns:
+            DottedDict: The delta (see `getLeafDiff`)
+        """
+        previous = None
+        if previousRoot is not None:
+            previous = DataStore(previousRoot).get(path, None)
+        return getLeafDiff(previous, data)
+
+    def _queryDeltas(self, pattern: str, data, topicsOfChange, previousRoot):
+        """ Helper to determine the delta of every item matching the pattern, which is affected by one
+            of the changes. Items, which have been removed by the changes, are contained as well.
+
+        Args:
+            pattern (str): The pattern.
+            data (list): The current items (see `_queryData`).
+            topicsOfChange (iterable): The topics of the changes.
+            previousRoot (any): The root of the data before the changes.
+
+        Returns:
+            list: list containing tuples of the path, the current data (`None` if removed) and the delta.
+        """
+        current = {item.path: item.data for item in data}
+        paths = list(current)
+        if previousRoot is not None:
+            paths.extend(
+                path for path, _ in iterQueryAttr(previousRoot, pattern)
+                if path not in current and any(
+                    self._comparePatternAndPath(topic, path).affected for topic in topicsOfChange)
+            )
+        return [
+            (path, current.get(path), self._deltaOf(previousRoot, path, current.get(path)))
+            for path in paths
+        ]
+
+    def _emitQueryDeltas(self, emitter, deltas, options, previousRoot):
+        """ Emits the deltas (see `_queryDeltas`) of a pattern based subscription. Every item
+            is emitted on its own (`topicOfContent` is the path of the item).
+        """
+        for path, data, delta in deltas:
+            itemOptions = ensureDottedAccess({**options, 'topicOfContent': path})
+            if self._limiters and emitter in self._limiters:
+                self._pushToLimiter(emitter, path, data, itemOptions, previousRoot)
+            elif options.forced or not _isEmptyDelta(delta):
+                self._emit(emitter, delta, itemOptions)
+
+    def _queryData(self, pattern: str, topicsOfChange):
+        """ Helper to pull the items matching the pattern, which are affected by one of the changes.
+
+        Args:
+            pattern (str): The pattern to pull.
+            topicsOfChange (iterable): The topics of the changes.
+
+        Returns:
+            list: list containing dicts with the keys `path` and `data`.
+        """
+        return [
+            item for item in self._patternbasedPullData(pattern, None)
+            if any(self._comparePatternAndPath(topic, item.path).affected for topic in topicsOfChange)
+        ]
 
     def _updateOptions(self, options):
         if not options.timestamp:
@@ -570,23 +949,38 @@ class PubSubSystem:
         options.pubSubUpdate = True
         if containsWildcards(pathOfContent):
             raise 'The Path contains wildcards. Please use the method "patternbasedPullData" instead'
-        elif pathOfContent == '':
-            self._data = copy(data)
-            self._notify(pathOfContent, pathOfChange, options, emitter)
         else:
-            rsetattr(self._data, pathOfContent, copy(data))
-            self._notify(pathOfContent, pathOfChange, options, emitter)
+            # Only the spine of the path is rebuilt. The stored
+            # data is frozen. Therefore we dont need to copy it.
+            previousRoot = self._data.root
+            data = self._data.set(pathOfContent, data)
+
+            if self._transaction is not None:
+                # The subscribers will be informed during the commit.
+                self._transaction.append(
+                    (pathOfContent, pathOfChange, data, options, quiet, emitter))
+                return
+
+            self._notify(pathOfContent, pathOfChange,
+                         options, emitter, previousRoot)
         if not quiet:
-            self.onIncrementalDataChange.emit(ensureDottedAccess({
-                'path': pathOfContent,
-                'data': data,
-                **options
-            }))
+            if self._options.delivery == "delta":
+                self.onIncrementalDataChange.emit(ensureDottedAccess({
+                    'path': pathOfContent,
+                    'delta': self._deltaOf(previousRoot, pathOfContent, data),
+                    **options
+                }))
+            else:
+                self.onIncrementalDataChange.emit(ensureDottedAccess({
+                    'path': pathOfContent,
+                    'data': data,
+                    **options
+                }))
 
     def _pullData(self, topic, default=None):
         if containsWildcards(topic):
             raise 'The Path contains wildcards. Please use the method "patternbasedPullData" instead'
-        return copy(rgetattr(self._data, topic, default))
+        return self._data.get(topic, default)
 
     def _patternbasedPullData(self, pattern: str, default=None):
         """ Helper, which enable to perform a pattern based pull.
@@ -627,25 +1021,16 @@ class PubSubSystem:
 
             return []
 
-        # Now we know, we have to work with the query,
-        # for that purpose, we will adapt the data object
-        # to the following form:
-        # {path: value}
-        flatten = flattenObject(self._data)
-        ret = []
-
-        # We will use our alternative representation of the
-        # object to compare the pattern with the path item.
-        # only if there is a direct match => we will extract it.
-        # That corresponds to a direct level extraction and
-        # prevents to grap multiple items.
-        for path, data in flatten.items():
-            result = self._comparePatternAndPath(pattern, path)
-            if result.affectedOnSameLevel or result.affectedByChild:
-                ret.append(ensureDottedAccess({
-                    'path': path,
-                    'data': data
-                }))
+        # Now we know, we have to work with the query. The data is
+        # stored as tree, so we only visit the subtrees matching the
+        # pattern instead of flattening the entire data.
+        ret = [
+            ensureDottedAccess({
+                'path': path,
+                'data': data
+            })
+            for path, data in iterQueryAttr(self._data.root, pattern)
+        ]
 
         # Now we just return our created element.
         return ret
@@ -3,6 +3,7 @@ import asyncio
 import pytest
 
 from ..nopeDataPubSubSystem import DataPubSubSystem
+from ...eventEmitter import NopeEventEmitter
 from ...helpers import EXECUTOR
 
 
@@ -48,3 +49,178 @@ def test_pub_sub_system():
 
     res = pub_sub.patternbasedPullData("test/#")
     assert len(res) == 3, "Failed with 'patternbasedPullData'"
+
+
+def test_transaction():
+    pub_sub = DataPubSubSystem()
+
+    received = []
+    incremental = []
+
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(lambda data, rest: received.append((data, rest)))
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "plc",
+    })
+    pub_sub.onIncrementalDataChange.subscribe(
+        lambda data, rest: incremental.append(data))
+
+    received.clear()
+
+    with pub_sub.transaction():
+        pub_sub.pushData("plc/a", 1)
+        pub_sub.pushData("plc/b", 2)
+        pub_sub.pushData("plc/a", 3)
+        assert pub_sub.pullData("plc/a") == 3
+        assert received == [], "Informed during the transaction"
+
+    assert len(received) == 1, "Failed to merge the notifications"
+    data, options = received[0]
+    assert data == {"a": 3, "b": 2}
+    assert options.topicsOfChange == ["plc/a", "plc/b"]
+
+    assert len(incremental) == 1, "Failed to merge the incremental changes"
+    assert incremental[0].changes == [
+        {"path": "plc/b", "data": 2}, {"path": "plc/a", "data": 3}]
+
+    pub_sub.pushMany({"plc/a": 4, "other": 5})
+    assert len(received) == 2
+    assert received[-1][0] == {"a": 4, "b": 2}
+
+    # Changes are discarded, if an exception occours.
+    with pytest.raises(ValueError):
+        with pub_sub.transaction():
+            pub_sub.pushData("plc/a", 5)
+            raise ValueError()
+
+    assert pub_sub.pullData("plc/a") == 4
+    assert len(received) == 2
+
+
+def test_pattern_based_subscription_and_push():
+    pub_sub = DataPubSubSystem()
+    pub_sub.pushData("devices", {"a": {"state": 1}, "b": {"state": 2}})
+
+    received = []
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(lambda data, rest: received.append(
+        (rest.topicOfContent, data)))
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "devices/+/state",
+    })
+
+    # The current data is emitted during the registration.
+    assert sorted(received) == [("devices/a/state", 1), ("devices/b/state", 2)]
+
+    received.clear()
+    pub_sub.patternBasedPush("devices/+/state", 0)
+
+    assert pub_sub.data == {"devices": {"a": {"state": 0}, "b": {"state": 0}}}
+    assert sorted(received) == [("devices/a/state", 0), ("devices/b/state", 0)]
+
+
+def test_delta_delivery():
+    sender = DataPubSubSystem({"delivery": "delta"})
+    receiver = DataPubSubSystem()
+
+    def forward(msg, rest):
+        if msg.changes is not None:
+            with receiver.transaction():
+                for change in msg.changes:
+                    receiver.applyDelta(change["path"], change["delta"])
+        else:
+            receiver.applyDelta(msg.path, msg.delta)
+
+    sender.onIncrementalDataChange.subscribe(forward)
+
+    received = []
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(lambda data, rest: received.append(data))
+    sender.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "status",
+        "delivery": "delta"
+    })
+
+    sender.pushData("status", {"motor": {"speed": 1, "temp": 20}, "ok": True})
+    assert received[-1].added == {"motor/speed": 1, "motor/temp": 20, "ok": True}
+
+    sender.pushData("status/motor/speed", 2)
+    assert received[-1] == {"added": {}, "changed": {"motor/speed": 2}, "removed": []}
+
+    count = len(received)
+    sender.pushData("status/motor/speed", 2)
+    assert len(received) == count, "Informed about an empty delta"
+
+    with sender.transaction():
+        sender.pushData("status/ok", False)
+        sender.pushData("status/motor", {"speed": 3})
+        sender.pushData("other", 1)
+
+    assert received[-1] == {"added": {}, "changed": {"ok": False, "motor/speed": 3},
+                            "removed": ["motor/temp"]}
+    assert receiver.data == sender.data
+
+
+def test_delta_delivery_with_wildcards():
+    pub_sub = DataPubSubSystem()
+    pub_sub.pushData("a", {"b": {"x": 1}, "c": {"x": 1}})
+
+    received = []
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(lambda data, rest: received.append((rest.topicOfContent, data)))
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "a/+",
+        "delivery": "delta"
+    })
+
+    assert received == [("a/b", {"added": {"x": 1}, "changed": {}, "removed": []}),
+                        ("a/c", {"added": {"x": 1}, "changed": {}, "removed": []})]
+    received.clear()
+
+    # A change of the parent is delivered as delta per item as well.
+    pub_sub.pushData("a", {"b": {"x": 2}, "c": {"x": 1}, "d": 1})
+    assert received == [("a/b", {"added": {}, "changed": {"x": 2}, "removed": []}),
+                        ("a/d", {"added": {"": 1}, "changed": {}, "removed": []})]
+    received.clear()
+
+    with pub_sub.transaction():
+        pub_sub.pushData("a", {"b": {"x": 3}, "d": 1})
+        pub_sub.pushData("other", 1)
+
+    assert received == [("a/b", {"added": {}, "changed": {"x": 3}, "removed": []}),
+                        ("a/c", {"added": {}, "changed": {"": None}, "removed": []})]
+
+
+def test_push_deep_data():
+    pub_sub = DataPubSubSystem()
+
+    received = []
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(lambda data, rest: received.append(data))
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "deep"
+    })
+
+    # Deeper than the recursion limit.
+    data = value = {}
+    for _ in range(3000):
+        value["k"] = value = {}
+    value["x"] = 1
+
+    pub_sub.pushData("deep", data)
+
+    value = pub_sub.pullData("deep")
+    for _ in range(3000):
+        value = value["k"]
+    assert value == {"x": 1}
+    assert len(received) == 1
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from ..dataStore import DataStore
+from ..nopeDataPubSubSystem import DataPubSubSystem
+from ...helpers import EXECUTOR, FrozenDict
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    yield loop
+    loop.close()
+
+
+def test_structural_sharing():
+    store = DataStore({"a": {"b": 1}, "c": {"d": [1, 2, 3]}})
+
+    before = store.root
+    store.set("a/b", 2)
+    after = store.root
+
+    assert before is not after
+    assert before["a"]["b"] == 1, "The previous version has been changed"
+    assert after["a"]["b"] == 2
+    assert before["c"] is after["c"], "The unchanged subtree has been copied"
+
+
+def test_get_set_delete():
+    store = DataStore()
+
+    store.set("a/b/c", 1)
+    assert store.get("a/b/c") == 1
+    assert store.get("a/b") == {"c": 1}
+    assert store.get("a/x", "default") == "default"
+
+    store.set("list/1/name", "test")
+    assert store.get("list") == [None, {"name": "test"}]
+    assert store.get("list/1/name") == "test"
+
+    assert store.delete("a/b/c")
+    assert store.get("a/b") == {}
+    assert not store.delete("a/b/c")
+
+    store.set("", {"new": True})
+    assert store.root == {"new": True}
+
+
+def test_immutable_snapshots():
+    pub_sub = DataPubSubSystem()
+
+    received = []
+
+    def callback(data, rest):
+        received.append(data)
+
+    pub_sub.registerSubscription("a", callback)
+
+    content = {"b": {"c": 1}}
+    pub_sub.pushData("a", content)
+
+    # Changing the original object doesnt affect the system.
+    content["b"]["c"] = 2
+    assert pub_sub.pullData("a/b/c") == 1
+
+    snapshot = pub_sub.pullData("a")
+    assert isinstance(snapshot, FrozenDict)
+    assert snapshot is received[-1], "The snapshot has been copied"
+
+    with pytest.raises(TypeError):
+        snapshot["b"] = 2
+
+    pub_sub.pushData("a/b/c", 3)
+    assert snapshot.b.c == 1, "The snapshot has been changed"
+    assert pub_sub.data.a.b.c == 3
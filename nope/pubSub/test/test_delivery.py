@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from ..nopeDataPubSubSystem import DataPubSubSystem
+from ..nopePubSubSystem import PubSubSystem
+from ...eventEmitter import NopeEventEmitter
+from ...helpers import EXECUTOR
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    yield loop
+    loop.close()
+
+
+def subscribe(pub_sub, topic, **options):
+    received = []
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(lambda data, rest: received.append(data))
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": topic,
+        **options
+    })
+    return received
+
+
+async def test_throttle():
+    pub_sub = PubSubSystem()
+    dropping = subscribe(pub_sub, "sensor", throttleMs=50)
+    sampling = subscribe(pub_sub, "sensor", throttleMs=50, sample="latest")
+
+    for value in range(10):
+        pub_sub.emit("sensor", value)
+
+    assert dropping == [0]
+    assert sampling == [0]
+
+    await asyncio.sleep(0.1)
+
+    assert dropping == [0]
+    assert sampling == [0, 9]
+
+    statistics = pub_sub.deliveryStatistics
+    assert statistics.delivered == 3
+    assert statistics.dropped == 9 + 8
+
+
+async def test_debounce_and_sample():
+    pub_sub = DataPubSubSystem()
+    debounced = subscribe(pub_sub, "sensor", debounceMs=20)
+    sampled = subscribe(pub_sub, "sensor/+", sample="latest")
+
+    for value in range(5):
+        pub_sub.pushData("sensor/a", value)
+        pub_sub.pushData("sensor/b", -value)
+        await asyncio.sleep(0.005)
+
+    assert debounced == []
+    assert len(sampled) == 10
+
+    for value in range(5):
+        pub_sub.pushData("sensor/a", value)
+    await asyncio.sleep(0)
+
+    assert sampled[-1] == 4
+    assert len(sampled) == 11
+
+    await asyncio.sleep(0.05)
+    assert debounced == [{"a": 4, "b": -4}]
+
+
+async def test_delta_with_limiter():
+    pub_sub = DataPubSubSystem()
+    pub_sub.pushData("status", {"a": 0, "b": 0})
+    received = subscribe(pub_sub, "status", throttleMs=20,
+                         sample="latest", delivery="delta")
+    received.clear()
+
+    pub_sub.pushData("status/a", 1)
+    pub_sub.pushData("status/b", 1)
+    pub_sub.pushData("status/a", 2)
+
+    await asyncio.sleep(0.05)
+
+    assert received[0].changed == {"a": 1}
+    assert received[1].changed == {"a": 2, "b": 1}
+
+
+async def test_queued_delivery():
+    pub_sub = PubSubSystem()
+
+    slow = []
+    fast = []
+
+    def slowCallback(data, rest):
+        slow.append(data)
+
+    subscriber = NopeEventEmitter()
+    subscriber.subscribe(slowCallback)
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "sensor",
+        "bufferSize": 3,
+        "overflow": "drop-oldest"
+    })
+    newest = subscribe(pub_sub, "sensor", bufferSize=3,
+                       overflow="drop-newest")
+    blocking = subscribe(pub_sub, "sensor", bufferSize=3, overflow="block")
+    fast = subscribe(pub_sub, "sensor")
+
+    for value in range(5):
+        pub_sub.emit("sensor", value)
+
+    # Only the subscriber without a queue is informed directly.
+    assert fast == [0, 1, 2, 3, 4]
+    assert slow == []
+    assert newest == []
+    assert blocking == [0, 1]
+
+    statistics = pub_sub.deliveryStatistics
+    assert [item.queue.depth for item in statistics.subscribers] == [3, 3, 3]
+
+    await pub_sub.flushDeliveries()
+
+    assert slow == [2, 3, 4]
+    assert newest == [0, 1, 2]
+    assert blocking == [0, 1, 2, 3, 4]
+
+    statistics = pub_sub.deliveryStatistics
+    assert statistics.delivered == 3 + 3 + 5
+    assert statistics.dropped == 2 + 2
+    assert statistics.subscribers[2].queue.blocked == 2
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from ..nopePubSubSystem import PubSubSystem
+from ..topicIndex import TopicIndex
+from ...eventEmitter import NopeEventEmitter
+from ...helpers import EXECUTOR, comparePatternAndPath
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    yield loop
+    loop.close()
+
+
+PATTERNS = ["", "#", "+", "a", "a/b", "a/#", "a/+", "a/+/c", "+/b/#", "a/b/c/d", "b/+/+", "x"]
+PATHS = ["", "a", "b", "a/b", "a/c", "a/b/c", "a/b/c/d", "a/b/c/d/e", "b/b/c", "x/y"]
+
+
+def test_patterns_matching():
+    index = TopicIndex()
+    for pattern in PATTERNS:
+        index.add(pattern, pattern)
+
+    for path in PATHS:
+        expected = set(
+            filter(lambda pattern: comparePatternAndPath(pattern, path).affected, PATTERNS))
+        result = set(map(lambda item: item[0], index.patternsMatching(path)))
+        assert result == expected, f"Failed for path '{path}'"
+
+
+def test_topics_matching():
+    index = TopicIndex()
+    for path in PATHS:
+        index.add(path)
+
+    for pattern in PATTERNS:
+        expected = set(
+            filter(lambda path: comparePatternAndPath(pattern, path).affected, PATHS))
+        result = set(map(lambda item: item[0], index.topicsMatching(pattern)))
+        assert result == expected, f"Failed for pattern '{pattern}'"
+
+
+def test_add_and_remove():
+    index = TopicIndex()
+
+    assert index.add("a/b", 1)
+    assert not index.add("a/b", 2)
+    assert len(index) == 1
+    assert index.get("a/b") == {1, 2}
+
+    assert not index.remove("a/b", 1)
+    assert "a/b" in index
+    assert index.remove("a/b", 2)
+    assert "a/b" not in index
+    assert len(index) == 0
+    assert not index._root.children, "Failed to prune the trie"
+
+
+def test_pub_sub_unregister():
+    called = 0
+
+    pub_sub = PubSubSystem()
+
+    publisher = NopeEventEmitter()
+    subscriber = NopeEventEmitter()
+
+    pub_sub.register(publisher, {
+        "mode": "publish",
+        "schema": {},
+        "topic": "this/is/a/test",
+    })
+
+    pub_sub.register(subscriber, {
+        "mode": "subscribe",
+        "schema": {},
+        "topic": "this/#",
+    })
+
+    def callback(data, rest):
+        nonlocal called
+        called += 1
+
+    subscriber.subscribe(callback)
+    publisher.emit("Hello World")
+
+    assert called == 1
+
+    pub_sub.unregister(subscriber)
+    publisher.emit("Hello World")
+
+    assert called == 1, "Unregistered subscriber has been informed"
+    assert subscriber not in pub_sub._matchedEntriesOfEmitter
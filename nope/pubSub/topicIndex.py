@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+from ..helpers import SPLITCHAR, SINGLE_LEVEL_WILDCARD, MULTI_LEVEL_WILDCARD
+
+
+def _splitTopic(topic: str):
+    """ Helper to split a topic into its segments. The empty topic ("")
+        corresponds to the root and therefore doesnt contain any segment.
+
+    Args:
+        topic (str): The topic to split.
+
+    Returns:
+        list: The segments.
+    """
+    return topic.split(SPLITCHAR) if topic else []
+
+
+class _TopicNode:
+    """ A node of the segment trie. If `topic` is not `None`, the node represents a stored topic.
+    """
+
+    __slots__ = ("children", "topic", "items")
+
+    def __init__(self):
+        self.children = dict()
+        self.topic = None
+        self.items = None
+
+
+class TopicIndex:
+    """ A segment trie, which stores items (for instance emitters) under their topic. The trie
+        understands the wildcards `+` and `#` and is able to answer the following questions
+        in O(depth + matches):
+
+        - `patternsMatching(path)`: Which stored patterns (subscriptions) are affected by the given topic?
+        - `topicsMatching(pattern)`: Which stored topics (publishers) are affected by the given pattern?
+
+        A pattern and a path are "affected", if one of them is a prefix of the other one (segment-wise),
+        whereas `+` matches exactly one segment and `#` every remaining segment. This corresponds to the
+        definition of `affected` used in `comparePatternAndPath`.
+    """
+
+    def __init__(self):
+        self._root = _TopicNode()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, topic: str):
+        node = self._find(topic)
+        return node is not None and node.topic is not None
+
+    def _find(self, topic: str):
+        node = self._root
+        for segment in _splitTopic(topic):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def add(self, topic: str, item=None) -> bool:
+        """ Adds the topic (and the optional item) to the index.
+
+        Args:
+            topic (str): The topic (or pattern) to store.
+            item (any, optional): The item to store under the topic. Defaults to None.
+
+        Returns:
+            bool: True, if the topic hasn't been present before.
+        """
+        node = self._root
+        for segment in _splitTopic(topic):
+            child = node.children.get(segment)
+            if child is None:
+                child = _TopicNode()
+                node.children[segment] = child
+            node = child
+
+        added = node.topic is None
+        if added:
+            node.topic = topic
+            node.items = set()
+            self._size += 1
+
+        if item is not None:
+            node.items.add(item)
+
+        return added
+
+    def remove(self, topic: str, item=None) -> bool:
+        """ Removes the item from the topic. If no item is provided or the topic doesnt contain
+            any item afterwards, the topic is removed as well.
+
+        Args:
+            topic (str): The topic (or pattern).
+            item (any, optional): The item to remove. Defaults to None.
+
+        Returns:
+            bool: True, if the topic has been removed.
+        """
+        path = [(None, self._root)]
+        node = self._root
+        for segment in _splitTopic(topic):
+            node = node.children.get(segment)
+            if node is None:
+                return False
+            path.append((segment, node))
+
+        if node.topic is None:
+            return False
+
+        if item is not None:
+            node.items.discard(item)
+            if node.items:
+                return False
+
+        node.topic = None
+        node.items = None
+        self._size -= 1
+
+        # Remove the nodes, which are not required anymore.
+        for idx in range(len(path) - 1, 0, -1):
+            segment, current = path[idx]
+            if current.topic is not None or current.children:
+                break
+            del path[idx - 1][1].children[segment]
+
+        return True
+
+    def get(self, topic: str, default=None):
+        """ Returns the items stored under the topic.
+
+        Args:
+            topic (str): The topic (or pattern).
+            default (any, optional): The value to return if the topic isnt present. Defaults to None.
+
+        Returns:
+            set: The stored items.
+        """
+        node = self._find(topic)
+        if node is None or node.topic is None:
+            return default
+        return node.items
+
+    def clear(self):
+        self._root = _TopicNode()
+        self._size = 0
+
+    def topics(self):
+        """ Iterates over all stored topics.
+
+        Yields:
+            (str, set): The topic and its items.
+        """
+        return self._subtree(self._root)
+
+    def _subtree(self, node: _TopicNode):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.topic is not None:
+                yield node.topic, node.items
+            stack.extend(node.children.values())
+
+    def patternsMatching(self, path: str):
+        """ Determines all stored patterns, which are affected by the given path.
+            This includes patterns matching the path directly, patterns matching
+            a parent of the path (change by a child) and patterns below the path
+            (change by a parent).
+
+        Args:
+            path (str): The path (must not contain wildcards).
+
+        Yields:
+            (str, set): The pattern and its items.
+        """
+        segments = _splitTopic(path)
+        length = len(segments)
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+
+            if depth == length:
+                # The path ends here. Every pattern of the subtree
+                # is affected by the change of its parent.
+                yield from self._subtree(node)
+                continue
+
+            if node.topic is not None:
+                # The pattern is shorter than the path.
+                yield node.topic, node.items
+
+            children = node.children
+
+            multiLevel = children.get(MULTI_LEVEL_WILDCARD)
+            if multiLevel is not None:
+                yield from self._subtree(multiLevel)
+
+            singleLevel = children.get(SINGLE_LEVEL_WILDCARD)
+            if singleLevel is not None:
+                stack.append((singleLevel, depth + 1))
+
+            child = children.get(segments[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+
+    def topicsMatching(self, pattern: str):
+        """ Determines all stored topics, which are affected by the given pattern.
+            This includes topics matching the pattern directly, topics which are
+            parents of the pattern and topics which are children of the pattern.
+
+        Args:
+            pattern (str): The pattern (may contain wildcards).
+
+        Yields:
+            (str, set): The topic and its items.
+        """
+        segments = _splitTopic(pattern)
+        length = len(segments)
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+
+            if depth == length:
+                # The pattern ends here. Every topic of the
+                # subtree is a child of the pattern.
+                yield from self._subtree(node)
+                continue
+
+            if node.topic is not None:
+                # The topic is shorter than the pattern.
+                yield node.topic, node.items
+
+            segment = segments[depth]
+
+            if segment == MULTI_LEVEL_WILDCARD:
+                for child in node.children.values():
+                    yield from self._subtree(child)
+            elif segment == SINGLE_LEVEL_WILDCARD:
+                for child in node.children.values():
+                    stack.append((child, depth + 1))
+            else:
+                child = node.children.get(segment)
+                if child is not None:
+                    stack.append((child, depth + 1))
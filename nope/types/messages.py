@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# @author Martin Karkowski
+# @email m.karkowski@zema.de
+
+""" Typed messages of the core protocol. The messages are slotted dataclasses, so reading
+    a field is a plain attribute access. On the wire the messages are sent as dicts (see
+    `Message.to_wire` and `Message.from_wire`); the format stays the same.
+
+>>> msg = RpcResponse.from_wire({"taskId": "a", "result": 1, "type": "response"})
+>>> msg.result
+1
+>>> msg.to_wire()
+{'taskId': 'a', 'result': 1, 'type': 'response'}
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, List
+
+from nope.helpers import ensureDottedAccess
+
+
+def _toDotted(value):
+    """ Helper to provide dotted access to the (nested) dicts of a received message.
+        The dicts are converted lazily (see `LazyDottedDict`).
+    """
+    if isinstance(value, dict):
+        return ensureDottedAccess(value, lazy=True)
+    if isinstance(value, list):
+        return [_toDotted(item) for item in value]
+    return value
+
+
+@dataclass(slots=True, kw_only=True)
+class Message:
+    """ Base of the messages. Unknown fields of a received message (for instance added by
+        a plugin) are stored in `extra` and sent again by `to_wire`. To stay compatible with
+        the former dict based messages, a message could be accessed like a dict as well.
+        Accessing an unknown attribute returns `None`.
+    """
+
+    _fields = ()
+    """ The names of the fields, which are sent. Defined for every message. """
+
+    _dottedFields = ()
+    """ The names of the fields, which should be received with dotted access. """
+
+    extra: dict = None
+    """ Additional fields of the message. """
+
+    def to_wire(self) -> dict:
+        """ Converts the message to its wire format.
+
+        Returns:
+            dict: The message.
+        """
+        ret = {name: getattr(self, name) for name in self._fields}
+        if self.extra:
+            ret.update(self.extra)
+        return ret
+
+    @classmethod
+    def from_wire(cls, data):
+        """ Creates the message from its wire format.
+
+        Args:
+            data (dict | Message): The received message.
+
+        Returns:
+            Message: The message.
+        """
+        if isinstance(data, cls):
+            return data
+
+        kwargs = dict()
+        extra = None
+        known = cls._fields
+        dotted = cls._dottedFields
+
+        for key, value in data.items():
+            if key in known:
+                kwargs[key] = _toDotted(value) if key in dotted else value
+            else:
+                if extra is None:
+                    extra = dict()
+                extra[key] = _toDotted(value)
+
+        return cls(extra=extra, **kwargs)
+
+    def __getattr__(self, key):
+        # Only called, if the attribute isnt a field.
+        if key.startswith("__"):
+            raise AttributeError(key)
+        extra = self.extra
+        return extra.get(key) if extra else None
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._fields:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = dict()
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._fields or bool(self.extra and key in self.extra)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        if self.extra:
+            return [*self._fields, *self.extra.keys()]
+        return list(self._fields)
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._fields) + (len(self.extra) if self.extra else 0)
+
+
+@dataclass(slots=True, kw_only=True)
+class RpcRequest(Message):
+    """ Message `rpcRequest`: Requests the execution of a service.
+    """
+
+    functionId: str
+    """ The id of the service. """
+
+    params: List[Any] = field(default_factory=list)
+    """ The parameters as list of dicts, containing `idx` and `data`. """
+
+    taskId: str
+    """ The id of the task. """
+
+    resultSink: str | bool = False
+    """ The sink of the result. """
+
+    requestedBy: str = None
+    """ The id of the requesting dispatcher. """
+
+    target: str = None
+    """ The id of the dispatcher, which should execute the service. """
+
+
+@dataclass(slots=True, kw_only=True)
+class RpcResponse(Message):
+    """ Message `rpcResponse`: The result of a task. Contains either `result` or `error`.
+    """
+
+    taskId: str
+    """ The id of the task. """
+
+    result: Any = None
+    """ The result. """
+
+    error: Any = None
+    """ The error (dict containing `error` and `msg`), if the task failed. """
+
+    type: str = "response"
+
+    def to_wire(self) -> dict:
+        ret = {"taskId": self.taskId}
+        if self.error is not None:
+            ret["error"] = self.error
+        else:
+            ret["result"] = self.result
+        ret["type"] = self.type
+        if self.extra:
+            ret.update(self.extra)
+        return ret
+
+
+@dataclass(slots=True, kw_only=True)
+class StatusChanged(Message):
+    """ Message `statusChanged`: The status of a dispatcher.
+    """
+
+    id: str
+    """ The id of the dispatcher. """
+
+    env: str = "python"
+    version: str = None
+    isMaster: bool = False
+    isMasterForced: bool = False
+
+    host: dict = None
+    """ Information of the host (`cores`, `cpu`, `os`, `ram` and `name`). """
+
+    pid: int = None
+    timestamp: float = None
+    connectedSince: float = None
+    status: int = 0
+    plugins: List[str] = field(default_factory=list)
+
+    load: dict = None
+    """ The load of the provided services (see `NopeRpcManager.load`). """
+
+
+@dataclass(slots=True, kw_only=True)
+class ServicesChanged(Message):
+    """ Message `servicesChanged`: The services provided by a dispatcher.
+    """
+
+    dispatcher: str
+    """ The id of the dispatcher. """
+
+    services: List[Any] = field(default_factory=list)
+    """ The options of the services. """
+
+
+@dataclass(slots=True, kw_only=True)
+class InstancesChanged(Message):
+    """ Message `instancesChanged`: The instances provided by a dispatcher.
+    """
+
+    dispatcher: str
+    """ The id of the dispatcher. """
+
+    instances: List[Any] = field(default_factory=list)
+    """ The descriptions of the instances. """
+
+
+@dataclass(slots=True, kw_only=True)
+class RpcRequestBatch(Message):
+    """ Message `rpcRequestBatch`: Several rpc-requests of a dispatcher to the same target
+        (see option `batchSize` of the `NopeRpcManager`).
+    """
+
+    requestedBy: str
+    """ The id of the requesting dispatcher. """
+
+    target: str = None
+    """ The id of the dispatcher, which should execute the services. """
+
+    requests: List[Any] = field(default_factory=list)
+    """ The requests (wire format of `RpcRequest`). """
+
+    delay: float = None
+    """ Maximal delay (in µs) of the responses, used to batch the responses. """
+
+
+@dataclass(slots=True, kw_only=True)
+class RpcResponseBatch(Message):
+    """ Message `rpcResponseBatch`: Several results of an `rpcRequestBatch`.
+    """
+
+    responses: List[Any] = field(default_factory=list)
+    """ The responses (wire format of `RpcResponse`). """
+
+
+@dataclass(slots=True, kw_only=True)
+class RpcStreamChunk(Message):
+    """ Message `rpcStreamChunk`: A chunk of a streamed result (service defined as async generator).
+    """
+
+    taskId: str
+    """ The id of the task. """
+
+    seq: int = 0
+    """ The index of the chunk. """
+
+    data: Any = None
+    """ The chunk. """
+
+
+@dataclass(slots=True, kw_only=True)
+class RpcStreamAck(Message):
+    """ Message `rpcStreamAck`: Acknowledges consumed chunks of a streamed result.
+    """
+
+    taskId: str
+    """ The id of the task. """
+
+    dispatcher: str
+    """ The id of the dispatcher, which provides the stream. """
+
+    credits: int = 0
+    """ The amount of chunks, which could be sent additionally. """
+
+
+def _defineFields(cls, dotted=()):
+    cls._fields = tuple(item.name for item in fields(cls)
+                        if item.name != "extra")
+    cls._dottedFields = frozenset(dotted)
+
+
+_defineFields(RpcRequest, ("params",))
+_defineFields(RpcResponse, ("result", "error"))
+_defineFields(StatusChanged, ("host", "load"))
+_defineFields(ServicesChanged, ("services",))
+_defineFields(InstancesChanged, ("instances",))
+_defineFields(RpcRequestBatch)
+_defineFields(RpcResponseBatch)
+_defineFields(RpcStreamChunk, ("data",))
+_defineFields(RpcStreamAck)
+
+MESSAGES = {
+    "rpcRequest": RpcRequest,
+    "rpcResponse": RpcResponse,
+    "rpcRequestBatch": RpcRequestBatch,
+    "rpcResponseBatch": RpcResponseBatch,
+    "rpcStreamChunk": RpcStreamChunk,
+    "rpcStreamAck": RpcStreamAck,
+    "statusChanged": StatusChanged,
+    "servicesChanged": ServicesChanged,
+    "instancesChanged": InstancesChanged,
+}
+""" The typed messages, using the name of the event as key. """
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from ..messages import RpcRequest, RpcResponse, StatusChanged
+from ...communication import getLayer
+from ...helpers import EXECUTOR
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    yield loop
+    loop.close()
+
+
+def test_wire_format():
+    wire = {
+        'functionId': 'hello',
+        'params': [{'idx': 0, 'data': {'name': 'nope'}}],
+        'taskId': 'task',
+        'resultSink': 'response/hello',
+        'requestedBy': 'dispatcher',
+        'target': None,
+        'callbacks': [{'id': 'callback'}]
+    }
+
+    msg = RpcRequest.from_wire(wire)
+    assert msg.taskId == 'task'
+    assert msg['functionId'] == 'hello'
+    assert msg.params[0].data.name == 'nope'
+    # Unknown fields are kept.
+    assert msg.callbacks[0].id == 'callback'
+    assert msg.unknown is None
+    assert msg.to_wire() == wire
+    assert RpcRequest.from_wire(msg) is msg
+
+    assert RpcResponse(taskId='task', result=1).to_wire() == {
+        'taskId': 'task', 'result': 1, 'type': 'response'}
+    response = RpcResponse.from_wire({
+        'taskId': 'task', 'error': {'error': 'failed', 'msg': 'failed'}, 'type': 'response'})
+    assert response.error.msg == 'failed'
+    assert 'result' not in response.to_wire()
+
+    status = StatusChanged(id='dispatcher', host={'name': 'host'})
+    status['status'] = 2
+    assert status.status == 2
+    assert status.get('id') == 'dispatcher'
+
+
+async def test_bridge():
+    communicator = await getLayer("event")
+    received = []
+
+    await communicator.on("rpcResponse", received.append)
+    await communicator.on("custom", received.append)
+
+    await communicator.emit("rpcResponse", RpcResponse(taskId='task', result={'a': 1}))
+    await communicator.emit("custom", {'a': {'b': 1}})
+    await asyncio.sleep(0.01)
+
+    assert isinstance(received[0], RpcResponse)
+    assert received[0].result.a == 1
+    assert received[1].a.b == 1
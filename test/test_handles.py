@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from nope import EXECUTOR
+from nope.communication import Bridge
+from nope.communication.handles import HANDLES_KEY, HANDLES_REQUEST_EVENT, HandleTable, decode, encode
+from nope.communication.layers import EventCommunicationInterface
+from nope.helpers import Emitter
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    EXECUTOR.assignLoop(loop)
+    yield loop
+    loop.close()
+
+
+def test_encode_decode():
+    table = HandleTable(threshold=2)
+    definitions = dict()
+    msg = {"functionId": "service", "taskId": "a", "resultSink": False}
+
+    first = encode("rpcRequest", msg, table, "bridge")
+    assert first is msg, "A string used once shouldnt receive a handle"
+
+    second = encode("rpcRequest", msg, table, "bridge")
+    assert second["functionId"] == 0
+    assert second[HANDLES_KEY]["defs"] == {"0": "service"}
+    assert msg["functionId"] == "service", "The message must not be changed"
+
+    third = encode("rpcRequest", msg, table, "bridge")
+    assert "defs" not in third[HANDLES_KEY], "The definition should be sent once"
+
+    # The definition is unknown.
+    assert decode("rpcRequest", third, definitions) is None
+    assert decode("rpcRequest", second, definitions) == msg
+    assert decode("rpcRequest", third, definitions) == msg
+
+
+async def test_bridges_with_handles():
+    wire = Emitter()
+    sent = []
+    wire.on("rpcRequest", lambda data, *args: sent.append(data))
+
+    async def createBridge(_id):
+        bridge = Bridge(_id, useHandles=True)
+        await bridge.addCommunicationLayer(EventCommunicationInterface(wire))
+        return bridge
+
+    sender = await createBridge("sender")
+    receiver = await createBridge("receiver")
+
+    received = []
+    await receiver.on("rpcRequest", lambda msg: received.append(
+        (msg.functionId, msg.taskId)))
+
+    for idx in range(3):
+        await sender.emit("rpcRequest", {"functionId": "service", "taskId": str(idx)})
+
+    await asyncio.sleep(0.01)
+
+    assert received == [("service", "0"), ("service", "1"), ("service", "2")]
+    assert sent[-1]["functionId"] == 0, "The handle should be used on the wire"
+
+    # A bridge connected later requests the definitions.
+    late = await createBridge("late")
+    lateReceived = []
+    await late.on("rpcRequest", lambda msg: lateReceived.append(msg.functionId))
+
+    await sender.emit("rpcRequest", {"functionId": "service", "taskId": "3"})
+    await asyncio.sleep(0.01)
+
+    assert lateReceived == ["service"]
+    assert received[-1] == ("service", "3")
+
+
+async def test_missing_definitions():
+    wire = Emitter()
+    requests = []
+    wire.on(HANDLES_REQUEST_EVENT, lambda data, *args: requests.append(data))
+
+    receiver = Bridge("receiver", useHandles=True)
+    await receiver.addCommunicationLayer(EventCommunicationInterface(wire))
+    receiver.handlesRequestTimeout = 10
+    receiver.handlesRequestAttempts = 2
+    receiver.maxPendingMessages = 2
+
+    received = []
+    await receiver.on("rpcRequest", lambda msg: received.append(msg.taskId))
+
+    # The sender ("gone") doesnt answer the requests.
+    for idx in range(3):
+        wire.emit("rpcRequest", {"functionId": 0, "taskId": str(idx), HANDLES_KEY: {"bridge": "gone"}})
+
+    await asyncio.sleep(0.005)
+    pending = list(receiver._pendingMessages.values())
+    assert len(pending) == 1 and len(pending[0].messages) == 2, "The delayed messages should be limited"
+
+    await asyncio.sleep(0.1)
+    assert requests == [{"bridge": "gone"}] * 2, "The definitions should be requested again"
+    assert receiver._pendingMessages == {} and received == [], "The delayed messages should be dropped"
+
+    # Later messages request the definitions again.
+    wire.emit("rpcRequest", {"functionId": 0, "taskId": "3", HANDLES_KEY: {"bridge": "gone"}})
+    wire.emit("bridgeHandles", {"bridge": "gone", "defs": {"0": "service"}})
+    await asyncio.sleep(0.01)
+    assert received == ["3"] and len(requests) == 3